@@ -0,0 +1,56 @@
+"""Benchmark per-request execution context setup in AgentInterface.
+
+Compares the cached system root and pooled memory layer against the previous
+behaviour of looking up the system root and building fresh memory every time.
+
+Run against the configured database (DATABASE_HOST, or jac-cloud's local
+fallback when unset):
+
+    python benchmarks/bench_context.py --iterations 2000
+"""
+
+import argparse
+import time
+
+from jac_cloud.core.memory import MongoDB
+from jaclang.runtimelib.context import ExecutionContext
+
+from jvserve.lib.agent_interface import AgentInterface
+
+
+def run(iterations: int, cached: bool) -> float:
+    """Return the mean setup-and-close time per context in microseconds."""
+    root_id = "000000000000000000000001"
+    started = time.perf_counter()
+    for _ in range(iterations):
+        if not cached:
+            # emulate the uncached path: fresh memory and a system root lookup each time
+            AgentInterface.SYSTEM_ROOT_DOC = None
+            while not AgentInterface.MEMORY_POOL.empty():
+                AgentInterface.MEMORY_POOL.get_nowait()
+        ctx = AgentInterface.get_jaseci_context(None, root_id)
+        ctx.close()
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+def main() -> None:
+    """Run both variants and print the per-request setup cost."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=1000)
+    args = parser.parse_args()
+
+    ExecutionContext.create()
+    # warm up connections and the system root
+    AgentInterface.get_jaseci_context(None, "").close()
+    MongoDB().close()
+
+    uncached = run(args.iterations, cached=False)
+    cached = run(args.iterations, cached=True)
+
+    print(f"uncached context setup: {uncached:10.1f} us/request")
+    print(f"cached context setup:   {cached:10.1f} us/request")
+    print(f"speedup:                {uncached / cached:10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Benchmark proxied file throughput against a local HTTP stand-in for S3.
+
+Compares the previous proxy behaviour (a blocking requests.get per file, which
+serializes every request handled on the event loop) with FileProxy's shared,
+pooled async client fetching concurrently.
+
+    python benchmarks/bench_proxy.py --requests 200 --concurrency 20 --size 262144 --latency-ms 20
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing.sharedctypes import Synchronized
+
+import requests
+from fastapi.responses import StreamingResponse
+
+from jvserve.lib.file_proxy import FileProxy
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Answers every GET with the same body, keeping connections alive."""
+
+    protocol_version = "HTTP/1.1"
+    body = b""
+    latency = 0.0
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Send the body after the configured time to first byte."""
+        time.sleep(self.latency)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args: object) -> None:
+        """Silence request logging."""
+
+
+def serve(size: int, latency: float, port: "Synchronized[int]") -> None:
+    """Run the stand-in server, publishing its ephemeral port."""
+    Handler.body = os.urandom(size)
+    Handler.latency = latency
+    ThreadingHTTPServer.request_queue_size = 128
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    port.value = server.server_address[1]
+    server.serve_forever()
+
+
+def start_server(size: int, latency: float) -> tuple[multiprocessing.Process, int]:
+    """Start the stand-in in its own process so it does not share our GIL."""
+    port = multiprocessing.Value("i", 0)
+    process = multiprocessing.Process(
+        target=serve, args=(size, latency, port), daemon=True
+    )
+    process.start()
+    while not port.value:
+        time.sleep(0.01)
+    return process, port.value
+
+
+def run_blocking(url: str, count: int) -> float:
+    """Return seconds to fetch url count times the previous way."""
+    started = time.perf_counter()
+    for _ in range(count):
+        response = requests.get(url, stream=True)
+        response.raise_for_status()
+        for _chunk in response.iter_content(chunk_size=1024):
+            pass
+    return time.perf_counter() - started
+
+
+async def run_pooled(url: str, count: int, concurrency: int) -> float:
+    """Return seconds to fetch url count times through FileProxy."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch() -> None:
+        async with semaphore:
+            response = await FileProxy.fetch(url)
+            assert isinstance(response, StreamingResponse)
+            async for _chunk in response.body_iterator:
+                pass
+            if response.background:
+                await response.background()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(fetch() for _ in range(count)))
+    elapsed = time.perf_counter() - started
+    await FileProxy.close()
+    return elapsed
+
+
+def main() -> None:
+    """Run both variants and print requests per second and throughput."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--size", type=int, default=256 * 1024)
+    parser.add_argument(
+        "--latency-ms", type=float, default=20, help="stand-in time to first byte"
+    )
+    args = parser.parse_args()
+
+    server, port = start_server(args.size, args.latency_ms / 1000)
+    url = f"http://127.0.0.1:{port}/file.bin"
+    megabytes = args.requests * args.size / 1024 / 1024
+
+    blocking = run_blocking(url, args.requests)
+    pooled = asyncio.run(run_pooled(url, args.requests, args.concurrency))
+    server.terminate()
+
+    for label, elapsed in (("blocking requests", blocking), ("pooled async", pooled)):
+        print(
+            f"{label:18} {args.requests / elapsed:10.1f} req/s "
+            f"{megabytes / elapsed:10.1f} MB/s"
+        )
+    print(f"speedup:           {blocking / pooled:10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+r"""Benchmark S3 uploads: a single put_object against S3FileInterface.save_file.
+
+Runs against any S3-compatible endpoint, e.g. a local MinIO:
+
+    docker run -p 9100:9000 minio/minio server /data
+    python benchmarks/bench_s3_upload.py --endpoint-url http://127.0.0.1:9100 \
+        --access-key minioadmin --secret-key minioadmin --size 268435456
+
+Without --endpoint-url a moto server is started in-process when moto is
+installed (pip install "moto[server]").
+"""
+
+import argparse
+import os
+import time
+from contextlib import suppress
+
+from jvserve.lib.file_interface import S3FileInterface
+
+
+def start_moto() -> tuple[object, str]:
+    """Start a moto S3 stand-in on an ephemeral port."""
+    from moto.server import ThreadedMotoServer
+
+    server = ThreadedMotoServer(ip_address="127.0.0.1", port=0)
+    server.start()
+    host, port = server.get_host_and_port()
+    return server, f"http://{host}:{port}"
+
+
+def timed(label: str, func: object, size: int, rounds: int) -> float:
+    """Run func rounds times and print its throughput."""
+    started = time.perf_counter()
+    for _ in range(rounds):
+        func()  # type: ignore[operator]
+    elapsed = (time.perf_counter() - started) / rounds
+    print(f"{label:22} {elapsed:8.2f} s {size / elapsed / 1024 / 1024:10.1f} MB/s")
+    return elapsed
+
+
+def main() -> None:
+    """Upload the same payload both ways and print the speedup."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--endpoint-url")
+    parser.add_argument("--access-key", default="testing")
+    parser.add_argument("--secret-key", default="testing")
+    parser.add_argument("--bucket", default="jvserve-bench")
+    parser.add_argument("--size", type=int, default=128 * 1024 * 1024)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    server = None
+    endpoint_url = args.endpoint_url
+    if not endpoint_url:
+        server, endpoint_url = start_moto()
+
+    interface = S3FileInterface(
+        bucket_name=args.bucket,
+        aws_access_key_id=args.access_key,
+        aws_secret_access_key=args.secret_key,
+        region_name="us-east-1",
+        endpoint_url=endpoint_url,
+        files_root="bench",
+    )
+    client = interface.s3_client
+    with suppress(client.exceptions.BucketAlreadyOwnedByYou):
+        client.create_bucket(Bucket=args.bucket)
+
+    payload = os.urandom(args.size)
+    single = timed(
+        "single put_object",
+        lambda: client.put_object(
+            Bucket=args.bucket, Key="bench/single.bin", Body=payload
+        ),
+        args.size,
+        args.rounds,
+    )
+    multipart = timed(
+        "multipart save_file",
+        lambda: interface.save_file("multipart.bin", payload),
+        args.size,
+        args.rounds,
+    )
+    print(f"speedup:               {single / multipart:8.2f}x")
+
+    interface.delete_file("multipart.bin")
+    client.delete_object(Bucket=args.bucket, Key="bench/single.bin")
+    if server is not None:
+        server.stop()  # type: ignore[attr-defined]
+
+
+if __name__ == "__main__":
+    main()
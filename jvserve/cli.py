@@ -4,10 +4,11 @@ import logging
 import os
 import time
 from contextlib import asynccontextmanager
-from typing import AsyncIterator, Optional
+from typing import AsyncIterator, Mapping, Optional
 
 from dotenv import load_dotenv
-from fastapi.responses import FileResponse, Response, StreamingResponse
+from fastapi import FastAPI, Request
+from fastapi.responses import Response
 from jac_cloud.jaseci.security import authenticator
 from jac_cloud.plugin.jaseci import NodeAnchor
 from jaclang.cli.cmdreg import cmd_registry
@@ -18,65 +19,78 @@ from uvicorn import run as _run
 
 from jvserve.lib.agent_interface import AgentInterface
 from jvserve.lib.agent_pulse import AgentPulse
-from jvserve.lib.file_interface import (
-    DEFAULT_FILES_ROOT,
-    FILE_INTERFACE,
-    file_interface,
-)
+from jvserve.lib.file_interface import FILE_INTERFACE, async_file_interface
+from jvserve.lib.file_proxy import FileProxy
 from jvserve.lib.jvlogger import JVLogger
+from jvserve.lib.module_registry import ModuleRegistry
+from jvserve.lib.range_files import RangeStaticFiles
+from jvserve.lib.upload_spool import UploadLimitMiddleware
+from jvserve.lib.walker_executor import WalkerExecutor
 
 load_dotenv(".env")
 
 
-def serve_proxied_file(file_path: str) -> FileResponse | StreamingResponse:
+async def serve_proxied_file(
+    file_path: str, headers: Optional[Mapping[str, str]] = None
+) -> Response:
     """Serve a proxied file from a remote or local URL."""
-    import mimetypes
-
-    import requests
-    from fastapi import HTTPException
-
-    if FILE_INTERFACE == "local":
-        return FileResponse(path=os.path.join(DEFAULT_FILES_ROOT, file_path))
-
-    file_url = file_interface.get_file_url(file_path)
-
-    if file_url and ("localhost" in file_url or "127.0.0.1" in file_url):
-        # prevent recusive calls when env vars are not detected
-        raise HTTPException(status_code=500, detail="Environment not set up correctly")
-
-    if not file_url:
-        raise HTTPException(status_code=404, detail="File not found")
-
-    file_extension = os.path.splitext(file_path)[1].lower()
-
-    # List of extensions to serve directly
-    direct_serve_extensions = [
-        ".pdf",
-        ".html",
-        ".txt",
-        ".js",
-        ".css",
-        ".json",
-        ".xml",
-        ".svg",
-        ".csv",
-        ".ico",
-    ]
-
-    if file_extension in direct_serve_extensions:
-        file_response = requests.get(file_url)
-        file_response.raise_for_status()  # Raise HTTPError for bad responses (4XX or 5XX)
-
-        mime_type = mimetypes.guess_type(file_path)[0] or "application/octet-stream"
-
-        return StreamingResponse(iter([file_response.content]), media_type=mime_type)
-
-    file_response = requests.get(file_url, stream=True)
-    file_response.raise_for_status()
-
-    return StreamingResponse(
-        file_response.iter_content(chunk_size=1024),
-        media_type="application/octet-stream",
+    return await FileProxy.serve(file_path, headers)
+
+
+async def metrics() -> dict:
+    """Return runtime statistics for the executor, caches and webhook machinery."""
+    return {
+        "walker_executor": WalkerExecutor.stats(),
+        "module_registry": ModuleRegistry.stats(),
+        "action_cache": AgentInterface.ACTION_CACHE.stats(),
+        "webhook_limits": {
+            "walker": AgentInterface.WEBHOOK_WALKER_LIMITER.stats(),
+            "agent": AgentInterface.WEBHOOK_AGENT_LIMITER.stats(),
+        },
+        "webhook_queue": (
+            AgentInterface.WEBHOOK_QUEUE.stats()
+            if AgentInterface.WEBHOOK_QUEUE
+            else None
+        ),
+    }
+
+
+def add_agent_routes(app: FastAPI) -> None:
+    """Register the JIVAS agent routes on app."""
+    # endpoints may return a dict or a Response; skip response model generation.
+    # The router accepts any endpoint type, unlike FastAPI.add_api_route's stub.
+    app.router.add_api_route(
+        "/interact",
+        endpoint=AgentInterface.interact_async,
+        methods=["POST"],
+        response_model=None,
+    )
+    app.router.add_api_route(
+        "/webhook/{key}",
+        endpoint=AgentInterface.webhook_exec,
+        methods=["GET", "POST"],
+        response_model=None,
+    )
+    app.router.add_api_route(
+        "/action/walker",
+        endpoint=AgentInterface.action_walker_exec_async,
+        methods=["POST"],
+        dependencies=authenticator,
+        response_model=None,
+    )
+    app.router.add_api_route(
+        "/action/cache/invalidate",
+        endpoint=AgentInterface.invalidate_action_cache,
+        methods=["POST"],
+        dependencies=authenticator,
+    )
+    # stop oversized uploads while they are received, not after form parsing
+    app.add_middleware(UploadLimitMiddleware, paths={"/action/walker"})
+    app.router.add_api_route(
+        "/metrics",
+        endpoint=metrics,
+        methods=["GET"],
+        dependencies=authenticator,
     )
 
 
@@ -124,6 +138,7 @@ class JacCmd:
                     override_name="__main__",
                 )
                 logger.info(f"Loading took {time.time() - start_time} seconds")
+                ModuleRegistry.build(JacMachine.get().list_modules())
 
             AgentInterface.HOST = host
             AgentInterface.PORT = port
@@ -132,11 +147,18 @@ class JacCmd:
             async def on_startup() -> None:
                 # Perform initialization actions here
                 logger.info("JIVAS is starting up...")
+                AgentInterface.init_webhook_cipher()
+                if os.environ.get("JIVAS_WEBHOOK_FAST_ACK"):
+                    # resume webhook calls queued before the last shutdown
+                    AgentInterface.get_webhook_queue()
 
             async def on_shutdown() -> None:
                 # Perform initialization actions here
                 logger.info("JIVAS is shutting down...")
                 AgentPulse.stop()
+                WalkerExecutor.shutdown(wait=False)
+                async_file_interface.close()
+                AgentInterface.stop_webhook_queue()
                 # await AgentRTC.on_shutdown()
                 jctx.close()
                 JacMachine.detach()
@@ -153,20 +175,7 @@ class JacCmd:
             FastAPI.get().router.lifespan_context = lifespan_wrapper
 
             # Setup custom routes
-            FastAPI.get().add_api_route(
-                "/interact", endpoint=AgentInterface.interact, methods=["POST"]
-            )
-            FastAPI.get().add_api_route(
-                "/webhook/{key}",
-                endpoint=AgentInterface.webhook_exec,
-                methods=["GET", "POST"],
-            )
-            FastAPI.get().add_api_route(
-                "/action/walker",
-                endpoint=AgentInterface.action_walker_exec,
-                methods=["POST"],
-                dependencies=authenticator,
-            )
+            add_agent_routes(FastAPI.get())
 
             # run the app
             _run(FastAPI.get(), host=host, port=port, lifespan="on", workers=workers)
@@ -179,7 +188,6 @@ class JacCmd:
             # load FastAPI
             from fastapi import FastAPI
             from fastapi.middleware.cors import CORSMiddleware
-            from fastapi.staticfiles import StaticFiles
 
             # Setup custom routes
             app = FastAPI()
@@ -199,10 +207,10 @@ class JacCmd:
             # Set the environment variable for the file root path
             os.environ["JIVAS_FILES_ROOT_PATH"] = directory
 
-            # Mount the static files directory
+            # Mount the static files directory; Range requests get partial content
             app.mount(
                 "/files",
-                StaticFiles(directory=directory),
+                RangeStaticFiles(directory=directory),
                 name="files",
             )
 
@@ -218,8 +226,8 @@ class JacCmd:
             from fastapi import FastAPI
             from fastapi.middleware.cors import CORSMiddleware
 
-            # Setup custom routes
-            app = FastAPI()
+            # Setup custom routes; the shared proxy client is closed on shutdown
+            app = FastAPI(on_shutdown=[FileProxy.close])
 
             # Add CORS middleware
             app.add_middleware(
@@ -236,17 +244,24 @@ class JacCmd:
                 @app.get("/files/{file_path:path}", response_model=None)
                 async def serve_file(
                     file_path: str,
-                ) -> FileResponse | StreamingResponse | Response:
+                    request: Request,
+                ) -> Response:
                     descriptor_path = os.environ["JIVAS_DESCRIPTOR_ROOT_PATH"]
                     if descriptor_path and descriptor_path in file_path:
                         return Response(status_code=403)
 
-                    return serve_proxied_file(file_path)
+                    return await serve_proxied_file(file_path, request.headers)
+
+            @app.get("/metrics")
+            async def metrics() -> dict:
+                cache = FileProxy.get_cache()
+                return {"proxy_cache": cache.stats() if cache else None}
 
             @app.get("/f/{file_id:path}", response_model=None)
             async def get_proxied_file(
                 file_id: str,
-            ) -> FileResponse | StreamingResponse | Response:
+                request: Request,
+            ) -> Response:
                 from bson import ObjectId
                 from fastapi import HTTPException
 
@@ -262,7 +277,9 @@ class JacCmd:
                     if descriptor_path and descriptor_path in file_details["path"]:
                         return Response(status_code=403)
 
-                    return serve_proxied_file(file_details["path"])
+                    return await serve_proxied_file(
+                        file_details["path"], request.headers
+                    )
 
                 raise HTTPException(status_code=404, detail="File not found")
 
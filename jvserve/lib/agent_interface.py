@@ -1,24 +1,30 @@
 """Agent Interface class and methods for interaction with Jivas."""
 
 import asyncio
+import base64
+import copy
+import hashlib
+import hmac
 import json
 import logging
 import os
+import queue
 import string
+import threading
 import time
 import traceback
-from asyncio import sleep
+from contextlib import suppress
 from typing import Any, AsyncGenerator, Dict, Iterator, List, Optional
 from urllib.parse import quote, unquote
 
-import aiohttp
+import anyio
 import requests
+from dotenv import load_dotenv
 from fastapi import File, Form, Request, UploadFile
 from fastapi.responses import JSONResponse, StreamingResponse
 from jac_cloud.core.architype import AnchorState, Permission, Root
 from jac_cloud.core.context import (
     JASECI_CONTEXT,
-    SUPER_ROOT,
     SUPER_ROOT_ID,
     ExecutionContext,
     JaseciContext,
@@ -26,8 +32,36 @@ from jac_cloud.core.context import (
 from jac_cloud.core.memory import MongoDB
 from jac_cloud.plugin.jaseci import NodeAnchor
 from jaclang.plugin.feature import JacFeature as _Jac
+from jaclang.runtimelib.architype import NodeArchitype, WalkerArchitype
 from jaclang.runtimelib.machine import JacMachine
 from pydantic import BaseModel
+from starlette.datastructures import Headers, QueryParams
+
+from jvserve.lib.cache import LRUCache
+from jvserve.lib.concurrency_limiter import ConcurrencyLimiter, ConcurrencyLimitError
+from jvserve.lib.file_interface import async_file_interface
+from jvserve.lib.module_registry import ModuleRegistry
+from jvserve.lib.streaming import FlushPolicy, coalesce_chunks, iterate_in_thread
+from jvserve.lib.token_cache import TokenCache
+from jvserve.lib.upload_spool import UploadSpool, UploadTooLargeError
+from jvserve.lib.walker_executor import WalkerExecutor, WalkerQueueFullError
+from jvserve.lib.webhook_queue import WebhookQueue
+
+load_dotenv(".env")
+
+
+class PooledJaseciContext(JaseciContext):
+    """JaseciContext that hands its memory layer back to the pool once closed."""
+
+    closed = False
+
+    def close(self) -> None:
+        """Write back and clear memory, then release it for reuse."""
+        if self.closed:
+            return
+        self.closed = True
+        super().close()
+        AgentInterface.release_memory(self.mem)
 
 
 class AgentInterface:
@@ -38,6 +72,43 @@ class AgentInterface:
     ROOT_ID = ""
     TOKEN = ""
     EXPIRATION = None
+    TOKEN_LOCK = threading.Lock()
+    TOKEN_REFRESH_MARGIN = int(os.environ.get("JIVAS_TOKEN_REFRESH_MARGIN", "300"))
+    SYSTEM_ROOT_DOC: Optional[dict] = None
+    SYSTEM_ROOT_LOADED = 0.0
+    SYSTEM_ROOT_TTL = float(os.environ.get("JIVAS_SYSTEM_ROOT_TTL", "5"))
+    SYSTEM_ROOT_LOCK = threading.Lock()
+    MEMORY_POOL: queue.Queue = queue.Queue(
+        maxsize=int(os.environ.get("JIVAS_CONTEXT_POOL_SIZE", "32"))
+    )
+    ACTION_CACHE = LRUCache(
+        max_size=int(os.environ.get("JIVAS_ACTION_CACHE_SIZE", "256")),
+        ttl=float(os.environ.get("JIVAS_ACTION_CACHE_TTL", "60")),
+    )
+    WEBHOOK_TABLES: Optional[tuple[dict, dict]] = None
+    WEBHOOK_SIGNING_KEY = b""
+    WEBHOOK_KEY_CACHE = LRUCache(
+        max_size=int(os.environ.get("JIVAS_WEBHOOK_KEY_CACHE_SIZE", "1024"))
+    )
+    WEBHOOK_QUEUE: Optional[WebhookQueue] = None
+    WEBHOOK_QUEUE_LOCK = threading.Lock()
+    WEBHOOK_IDEMPOTENCY_HEADERS = (
+        "Idempotency-Key",
+        "X-Idempotency-Key",
+        "I-Twilio-Idempotency-Token",
+        "Webhook-Id",
+        "X-GitHub-Delivery",
+        "X-Shopify-Webhook-Id",
+    )
+    # identical bodies are only treated as retries when this is set, and only briefly
+    WEBHOOK_BODY_DEDUP_TTL = float(os.environ.get("JIVAS_WEBHOOK_BODY_DEDUP_TTL", "0"))
+    WEBHOOK_WALKER_LIMITER = ConcurrencyLimiter(
+        int(os.environ.get("JIVAS_WEBHOOK_WALKER_CONCURRENCY", "4"))
+    )
+    WEBHOOK_AGENT_LIMITER = ConcurrencyLimiter(
+        int(os.environ.get("JIVAS_WEBHOOK_AGENT_CONCURRENCY", "8"))
+    )
+    WEBHOOK_LIMIT_TIMEOUT = float(os.environ.get("JIVAS_WEBHOOK_LIMIT_TIMEOUT", "10"))
     LOGGER = logging.getLogger(__name__)
 
     @staticmethod
@@ -45,17 +116,18 @@ class AgentInterface:
         walker_name: str, module_name: str, attributes: dict
     ) -> _Jac.Walker:
         """Spawn any walker by name, located in module"""
-        # Get the list of modules
-        modules = JacMachine.get().list_modules()
-
-        # Search for the exact module name in the list of modules
-        for mod in modules:
-            if mod.endswith(module_name):
-                module_name = mod
-                break
+        # Resolve the full module name and cached architype from the module registry
+        machine = JacMachine.get()
+        module_name = ModuleRegistry.resolve(module_name, machine.loaded_modules)
 
         try:
-            walker = JacMachine.get().spawn_walker(walker_name, attributes, module_name)
+            walker = ModuleRegistry.spawn(
+                module_name,
+                walker_name,
+                attributes,
+                machine.loaded_modules,
+                WalkerArchitype,
+            )
             return walker
         except Exception as e:
             raise ValueError(
@@ -65,17 +137,18 @@ class AgentInterface:
     @staticmethod
     def spawn_node(node_name: str, module_name: str, attributes: dict) -> _Jac.Node:
         """Spawn any node by name, located in module"""
-        # Get the list of modules
-        modules = JacMachine.get().list_modules()
-
-        # Search for the exact module name in the list of modules
-        for mod in modules:
-            if mod.endswith(module_name):
-                module_name = mod
-                break
+        # Resolve the full module name and cached architype from the module registry
+        machine = JacMachine.get()
+        module_name = ModuleRegistry.resolve(module_name, machine.loaded_modules)
 
         try:
-            node = JacMachine.get().spawn_node(node_name, attributes, module_name)
+            node = ModuleRegistry.spawn(
+                module_name,
+                node_name,
+                attributes,
+                machine.loaded_modules,
+                NodeArchitype,
+            )
             return node
         except Exception as e:
             raise ValueError(
@@ -121,59 +194,225 @@ class AgentInterface:
             AgentInterface.LOGGER.error("malformed webhook key")
             return response
 
-        ctx = await AgentInterface.load_context_async()
-        if ctx:
-            # compose full module_path
-            module = f"{module_root}.{walker}"
+        # fast-ack: persist the call and acknowledge before the walker runs
+        if request.method == "POST" and AgentInterface.webhook_fast_ack(walker):
             try:
-                response = _Jac.spawn_call(
-                    ctx.entry_node.architype,
-                    AgentInterface.spawn_walker(
-                        walker_name=walker,
-                        attributes={
-                            "headers": request.headers,
-                            "agent_id": agent_id,
-                            "params": params,
-                            "reporting": False,
-                        },
-                        module_name=module,
-                    ),
-                ).response
-
-                if response:
-                    if isinstance(response, str):
-                        response = json.loads(response)
-                    response = JSONResponse(
-                        status_code=200, content=response, media_type="application/json"
-                    )
-
+                idempotency_key, dedup_ttl = AgentInterface.webhook_idempotency_key(
+                    key, request.headers, await request.body()
+                )
+                await asyncio.to_thread(
+                    AgentInterface.get_webhook_queue().enqueue,
+                    {
+                        "agent_id": agent_id,
+                        "module_root": module_root,
+                        "walker": walker,
+                        "headers": request.headers.items(),
+                        "params": (
+                            dict(params) if isinstance(params, QueryParams) else params
+                        ),
+                    },
+                    idempotency_key,
+                    dedup_ttl,
+                )
+                return response
             except Exception as e:
-                AgentInterface.EXPIRATION = None
                 AgentInterface.LOGGER.error(
-                    f"an exception occurred: {e}, {traceback.format_exc()}"
+                    f"unable to queue {walker}, executing inline: {e}"
                 )
-        else:
-            AgentInterface.LOGGER.error(f"unable to execute {walker}")
 
-        ctx.close()
+        # run the walker off the event loop, within its walker and agent limits
+        timeout = AgentInterface.WEBHOOK_LIMIT_TIMEOUT
+        try:
+            async with AgentInterface.WEBHOOK_WALKER_LIMITER.acquire(
+                f"{module_root}.{walker}", timeout
+            ), AgentInterface.WEBHOOK_AGENT_LIMITER.acquire(agent_id, timeout):
+                result = await WalkerExecutor.run(
+                    AgentInterface.webhook_call,
+                    agent_id,
+                    module_root,
+                    walker,
+                    request.headers,
+                    params,
+                )
+        except (ConcurrencyLimitError, WalkerQueueFullError) as e:
+            AgentInterface.LOGGER.warning(f"webhook {walker} rejected: {e}")
+            return JSONResponse(
+                status_code=503,
+                content={"error": "Server busy, please retry"},
+                headers={"Retry-After": "1"},
+            )
+        except Exception as e:
+            AgentInterface.LOGGER.error(
+                f"an exception occurred: {e}, {traceback.format_exc()}"
+            )
+            return response
+
+        try:
+            if result:
+                if isinstance(result, str):
+                    result = json.loads(result)
+                response = JSONResponse(
+                    status_code=200, content=result, media_type="application/json"
+                )
+        except Exception as e:
+            AgentInterface.LOGGER.error(
+                f"an exception occurred: {e}, {traceback.format_exc()}"
+            )
 
         return response
 
+    @staticmethod
+    def webhook_call(
+        agent_id: str, module_root: str, walker: str, headers: Any, params: Any
+    ) -> Any:
+        """Spawn a webhook walker and return its response; raises if it cannot run."""
+        ctx = AgentInterface.load_context()
+        if not ctx:
+            raise RuntimeError(f"unable to execute {walker}")
+
+        try:
+            # compose full module_path
+            module = f"{module_root}.{walker}"
+            return _Jac.spawn_call(
+                ctx.entry_node.architype,
+                AgentInterface.spawn_walker(
+                    walker_name=walker,
+                    attributes={
+                        "headers": headers,
+                        "agent_id": agent_id,
+                        "params": params,
+                        "reporting": False,
+                    },
+                    module_name=module,
+                ),
+            ).response
+        finally:
+            ctx.close()
+
+    @staticmethod
+    def webhook_fast_ack(walker: str) -> bool:
+        """Return whether webhooks for walker are queued rather than run inline.
+
+        JIVAS_WEBHOOK_FAST_ACK is "true" for every walker or a comma-separated list of walker names.
+        """
+        setting = os.environ.get("JIVAS_WEBHOOK_FAST_ACK", "").strip()
+        if setting.lower() in ("", "false", "0", "no"):
+            return False
+        if setting.lower() in ("true", "1", "yes", "*"):
+            return True
+        return walker in {name.strip() for name in setting.split(",")}
+
+    @staticmethod
+    def webhook_idempotency_key(
+        key: str, headers: Any, body: bytes
+    ) -> tuple[Optional[str], Optional[float]]:
+        """Return the idempotency key for a webhook call and how long it is remembered.
+
+        Provider idempotency or delivery-ID headers are remembered for the queue's
+        dedup TTL. Without one, calls are only deduplicated by a digest of the
+        webhook key and body when JIVAS_WEBHOOK_BODY_DEDUP_TTL is set, for that
+        many seconds; otherwise (None, None) and every call is queued.
+        """
+        for header in AgentInterface.WEBHOOK_IDEMPOTENCY_HEADERS:
+            if value := headers.get(header):
+                return f"{key}:{value}", None
+        if AgentInterface.WEBHOOK_BODY_DEDUP_TTL > 0:
+            digest = hashlib.sha256(key.encode() + b"\n" + body).hexdigest()
+            return digest, AgentInterface.WEBHOOK_BODY_DEDUP_TTL
+        return None, None
+
+    @staticmethod
+    def get_webhook_queue() -> WebhookQueue:
+        """Return the webhook queue, creating and starting it on first use."""
+        if AgentInterface.WEBHOOK_QUEUE is None:
+            with AgentInterface.WEBHOOK_QUEUE_LOCK:
+                if AgentInterface.WEBHOOK_QUEUE is None:
+                    webhook_queue = WebhookQueue(
+                        path=os.environ.get(
+                            "JIVAS_WEBHOOK_QUEUE_PATH", ".jivas/webhook_queue.db"
+                        ),
+                        handler=AgentInterface.run_webhook_job,
+                        workers=int(os.environ.get("JIVAS_WEBHOOK_WORKERS", "4")),
+                        max_attempts=int(
+                            os.environ.get("JIVAS_WEBHOOK_MAX_ATTEMPTS", "3")
+                        ),
+                        dedup_ttl=float(
+                            os.environ.get("JIVAS_WEBHOOK_DEDUP_TTL", "86400")
+                        ),
+                        failed_retention=float(
+                            os.environ.get(
+                                "JIVAS_WEBHOOK_FAILED_RETENTION", str(7 * 86400)
+                            )
+                        ),
+                    )
+                    webhook_queue.start()
+                    AgentInterface.WEBHOOK_QUEUE = webhook_queue
+        return AgentInterface.WEBHOOK_QUEUE
+
+    @staticmethod
+    def run_webhook_job(job: dict) -> None:
+        """Run a queued webhook call on a queue worker thread.
+
+        Headers are queued as (name, value) pairs and rebuilt as a case-insensitive
+        Headers object, matching what walkers receive when the webhook runs inline.
+        """
+        headers = job["headers"]
+        if isinstance(headers, dict):
+            # jobs queued before headers were stored as pairs
+            headers = headers.items()
+        AgentInterface.webhook_call(
+            job["agent_id"],
+            job["module_root"],
+            job["walker"],
+            Headers(
+                raw=[
+                    (name.lower().encode("latin-1"), value.encode("latin-1"))
+                    for name, value in headers
+                ]
+            ),
+            job["params"],
+        )
+
+    @staticmethod
+    def stop_webhook_queue() -> None:
+        """Stop the webhook queue workers; pending jobs resume on the next start."""
+        with AgentInterface.WEBHOOK_QUEUE_LOCK:
+            if AgentInterface.WEBHOOK_QUEUE is not None:
+                AgentInterface.WEBHOOK_QUEUE.stop()
+                AgentInterface.WEBHOOK_QUEUE = None
+
     @staticmethod
     def get_action_data(agent_id: str, action_label: str) -> dict:
-        """Retrieves the data for a specific action of an agent."""
+        """Retrieves the data for a specific action of an agent.
+
+        Actions are indexed per agent by label in ACTION_CACHE; the list_actions
+        walker only runs when the agent is not cached or its entry has expired.
+        """
+
+        actions = AgentInterface.ACTION_CACHE.get(agent_id)
+        if actions is None:
+            actions = AgentInterface.load_action_index(agent_id)
+            if actions is None:
+                return {}
+
+        action_data = actions.get(action_label)
+        return dict(action_data) if action_data else {}
+
+    @staticmethod
+    def load_action_index(agent_id: str) -> Optional[dict]:
+        """Load an agent's actions keyed by label into ACTION_CACHE; None on failure."""
 
-        action_data = {}
         ctx = AgentInterface.load_context()
 
         if not ctx:
-            return {}
+            return None
 
         # TODO : raise error in the event agent id is invalid
         AgentInterface.LOGGER.debug(
             f"attempting to interact with agent {agent_id} with user root {ctx.root}..."
         )
 
+        index: Optional[Dict[str, dict]] = None
         try:
             actions = _Jac.spawn_call(
                 ctx.entry_node.architype,
@@ -184,23 +423,43 @@ class AgentInterface:
                 ),
             ).actions
 
-            if actions:
-                for action in actions:
-                    if action.get("label") == action_label:
-                        action_data = action
-                        break
+            index = {}
+            for action in actions or []:
+                # keep the first action per label, as the previous linear scan did
+                index.setdefault(action.get("label"), action)
+            AgentInterface.ACTION_CACHE.set(agent_id, index)
 
         except Exception as e:
-            AgentInterface.EXPIRATION = None
             AgentInterface.LOGGER.error(
                 f"an exception occurred: {e}, {traceback.format_exc()}"
             )
 
         ctx.close()
-        return action_data
+        return index
+
+    @staticmethod
+    def invalidate_action_data(agent_id: Optional[str] = None) -> None:
+        """Drop cached action data for agent_id, or for every agent if omitted.
+
+        Call this after actions are installed, updated or removed.
+        """
+        if agent_id:
+            AgentInterface.ACTION_CACHE.delete(agent_id)
+        else:
+            AgentInterface.ACTION_CACHE.clear()
 
     @staticmethod
-    def action_walker_exec(
+    async def invalidate_action_cache(agent_id: Optional[str] = None) -> dict:
+        """Drop cached action data on the worker handling this request.
+
+        The cache is per process; other workers pick up changes once their
+        entries expire after JIVAS_ACTION_CACHE_TTL seconds.
+        """
+        AgentInterface.invalidate_action_data(agent_id)
+        return {"invalidated": agent_id or "all"}
+
+    @staticmethod
+    async def action_walker_exec_async(
         agent_id: Optional[str] = Form(None),  # noqa: B008
         module_root: Optional[str] = Form(None),  # noqa: B008
         walker: Optional[str] = Form(None),  # noqa: B008
@@ -208,8 +467,9 @@ class AgentInterface:
         attachments: List[UploadFile] = File(default_factory=list),  # noqa: B008
     ) -> JSONResponse:
         """
-        Execute a named walker exposed by an action within context.
-        Capable of handling JSON or file data depending on request.
+        Execute a named walker exposed by an action without blocking the event loop.
+        Attachments are spooled and hashed concurrently on the file pool; the
+        walker then runs on the WalkerExecutor.
 
         Args:
             agent_id: ID of the agent
@@ -221,72 +481,71 @@ class AgentInterface:
         Returns:
             JSONResponse: Response containing walker output or error message
         """
-        ctx = None
-        try:
-            # Validate required parameters
-            if walker is None or agent_id is None or module_root is None:
-                AgentInterface.LOGGER.error("Missing required parameters")
-                return JSONResponse(
-                    status_code=400,  # 400 (Bad Request)
-                    content={"error": "Missing required parameters"},
-                )
+        # Validate required parameters
+        if walker is None or agent_id is None or module_root is None:
+            AgentInterface.LOGGER.error("Missing required parameters")
+            return JSONResponse(
+                status_code=400,  # 400 (Bad Request)
+                content={"error": "Missing required parameters"},
+            )
 
-            # Load execution context
-            ctx = AgentInterface.load_context()
-            if not ctx:
-                AgentInterface.LOGGER.error(f"Unable to execute {walker}")
+        # Prepare attributes
+        attributes: Dict[str, Any] = {"agent_id": agent_id}
+
+        # Parse additional arguments if provided
+        if args:
+            try:
+                attributes.update(json.loads(args))
+            except json.JSONDecodeError as e:
+                AgentInterface.LOGGER.error(f"Invalid JSON in args: {e}")
                 return JSONResponse(
-                    status_code=500,
-                    content={"error": "Failed to load execution context"},
+                    status_code=400,
+                    content={"error": "Invalid JSON in arguments"},
                 )
 
-            # Prepare attributes
-            attributes: Dict[str, Any] = {"agent_id": agent_id}
+        spool = UploadSpool.from_env()
+        try:
+            # spooling and storing attachments is file I/O; run it on the file pool
+            files = await asyncio.gather(
+                *(
+                    async_file_interface.run(
+                        spool.add, file.filename, file.content_type, file.file
+                    )
+                    for file in attachments
+                ),
+                return_exceptions=True,
+            )
 
-            # Parse additional arguments if provided
-            if args:
-                try:
-                    attributes.update(json.loads(args))
-                except json.JSONDecodeError as e:
-                    AgentInterface.LOGGER.error(f"Invalid JSON in args: {e}")
+            for file, result in zip(attachments, files):
+                if isinstance(result, UploadTooLargeError):
+                    AgentInterface.LOGGER.error(str(result))
                     return JSONResponse(
-                        status_code=400,
-                        content={"error": "Invalid JSON in arguments"},
+                        status_code=413,  # 413 (Content Too Large)
+                        content={"error": str(result)},
+                    )
+                if isinstance(result, Exception):
+                    AgentInterface.LOGGER.error(
+                        f"Failed to process file {file.filename}: {result}"
                     )
 
-            # Process uploaded files
             if attachments:
-                attributes["files"] = []
-                for file in attachments:
-                    try:
-                        attributes["files"].append(
-                            {
-                                "name": file.filename,
-                                "type": file.content_type,
-                                "content": file.file.read(),
-                            }
-                        )
-                    except Exception as e:
-                        AgentInterface.LOGGER.error(
-                            f"Failed to process file {file.filename}: {e}"
-                        )
-                        continue  # Skip problematic files or return error if critical
+                attributes["files"] = [
+                    result for result in files if not isinstance(result, Exception)
+                ]
 
             # Execute the walker
-            walker_response = _Jac.spawn_call(
-                ctx.entry_node.architype,
-                AgentInterface.spawn_walker(
-                    walker_name=walker,
-                    attributes=attributes,
-                    module_name=f"{module_root}.{walker}",
-                ),
-            ).response
-            ctx.close()
-
-            return walker_response
+            return await WalkerExecutor.run(
+                AgentInterface.action_walker_call, walker, module_root, attributes
+            )
 
+        except WalkerQueueFullError as e:
+            AgentInterface.LOGGER.warning(f"{walker} rejected: {e}")
+            return JSONResponse(
+                status_code=503,
+                content={"error": "Server busy, please retry"},
+                headers={"Retry-After": "1"},
+            )
         except Exception as e:
-            AgentInterface.EXPIRATION = None
             AgentInterface.LOGGER.error(
                 f"Exception occurred: {str(e)}\n{traceback.format_exc()}"
             )
@@ -295,11 +554,35 @@ class AgentInterface:
                 content={"error": "Internal server error", "details": str(e)},
             )
         finally:
-            if ctx:
-                try:
-                    ctx.close()
-                except Exception as e:
-                    AgentInterface.LOGGER.error(f"Error closing context: {str(e)}")
+            await asyncio.to_thread(spool.close)
+
+    @staticmethod
+    def action_walker_call(walker: str, module_root: str, attributes: dict) -> Any:
+        """Load a context, spawn an action walker on it and close it on this thread.
+
+        Closing writes back changed anchors, which needs the Jaseci context set
+        while loading, so all three steps run in one call. Returns the walker
+        response, or a 500 JSONResponse when no context can be loaded.
+        """
+        ctx = AgentInterface.load_context()
+        if not ctx:
+            AgentInterface.LOGGER.error(f"Unable to execute {walker}")
+            return JSONResponse(
+                status_code=500,
+                content={"error": "Failed to load execution context"},
+            )
+
+        try:
+            return _Jac.spawn_call(
+                ctx.entry_node.architype,
+                AgentInterface.spawn_walker(
+                    walker_name=walker,
+                    attributes=attributes,
+                    module_name=f"{module_root}.{walker}",
+                ),
+            ).response
+        finally:
+            ctx.close()
 
     class InteractPayload(BaseModel):
         """Payload for interacting with the agent."""
@@ -314,14 +597,34 @@ class AgentInterface:
         streaming: Optional[bool] = None
 
     @staticmethod
-    def interact(payload: InteractPayload, request: Request) -> dict:
-        """Interact with the agent."""
+    async def interact_async(
+        payload: InteractPayload, request: Request
+    ) -> dict | JSONResponse:
+        """Interact with the agent without blocking the event loop.
+
+        The walker run is handed to the WalkerExecutor; when it is saturated the
+        caller receives a 503 instead of queueing on the default threadpool.
+        """
+        try:
+            response = await WalkerExecutor.run(AgentInterface.interact_call, payload)
+        except WalkerQueueFullError as e:
+            AgentInterface.LOGGER.warning(f"interact rejected: {e}")
+            return JSONResponse(
+                status_code=503,
+                content={"error": "Server busy, please retry"},
+                headers={"Retry-After": "1"},
+            )
+        return AgentInterface.interact_response(payload, response)
+
+    @staticmethod
+    def interact_call(payload: InteractPayload) -> Any:
+        """Spawn the interact walker within context and return the walker; None on failure."""
         response = None
         ctx = AgentInterface.load_context()
         session_id = payload.session_id if payload.session_id else ""
 
         if not ctx:
-            return {}
+            return None
 
         AgentInterface.LOGGER.debug(
             f"attempting to interact with agent {payload.agent_id} with user root {ctx.root}..."
@@ -346,124 +649,132 @@ class AgentInterface:
                     module_name="jivas.agent.action.interact",
                 ),
             )
+        except Exception as e:
+            AgentInterface.LOGGER.error(
+                f"an exception occurred: {e}, {traceback.format_exc()}"
+            )
 
-            if payload.streaming:
-                # since streaming occurs asynchronously, we'll need to close the context for writebacks here
-                # at this point of closure, there will be an open interaction_node without a response
-                # our job hereafter is to stream to completion and then update and close this interaction_node with the final result
-
-                ctx.close()
-                if (
-                    response is not None
-                    and hasattr(response, "generator")
-                    and hasattr(response, "interaction_node")
-                ):
-
-                    interaction_node = response.interaction_node
-
-                    async def generate(
-                        generator: Iterator, request: Request
-                    ) -> AsyncGenerator[str, None]:
-                        """
-                        Asynchronously yield data chunks from a response generator in Server-Sent Events (SSE) format.
-
-                        Accumulates the full text content and yields each chunk as a JSON-encoded SSE message.
-                        After all chunks are processed, updates the interaction node with the complete generated text and triggers an update in the graph context.
-
-                        Yields:
-                            str: A JSON-encoded string representing the current chunk of data in SSE format.
-                        """
-                        full_text = ""
-                        total_tokens = 0
-
-                        try:
-                            for chunk in generator:
-                                full_text += chunk.content
-                                total_tokens += 1  # each chunk is a token, let's tally
-                                yield (
-                                    "data: "
-                                    + json.dumps(
-                                        {
-                                            "id": interaction_node.id,
-                                            "content": chunk.content,
-                                            "session_id": interaction_node.response.get(
-                                                "session_id"
-                                            ),
-                                            "type": chunk.type,
-                                            "metadata": chunk.response_metadata,
-                                        }
-                                    )
-                                    + "\n\n"
-                                )
-                                await sleep(0.025)
-                            # Update the interaction node with the fully generated text
-                            actx = await AgentInterface.load_context_async()
-                            try:
-                                interaction_node.set_text_message(message=full_text)
-                                interaction_node.add_tokens(total_tokens)
-                                _Jac.spawn_call(
-                                    NodeAnchor.ref(interaction_node.id).architype,
-                                    AgentInterface.spawn_walker(
-                                        walker_name="update_interaction",
-                                        attributes={
-                                            "interaction_data": interaction_node.export(),
-                                        },
-                                        module_name="jivas.agent.memory.update_interaction",
-                                    ),
-                                )
-                            finally:
-                                if actx:
-                                    actx.close()
-
-                        except Exception as e:
-                            AgentInterface.LOGGER.error(
-                                f"Exception in streaming generator: {e}, {traceback.format_exc()}"
-                            )
-                        except asyncio.CancelledError:
-                            AgentInterface.LOGGER.error(
-                                "Client disconnected. Aborting stream."
-                            )
-                            actx = await AgentInterface.load_context_async()
-                            try:
-                                interaction_node.set_text_message(message=full_text)
-                                interaction_node.add_tokens(total_tokens)
-                                _Jac.spawn_call(
-                                    NodeAnchor.ref(interaction_node.id).architype,
-                                    AgentInterface.spawn_walker(
-                                        walker_name="update_interaction",
-                                        attributes={
-                                            "interaction_data": interaction_node.export(),
-                                        },
-                                        module_name="jivas.agent.memory.update_interaction",
-                                    ),
-                                )
-                            finally:
-                                if actx:
-                                    actx.close()
-
-                    return StreamingResponse(
-                        generate(response.generator, request),
-                        media_type="text/event-stream",
-                    )
+        # when streaming, closing here writes back the open interaction_node without a response;
+        # the stream then runs to completion and updates the interaction_node with the final result
+        ctx.close()
+        return response
 
-                else:
-                    AgentInterface.LOGGER.error(
-                        "Response is None or missing required attributes for streaming."
-                    )
-                    return {}
+    @staticmethod
+    def interact_response(payload: InteractPayload, response: Any) -> dict:
+        """Turn the result of an interact walker into the endpoint response."""
+        if response is None:
+            return {}
 
-            else:
-                response = response.response
-                ctx.close()
-                return response if response else {}
+        if not payload.streaming:
+            return response.response if response.response else {}
+
+        if hasattr(response, "generator") and hasattr(response, "interaction_node"):
+            return StreamingResponse(
+                AgentInterface.stream_interaction(
+                    response.generator, response.interaction_node, payload.channel
+                ),
+                media_type="text/event-stream",
+            )
+
+        AgentInterface.LOGGER.error(
+            "Response is None or missing required attributes for streaming."
+        )
+        return {}
+
+    @staticmethod
+    async def stream_interaction(
+        generator: Iterator, interaction_node: Any, channel: Optional[str] = None
+    ) -> AsyncGenerator[str, None]:
+        """
+        Asynchronously yield data chunks from a response generator in Server-Sent Events (SSE) format.
+
+        The blocking generator is drained in a worker thread so upstream waits never stall
+        the event loop. Chunks are sent as soon as they arrive, or coalesced into frames according to the
+        channel's FlushPolicy. Accumulates the full text content and yields each frame as a JSON-encoded SSE message.
+        After all chunks are processed, updates the interaction node with the complete generated text and triggers an update in the graph context.
+
+        Yields:
+            str: A JSON-encoded string representing the current frame of data in SSE format.
+        """
+        full_text = ""
+        total_tokens = 0
+        policy = FlushPolicy.for_channel(channel)
+
+        try:
+            async for frame in coalesce_chunks(iterate_in_thread(generator), policy):
+                content = "".join(chunk.content for chunk in frame)
+                full_text += content
+                total_tokens += len(frame)  # each chunk is a token, let's tally
+                yield (
+                    "data: "
+                    + json.dumps(
+                        {
+                            "id": interaction_node.id,
+                            "content": content,
+                            "session_id": interaction_node.response.get("session_id"),
+                            "type": frame[-1].type,
+                            "metadata": frame[-1].response_metadata,
+                        }
+                    )
+                    + "\n\n"
+                )
+            # Update the interaction node with the fully generated text
+            await AgentInterface.update_interaction(
+                interaction_node, full_text, total_tokens
+            )
 
         except Exception as e:
-            AgentInterface.EXPIRATION = None
             AgentInterface.LOGGER.error(
-                f"an exception occurred: {e}, {traceback.format_exc()}"
+                f"Exception in streaming generator: {e}, {traceback.format_exc()}"
             )
-            ctx.close()
-            return {}
+        except asyncio.CancelledError:
+            AgentInterface.LOGGER.error("Client disconnected. Aborting stream.")
+            # the request's cancel scope would cancel the write-back before it ran
+            with anyio.CancelScope(shield=True):
+                await AgentInterface.update_interaction(
+                    interaction_node, full_text, total_tokens
+                )
+
+    @staticmethod
+    async def update_interaction(
+        interaction_node: Any, full_text: str, total_tokens: int
+    ) -> None:
+        """Write the streamed text and token tally back to the interaction node.
+
+        The walker run and node lookup go to the WalkerExecutor; when it is
+        saturated the write-back falls back to a plain thread rather than being lost.
+        """
+        args = (interaction_node, full_text, total_tokens)
+        try:
+            await WalkerExecutor.run(AgentInterface.update_interaction_call, *args)
+        except WalkerQueueFullError:
+            AgentInterface.LOGGER.warning(
+                "walker executor saturated; updating interaction on a thread."
+            )
+            await asyncio.to_thread(AgentInterface.update_interaction_call, *args)
+
+    @staticmethod
+    def update_interaction_call(
+        interaction_node: Any, full_text: str, total_tokens: int
+    ) -> None:
+        """Spawn the update_interaction walker on the interaction node within context."""
+        actx = AgentInterface.load_context()
+        try:
+            interaction_node.set_text_message(message=full_text)
+            interaction_node.add_tokens(total_tokens)
+            _Jac.spawn_call(
+                NodeAnchor.ref(interaction_node.id).architype,
+                AgentInterface.spawn_walker(
+                    walker_name="update_interaction",
+                    attributes={
+                        "interaction_data": interaction_node.export(),
+                    },
+                    module_name="jivas.agent.memory.update_interaction",
+                ),
+            )
+        finally:
+            if actx:
+                actx.close()
 
     @staticmethod
     def pulse(action_label: str, agent_id: str = "") -> dict:
@@ -499,7 +810,6 @@ class AgentInterface:
                 ),
             ).response
         except Exception as e:
-            AgentInterface.EXPIRATION = None
             AgentInterface.LOGGER.error(
                 f"an exception occurred: {e}, {traceback.format_exc()}"
             )
@@ -525,12 +835,12 @@ class AgentInterface:
 
         endpoint = f"http://{host}:{port}/walker/pulse"
 
-        if AgentInterface.TOKEN:
+        if token := ctx.get("token"):
 
             try:
                 headers = {}
                 json = {"action_label": action_label, "agent_id": agent_id}
-                headers["Authorization"] = "Bearer " + AgentInterface.TOKEN
+                headers["Authorization"] = "Bearer " + token
 
                 # call interact
                 response = requests.post(endpoint, json=json, headers=headers)
@@ -540,11 +850,10 @@ class AgentInterface:
                     return result.get("reports", {})
 
                 if response.status_code == 401:
-                    AgentInterface.EXPIRATION = None
+                    AgentInterface.expire_token(token)
                     return {}
 
             except Exception as e:
-                AgentInterface.EXPIRATION = None
                 AgentInterface.LOGGER.error(
                     f"an exception occurred: {e}, {traceback.format_exc()}"
                 )
@@ -565,7 +874,7 @@ class AgentInterface:
 
         endpoint = f"http://{host}:{port}/walker/interact"
 
-        if ctx["token"]:
+        if token := ctx["token"]:
 
             try:
                 headers = {}
@@ -580,7 +889,7 @@ class AgentInterface:
                     "streaming": payload.streaming or False,
                     "reporting": False,
                 }
-                headers["Authorization"] = "Bearer " + AgentInterface.TOKEN
+                headers["Authorization"] = "Bearer " + token
 
                 # call interact
                 response = requests.post(endpoint, json=json, headers=headers)
@@ -590,11 +899,10 @@ class AgentInterface:
                     return result["reports"]
 
                 if response.status_code == 401:
-                    AgentInterface.EXPIRATION = None
+                    AgentInterface.expire_token(token)
                     return {}
 
             except Exception as e:
-                AgentInterface.EXPIRATION = None
                 AgentInterface.LOGGER.error(
                     f"an exception occurred: {e}, {traceback.format_exc()}"
                 )
@@ -612,19 +920,19 @@ class AgentInterface:
         entry: NodeAnchor | None = None,
     ) -> Optional[ExecutionContext]:
         """Load the execution context asynchronously."""
-        ctx = await AgentInterface.get_user_context_async()
-        if ctx:
-            AgentInterface.ROOT_ID = ctx["root_id"]
-            AgentInterface.TOKEN = ctx["token"]
-            AgentInterface.EXPIRATION = ctx["expiration"]
+        await AgentInterface.get_user_context_async()
         return AgentInterface.get_jaseci_context(entry, AgentInterface.ROOT_ID)
 
     @staticmethod
     def get_jaseci_context(entry: NodeAnchor | None, root_id: str) -> ExecutionContext:
-        """Build the execution context for the agent."""
+        """Build the execution context for the agent.
+
+        The system root document is cached briefly and memory layers are drawn
+        from a pool, so setting up a context rarely costs a database round trip.
+        """
 
         try:
-            ctx = JaseciContext()
+            ctx = PooledJaseciContext()
             ctx.base = ExecutionContext.get()
         except Exception as e:
             AgentInterface.LOGGER.error(
@@ -632,14 +940,54 @@ class AgentInterface:
             )
             return None
 
-        ctx.mem = MongoDB()
+        ctx.mem = AgentInterface.acquire_memory()
         ctx.reports = []
         ctx.status = 200
 
         # load the user root graph
         user_root = NodeAnchor.ref(f"n:root:{root_id}")
 
-        if not isinstance(system_root := ctx.mem.find_by_id(SUPER_ROOT), NodeAnchor):
+        system_root = AgentInterface.get_system_root(ctx.mem)
+        ctx.mem.set(system_root.id, system_root)
+
+        ctx.system_root = system_root
+        ctx.root = user_root if user_root else system_root
+        ctx.entry_node = entry if entry else ctx.root
+
+        if _ctx := JASECI_CONTEXT.get(None):
+            _ctx.close()
+        JASECI_CONTEXT.set(ctx)
+
+        return ctx
+
+    @staticmethod
+    def get_system_root(mem: MongoDB) -> NodeAnchor:
+        """Return a fresh system root anchor for one context's memory.
+
+        The stored document is cached for JIVAS_SYSTEM_ROOT_TTL seconds, and each
+        context gets its own anchor built from a copy of it, so concurrent contexts
+        never share (or write back) one mutable anchor and changes made by other
+        workers are picked up once the document expires.
+        """
+        with AgentInterface.SYSTEM_ROOT_LOCK:
+            doc = AgentInterface.SYSTEM_ROOT_DOC
+            if (
+                doc is None
+                or time.monotonic() - AgentInterface.SYSTEM_ROOT_LOADED
+                >= AgentInterface.SYSTEM_ROOT_TTL
+            ):
+                doc = AgentInterface.load_system_root_doc()
+                AgentInterface.SYSTEM_ROOT_DOC = doc
+                AgentInterface.SYSTEM_ROOT_LOADED = time.monotonic()
+
+        return NodeAnchor.Collection.__document__(copy.deepcopy(doc))
+
+    @staticmethod
+    def load_system_root_doc() -> dict:
+        """Read the system root document, creating the system root if it is missing."""
+        collection = NodeAnchor.Collection
+        query = {"_id": SUPER_ROOT_ID}
+        if not (doc := collection.collection().find_one(query)):
             system_root = NodeAnchor(
                 architype=object.__new__(Root),
                 id=SUPER_ROOT_ID,
@@ -649,36 +997,102 @@ class AgentInterface:
                 edges=[],
             )
             system_root.architype.__jac__ = system_root
-            NodeAnchor.Collection.insert_one(system_root.serialize())
-            system_root.sync_hash()
-            ctx.mem.set(system_root.id, system_root)
+            collection.insert_one(system_root.serialize())
+            doc = collection.collection().find_one(query)
+        return doc
 
-        ctx.system_root = system_root
-        ctx.root = user_root if user_root else system_root
-        ctx.entry_node = entry if entry else ctx.root
+    @staticmethod
+    def acquire_memory() -> MongoDB:
+        """Take a reset memory layer from the pool, or create one if it is empty."""
+        try:
+            return AgentInterface.MEMORY_POOL.get_nowait()
+        except queue.Empty:
+            return MongoDB()
 
-        if _ctx := JASECI_CONTEXT.get(None):
-            _ctx.close()
-        JASECI_CONTEXT.set(ctx)
+    @staticmethod
+    def release_memory(mem: MongoDB) -> None:
+        """Return a closed (and therefore cleared) memory layer to the pool."""
+        with suppress(queue.Full):
+            AgentInterface.MEMORY_POOL.put_nowait(mem)
 
-        return ctx
+    @staticmethod
+    def current_user_context() -> dict:
+        """Return the user context currently held by this process."""
+        return {
+            "root_id": AgentInterface.ROOT_ID,
+            "token": AgentInterface.TOKEN,
+            "expiration": AgentInterface.EXPIRATION,
+        }
 
     @staticmethod
     def get_user_context() -> Optional[dict]:
-        """Set graph context for JIVAS if user is not logged in; attempt registration if login fails."""
+        """Return the JIVAS user context, refreshing the token when it is close to expiry.
+
+        Refreshes are single-flight: one thread logs in while the others wait, or keep
+        using the current token if it has not yet expired. When JIVAS_TOKEN_CACHE_FILE
+        is set the refreshed token is shared with the other worker processes too.
+        """
+        current = AgentInterface.current_user_context()
+        if TokenCache.is_fresh(current, AgentInterface.TOKEN_REFRESH_MARGIN):
+            return current
+
+        if TokenCache.is_fresh(current):
+            # still valid; renew proactively unless another thread already is
+            if not AgentInterface.TOKEN_LOCK.acquire(blocking=False):
+                return current
+        else:
+            AgentInterface.TOKEN_LOCK.acquire()
+
+        try:
+            current = AgentInterface.current_user_context()
+            if TokenCache.is_fresh(current, AgentInterface.TOKEN_REFRESH_MARGIN):
+                return current
+
+            cache_file = os.environ.get("JIVAS_TOKEN_CACHE_FILE")
+            if not cache_file:
+                ctx = AgentInterface.login_user_context()
+            else:
+                cache = TokenCache(cache_file)
+                with cache.lock():
+                    ctx = cache.read() or {}
+                    if TokenCache.is_fresh(ctx, AgentInterface.TOKEN_REFRESH_MARGIN):
+                        AgentInterface.ROOT_ID = ctx["root_id"]
+                        AgentInterface.TOKEN = ctx["token"]
+                        AgentInterface.EXPIRATION = ctx["expiration"]
+                    elif ctx := AgentInterface.login_user_context():
+                        cache.write(ctx)
+
+            if ctx:
+                return ctx
+            # refresh failed; keep serving with the current token until it expires
+            return current if TokenCache.is_fresh(current) else {}
+        finally:
+            AgentInterface.TOKEN_LOCK.release()
+
+    @staticmethod
+    async def get_user_context_async() -> Optional[dict]:
+        """Return the JIVAS user context without blocking the event loop on a refresh."""
+        current = AgentInterface.current_user_context()
+        if TokenCache.is_fresh(current, AgentInterface.TOKEN_REFRESH_MARGIN):
+            return current
+        return await asyncio.to_thread(AgentInterface.get_user_context)
+
+    @staticmethod
+    def expire_token(token: str) -> None:
+        """Mark token as expired after it was rejected, unless it was already replaced."""
+        with AgentInterface.TOKEN_LOCK:
+            if token and AgentInterface.TOKEN == token:
+                AgentInterface.EXPIRATION = None
+        if cache_file := os.environ.get("JIVAS_TOKEN_CACHE_FILE"):
+            TokenCache(cache_file).clear(token)
+
+    @staticmethod
+    def login_user_context() -> dict:
+        """Log the JIVAS user in, attempting registration if login fails."""
         ctx: dict = {}
         host = AgentInterface.HOST
         port = AgentInterface.PORT
 
-        # if user context still active, return it
-        now = int(time.time())
-        if AgentInterface.EXPIRATION and AgentInterface.EXPIRATION > now:
-            return {
-                "root_id": AgentInterface.ROOT_ID,
-                "token": AgentInterface.TOKEN,
-                "expiration": AgentInterface.EXPIRATION,
-            }
-
         user = os.environ.get("JIVAS_USER")
         password = os.environ.get("JIVAS_PASSWORD")
         if not user or not password:
@@ -687,6 +1101,10 @@ class AgentInterface:
             )
             return ctx
 
+        # resolve the service identity in-process; the loopback HTTP login is only a fallback
+        if ctx := AgentInterface.get_service_identity(user, password):
+            return ctx
+
         login_url = f"http://{host}:{port}/user/login"
         register_url = f"http://{host}:{port}/user/register"
 
@@ -728,6 +1146,14 @@ class AgentInterface:
                     )
 
                     if login_response.status_code == 200:
+                        data = login_response.json()
+                        ctx["root_id"] = AgentInterface.ROOT_ID = data["user"][
+                            "root_id"
+                        ]
+                        ctx["token"] = AgentInterface.TOKEN = data["token"]
+                        ctx["expiration"] = AgentInterface.EXPIRATION = data["user"][
+                            "expiration"
+                        ]
                         AgentInterface.LOGGER.info(
                             f"Login successful after registration, ROOT_ID ({ctx['root_id']}) set for user {user}."
                         )
@@ -741,7 +1167,6 @@ class AgentInterface:
                     )
 
         except Exception as e:
-            AgentInterface.EXPIRATION = None
             AgentInterface.LOGGER.error(
                 f"an exception occurred: {e}, {traceback.format_exc()}"
             )
@@ -749,92 +1174,49 @@ class AgentInterface:
         return ctx
 
     @staticmethod
-    async def get_user_context_async() -> Optional[dict]:
-        """Set graph context for JIVAS if user is not logged in; attempt registration if login fails."""
-        ctx: dict = {}
-        host = AgentInterface.HOST
-        port = AgentInterface.PORT
+    def get_service_identity(user: str, password: str) -> dict:
+        """Log the JIVAS service user in through jac_cloud's user store, registering it if needed.
+
+        Runs in-process, so no request is made back to this server. Returns an
+        empty dict when the identity cannot be resolved this way.
+        """
+        try:
+            from jac_cloud.jaseci.dtos import UserRequest
+            from jac_cloud.jaseci.models import User
+            from jac_cloud.jaseci.routers.user import login, register
+
+            credentials = {"email": user, "password": password}
+            response = login(UserRequest(**credentials))
+
+            if response.status_code != 200:
+                AgentInterface.LOGGER.info(
+                    f"Login failed with status code {response.status_code}, attempting registration..."
+                )
+                register(User.register_type()(**credentials))
+                response = login(UserRequest(**credentials))
+
+            if response.status_code != 200:
+                AgentInterface.LOGGER.error(
+                    f"In-process login failed with status code {response.status_code}."
+                )
+                return {}
+
+            data = json.loads(response.body)
+            AgentInterface.ROOT_ID = data["user"]["root_id"]
+            AgentInterface.TOKEN = data["token"]
+            AgentInterface.EXPIRATION = data["user"]["expiration"]
 
-        # if user context still active, return it
-        now = int(time.time())
-        if AgentInterface.EXPIRATION and AgentInterface.EXPIRATION > now:
             return {
                 "root_id": AgentInterface.ROOT_ID,
                 "token": AgentInterface.TOKEN,
                 "expiration": AgentInterface.EXPIRATION,
             }
 
-        user = os.environ.get("JIVAS_USER")
-        password = os.environ.get("JIVAS_PASSWORD")
-        if not user or not password:
-            AgentInterface.LOGGER.error(
-                "JIVAS_USER and or JIVAS_PASSWORD environment variable is not set."
+        except Exception as e:
+            AgentInterface.LOGGER.warning(
+                f"in-process login unavailable, falling back to HTTP: {e}"
             )
-            return ctx
-
-        login_url = f"http://{host}:{port}/user/login"
-        register_url = f"http://{host}:{port}/user/register"
-
-        async with aiohttp.ClientSession() as session:
-            try:
-                # Attempt to log in
-                async with session.post(
-                    login_url, json={"email": user, "password": password}
-                ) as response:
-                    if response.status == 200:
-                        # Login successful, set the ROOT_ID
-                        data = await response.json()
-                        ctx["root_id"] = AgentInterface.ROOT_ID = data["user"][
-                            "root_id"
-                        ]
-                        ctx["token"] = AgentInterface.TOKEN = data["token"]
-                        ctx["expiration"] = AgentInterface.EXPIRATION = data["user"][
-                            "expiration"
-                        ]
-                    else:
-                        AgentInterface.LOGGER.info(
-                            f"Login failed with status code {response.status}, attempting registration..."
-                        )
-
-                        # Attempt to register the user
-                        async with session.post(
-                            register_url, json={"email": user, "password": password}
-                        ) as register_response:
-                            if register_response.status == 201:
-                                AgentInterface.LOGGER.info(
-                                    f"Registration successful for user {user}, attempting login again..."
-                                )
-
-                                # Re-attempt login after successful registration
-                                async with session.post(
-                                    login_url,
-                                    json={"email": user, "password": password},
-                                ) as login_response:
-                                    if login_response.status == 200:
-                                        data = await login_response.json()
-                                        root_id = data["user"]["root_id"]
-                                        ctx["root_id"] = root_id
-                                        ctx["token"] = data["token"]
-                                        ctx["expiration"] = data["user"]["expiration"]
-                                        AgentInterface.LOGGER.info(
-                                            f"Login successful after registration, ROOT_ID ({ctx['root_id']}) set for user {user}."
-                                        )
-                                    else:
-                                        AgentInterface.LOGGER.error(
-                                            f"Login failed after registration with status code {login_response.status}."
-                                        )
-                            else:
-                                AgentInterface.LOGGER.error(
-                                    f"Registration failed with status code {register_response.status}."
-                                )
-
-            except Exception as e:
-                AgentInterface.EXPIRATION = None
-                AgentInterface.LOGGER.error(
-                    f"an exception occurred: {e}, {traceback.format_exc()}"
-                )
-
-        return ctx
+            return {}
 
     @staticmethod
     def generate_cipher_alphabet() -> tuple[str, str]:
@@ -854,46 +1236,163 @@ class AgentInterface:
         return key_unique, remaining
 
     @staticmethod
-    def encrypt_webhook_key(agent_id: str, module_root: str, walker: str) -> str:
-        """Encrypt the webhook key."""
+    def init_webhook_cipher() -> None:
+        """Build the webhook cipher tables and signing key once from the environment."""
         lower_cipher_alphabet, upper_cipher_alphabet = (
             AgentInterface.generate_cipher_alphabet()
         )
-        table = str.maketrans(
-            string.ascii_lowercase + string.ascii_uppercase,
-            lower_cipher_alphabet + upper_cipher_alphabet,
+        plain = string.ascii_lowercase + string.ascii_uppercase
+        cipher = lower_cipher_alphabet + upper_cipher_alphabet
+        # never sign with the public default; without a secret, keys stay unsigned
+        AgentInterface.WEBHOOK_SIGNING_KEY = os.environ.get(
+            "JIVAS_WEBHOOK_SECRET_KEY", ""
+        ).encode()
+        if not AgentInterface.WEBHOOK_SIGNING_KEY:
+            AgentInterface.LOGGER.warning(
+                "JIVAS_WEBHOOK_SECRET_KEY is not set; webhook keys will not be signed "
+                "and signed keys will be rejected."
+            )
+        AgentInterface.WEBHOOK_TABLES = (
+            str.maketrans(plain, cipher),
+            str.maketrans(cipher, plain),
         )
+        AgentInterface.WEBHOOK_KEY_CACHE.clear()
+
+    @staticmethod
+    def get_webhook_tables() -> tuple[dict, dict]:
+        """Return the (encrypt, decrypt) cipher tables, building them on first use."""
+        if AgentInterface.WEBHOOK_TABLES is None:
+            AgentInterface.init_webhook_cipher()
+        return AgentInterface.WEBHOOK_TABLES  # type: ignore[return-value]
+
+    @staticmethod
+    def sign_webhook_payload(payload: str) -> str:
+        """Return the truncated, URL-safe HMAC-SHA256 signature of payload.
+
+        @raise ValueError: if JIVAS_WEBHOOK_SECRET_KEY is not set.
+        """
+        if AgentInterface.WEBHOOK_TABLES is None:
+            AgentInterface.init_webhook_cipher()
+        if not AgentInterface.WEBHOOK_SIGNING_KEY:
+            raise ValueError(
+                "JIVAS_WEBHOOK_SECRET_KEY is required to sign webhook keys"
+            )
+        digest = hmac.new(
+            AgentInterface.WEBHOOK_SIGNING_KEY, payload.encode(), hashlib.sha256
+        ).digest()
+        return base64.urlsafe_b64encode(digest[:16]).rstrip(b"=").decode()
+
+    @staticmethod
+    def encrypt_webhook_key(agent_id: str, module_root: str, walker: str) -> str:
+        """Encrypt the webhook key.
+
+        Keys are issued in the signed format, v1.<payload>.<signature>, unless
+        JIVAS_WEBHOOK_KEY_FORMAT is set to "legacy" for the cipher-only format, or
+        JIVAS_WEBHOOK_SECRET_KEY is unset and there is no secret to sign with.
+        """
+        AgentInterface.get_webhook_tables()
+        if (
+            os.environ.get("JIVAS_WEBHOOK_KEY_FORMAT", "signed") != "legacy"
+            and AgentInterface.WEBHOOK_SIGNING_KEY
+        ):
+            fields = "\n".join([agent_id, module_root, walker])
+            payload = "v1." + base64.urlsafe_b64encode(fields.encode()).rstrip(
+                b"="
+            ).decode("ascii")
+            return f"{payload}.{AgentInterface.sign_webhook_payload(payload)}"
+
+        encrypt_table, _ = AgentInterface.get_webhook_tables()
         key_text = json.dumps(
             {"agent_id": agent_id, "module_root": module_root, "walker": walker},
             separators=(",", ":"),
         )
 
         # Translate using the cipher alphabet
-        encoded_text = key_text.translate(table)
+        encoded_text = key_text.translate(encrypt_table)
 
         # URL encode the translated output
         return quote(encoded_text)
 
     @staticmethod
     def decrypt_webhook_key(key: str) -> Optional[dict]:
-        """Decrypt the webhook key."""
-        lower_cipher_alphabet, upper_cipher_alphabet = (
-            AgentInterface.generate_cipher_alphabet()
-        )
-        table = str.maketrans(
-            lower_cipher_alphabet + upper_cipher_alphabet,
-            string.ascii_lowercase + string.ascii_uppercase,
+        """Decrypt the webhook key.
+
+        Signed keys are verified before they are decoded, so forged keys are
+        rejected without any JSON parsing or context loading. With
+        JIVAS_WEBHOOK_KEY_FORMAT set to "signed-only" and a secret configured,
+        legacy keys are refused as well. Decoded keys are kept in
+        WEBHOOK_KEY_CACHE for frequent senders.
+        """
+        if not key.startswith("v1.") and AgentInterface.webhook_signed_only():
+            AgentInterface.LOGGER.warning("rejected legacy webhook key; signed-only")
+            return {}
+
+        if cached := AgentInterface.WEBHOOK_KEY_CACHE.get(key):
+            return dict(cached)
+
+        if key.startswith("v1."):
+            args = AgentInterface.decode_signed_webhook_key(key)
+        else:
+            args = AgentInterface.decode_legacy_webhook_key(key)
+
+        if args:
+            AgentInterface.WEBHOOK_KEY_CACHE.set(key, args)
+            return dict(args)
+        return {}
+
+    @staticmethod
+    def webhook_signed_only() -> bool:
+        """Return whether only signed webhook keys are accepted."""
+        AgentInterface.get_webhook_tables()
+        return os.environ.get(
+            "JIVAS_WEBHOOK_KEY_FORMAT", "signed"
+        ) == "signed-only" and bool(AgentInterface.WEBHOOK_SIGNING_KEY)
+
+    @staticmethod
+    def decode_signed_webhook_key(key: str) -> dict:
+        """Verify and decode a v1.<payload>.<signature> webhook key."""
+        AgentInterface.get_webhook_tables()
+        if not AgentInterface.WEBHOOK_SIGNING_KEY:
+            AgentInterface.LOGGER.warning(
+                "rejected signed webhook key; JIVAS_WEBHOOK_SECRET_KEY is not set"
+            )
+            return {}
+
+        payload, _, signature = key.rpartition(".")
+        if not hmac.compare_digest(
+            signature.encode(), AgentInterface.sign_webhook_payload(payload).encode()
+        ):
+            AgentInterface.LOGGER.warning("rejected webhook key with invalid signature")
+            return {}
+
+        encoded = payload[3:]
+        fields = (
+            base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+            .decode()
+            .split("\n")
         )
+        if len(fields) != 3:
+            AgentInterface.LOGGER.error("malformed signed webhook key")
+            return {}
+
+        agent_id, module_root, walker = fields
+        return {"agent_id": agent_id, "module_root": module_root, "walker": walker}
+
+    @staticmethod
+    def decode_legacy_webhook_key(key: str) -> dict:
+        """Decode a webhook key issued in the cipher-only JSON format."""
+        _, decrypt_table = AgentInterface.get_webhook_tables()
 
         # Decode the URL-encoded string
         decoded_text = unquote(key)
 
         # Translate back using the cipher alphabet
-        key_text = decoded_text.translate(table)
+        key_text = decoded_text.translate(decrypt_table)
 
         # Convert the JSON string back to a dictionary
         try:
-            return json.loads(key_text)
+            args = json.loads(key_text)
+            return args if isinstance(args, dict) else {}
         except Exception as e:
             AgentInterface.LOGGER.error(
                 f"an exception occurred: {e}, {traceback.format_exc()}"
@@ -0,0 +1,74 @@
+"""Concurrency Limiter class for capping in-flight calls per key."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Hashable, Optional
+
+
+class ConcurrencyLimitError(RuntimeError):
+    """Raised when no slot for a key frees up within the allowed wait."""
+
+
+class ConcurrencyLimiter:
+    """Caps the number of concurrent calls sharing a key (e.g. a walker or agent).
+
+    Callers over the limit wait for a slot, up to a timeout. Keys with nothing
+    in flight are dropped, so the limiter does not grow with the key space.
+    """
+
+    def __init__(self, limit: int) -> None:
+        """Initialize the limiter.
+
+        @param limit: Concurrent calls allowed per key; 0 or less disables the limit.
+        """
+        self.limit = limit
+        self.rejected = 0
+        self._slots: Dict[Hashable, tuple[asyncio.Semaphore, int]] = {}
+
+    @asynccontextmanager
+    async def acquire(
+        self, key: Hashable, timeout: Optional[float] = None
+    ) -> AsyncIterator[None]:
+        """Hold a slot for key for the duration of the block.
+
+        @param timeout: Seconds to wait for a slot; None waits indefinitely.
+        @raise ConcurrencyLimitError: if no slot frees up within timeout.
+        """
+        if self.limit <= 0:
+            yield
+            return
+
+        semaphore, users = self._slots.get(key) or (asyncio.Semaphore(self.limit), 0)
+        self._slots[key] = (semaphore, users + 1)
+        try:
+            try:
+                await asyncio.wait_for(semaphore.acquire(), timeout)
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                raise ConcurrencyLimitError(
+                    f"{key} is at its concurrency limit ({self.limit})"
+                ) from None
+            try:
+                yield
+            finally:
+                semaphore.release()
+        finally:
+            semaphore, users = self._slots[key]
+            if users > 1:
+                self._slots[key] = (semaphore, users - 1)
+            else:
+                del self._slots[key]
+
+    def active(self, key: Hashable) -> int:
+        """Return the number of calls holding a slot for key."""
+        if key not in self._slots:
+            return 0
+        return self.limit - self._slots[key][0]._value
+
+    def stats(self) -> dict:
+        """Return the limit, busy keys and rejection counter."""
+        return {
+            "limit": self.limit,
+            "active": {str(key): self.active(key) for key in self._slots},
+            "rejected": self.rejected,
+        }
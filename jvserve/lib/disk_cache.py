@@ -0,0 +1,240 @@
+"""Disk Cache class for keeping proxied objects on local disk."""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import suppress
+from typing import AsyncIterator, Awaitable, Callable, Optional, TypeVar
+
+import anyio
+
+from jvserve.lib.cache import LRUCache
+
+T = TypeVar("T")
+
+
+class DiskCache:
+    """Size-bounded LRU cache of object bodies on local disk.
+
+    Each entry is a data file plus a small JSON sidecar recording the
+    object key, its upstream ETag and headers, so the cache survives
+    restarts. An entry is served without contacting the upstream for ttl
+    seconds after it was last validated; after that it should be
+    revalidated against its ETag. Concurrent fills for the same key are
+    coalesced into one upstream fetch. Keys found uncacheable (too large,
+    encoded or failed) are remembered for negative_ttl seconds so callers can
+    skip straight to the upstream instead of attempting a fill each time.
+    """
+
+    LOGGER = logging.getLogger(__name__)
+
+    def __init__(
+        self,
+        directory: str,
+        max_size: int = 1024**3,
+        max_object_size: int = 64 * 1024**2,
+        ttl: float = 60,
+        negative_ttl: float = 300,
+    ) -> None:
+        """Initialize the cache, indexing entries already on disk.
+
+        @param directory: Directory holding cached objects.
+        @param max_size: Total bytes kept before least recently used objects are evicted.
+        @param max_object_size: Objects larger than this are not cached.
+        @param ttl: Seconds an entry is trusted before it should be revalidated.
+        @param negative_ttl: Seconds a key found uncacheable is not retried.
+        """
+        self.directory = directory
+        self.max_size = max_size
+        self.max_object_size = min(max_object_size, max_size)
+        self.ttl = ttl
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.coalesced = 0
+        self.bypassed = 0
+        self.uncacheable = LRUCache(max_size=4096, ttl=negative_ttl)
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+        self.load()
+
+    def load(self) -> None:
+        """Index the entries left on disk by a previous run, oldest use first."""
+        entries = []
+        for name in os.listdir(self.directory):
+            meta_path = os.path.join(self.directory, name)
+            if name.startswith(".fill-"):
+                with suppress(OSError):
+                    os.remove(meta_path)
+                continue
+            if not name.endswith(".meta"):
+                continue
+            try:
+                with open(meta_path, "r") as f:
+                    entry = json.load(f)
+                stat = os.stat(entry["path"])
+                entries.append((stat.st_atime, entry))
+            except Exception:
+                with suppress(OSError):
+                    os.remove(meta_path)
+
+        for _, entry in sorted(entries, key=lambda item: item[0]):
+            # validation times do not survive a restart; revalidate on first use
+            entry["validated"] = 0.0
+            self._entries[entry["key"]] = entry
+            self.size += entry["size"]
+        self.evict()
+
+    def paths(self, key: str) -> tuple[str, str]:
+        """Return the (data, sidecar) file paths for key."""
+        name = hashlib.sha256(key.encode()).hexdigest()
+        data_path = os.path.join(self.directory, f"{name}.data")
+        return data_path, f"{data_path[:-5]}.meta"
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the entry for key, marking it most recently used, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if not os.path.exists(entry["path"]):
+                self.forget(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def is_fresh(self, entry: dict) -> bool:
+        """Return whether entry was validated within the last ttl seconds."""
+        return time.time() - entry["validated"] < self.ttl
+
+    def touch(self, key: str) -> None:
+        """Record that the entry for key was just revalidated upstream."""
+        with self._lock:
+            if entry := self._entries.get(key):
+                entry["validated"] = time.time()
+
+    def record(self, hit: bool, revalidated: bool = False) -> None:
+        """Count a lookup served from disk (hit) or from the upstream (miss)."""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            if revalidated:
+                self.revalidated += 1
+
+    def mark_uncacheable(self, key: str) -> None:
+        """Remember that key could not be cached, for negative_ttl seconds."""
+        self.uncacheable.set(key, True)
+
+    def is_uncacheable(self, key: str) -> bool:
+        """Return whether key was recently found uncacheable, counting the bypass."""
+        if not self.uncacheable.get(key):
+            return False
+        with self._lock:
+            self.bypassed += 1
+        return True
+
+    async def store(
+        self, key: str, chunks: AsyncIterator[bytes], meta: dict
+    ) -> Optional[dict]:
+        """Write chunks to disk as the entry for key.
+
+        @param meta: Upstream headers to keep with the entry (etag, media_type, last_modified).
+        @return: The new entry, or None if the object exceeds max_object_size.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".fill-")
+        os.close(fd)
+        size = 0
+        try:
+            async with await anyio.open_file(tmp_path, "wb") as f:
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if size > self.max_object_size:
+                        os.remove(tmp_path)
+                        return None
+                    await f.write(chunk)
+
+            data_path, meta_path = self.paths(key)
+            entry = {
+                **meta,
+                "key": key,
+                "path": data_path,
+                "size": size,
+                "validated": time.time(),
+            }
+            os.replace(tmp_path, data_path)
+            with open(meta_path, "w") as f:
+                json.dump(entry, f)
+        except BaseException:
+            with suppress(OSError):
+                os.remove(tmp_path)
+            raise
+
+        with self._lock:
+            if previous := self._entries.pop(key, None):
+                self.size -= previous["size"]
+            self._entries[key] = entry
+            self.size += size
+        self.evict()
+        return entry
+
+    def forget(self, key: str) -> None:
+        """Drop key from the index and disk; the caller holds the lock."""
+        entry = self._entries.pop(key, None)
+        if entry:
+            self.size -= entry["size"]
+            for path in self.paths(key):
+                with suppress(OSError):
+                    os.remove(path)
+
+    def evict(self) -> None:
+        """Remove least recently used entries until the cache fits max_size."""
+        with self._lock:
+            while self.size > self.max_size and self._entries:
+                key = next(iter(self._entries))
+                self.forget(key)
+                DiskCache.LOGGER.debug(f"evicted {key} from the disk cache.")
+
+    async def coalesce(self, key: str, func: Callable[[], Awaitable[T]]) -> T:
+        """Run func once for all concurrent callers asking for the same key."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(
+                lambda done: (
+                    self._inflight.pop(key) if self._inflight.get(key) is done else None
+                )
+            )
+        else:
+            with self._lock:
+                self.coalesced += 1
+        # a cancelled caller must not cancel the fetch the others are waiting on
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        """Return size and hit/miss counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "size": self.size,
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidated": self.revalidated,
+                "coalesced": self.coalesced,
+                "bypassed": self.bypassed,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
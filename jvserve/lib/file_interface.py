@@ -3,17 +3,75 @@ File interface module with base class for making file handling configurable
 for different storage backends.
 """
 
+import asyncio
+import contextvars
+import functools
+import io
 import logging
 import os
+import shutil
+import tempfile
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from typing import (
+    Any,
+    AsyncIterator,
+    BinaryIO,
+    Callable,
+    Iterable,
+    Iterator,
+    Literal,
+    Mapping,
+    TypeVar,
+    overload,
+)
 
 from dotenv import load_dotenv
 
+from jvserve.lib.cache import LRUCache
+
 load_dotenv(".env")
 
 # Interface type determined by environment variable, defaults to local
 FILE_INTERFACE = os.environ.get("JIVAS_FILE_INTERFACE", "local")
 DEFAULT_FILES_ROOT = os.environ.get("JIVAS_FILES_ROOT_PATH", ".files")
+STREAM_CHUNK_SIZE = int(os.environ.get("JIVAS_FILES_CHUNK_SIZE", 1024 * 1024))
+BATCH_CONCURRENCY = int(os.environ.get("JIVAS_FILES_BATCH_CONCURRENCY", "8"))
+
+T = TypeVar("T")
+
+
+class ChunkReader(io.RawIOBase):
+    """Read-only file object over an iterable of byte chunks."""
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        """Wrap chunks so they can be passed where a file object is expected."""
+        self.chunks = iter(chunks)
+        self.pending = b""
+
+    def readable(self) -> bool:
+        """Return True; the reader is readable."""
+        return True
+
+    def readinto(self, buffer: memoryview) -> int:  # type: ignore[override]
+        """Fill buffer from the pending chunk, pulling the next one when empty."""
+        while not self.pending:
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                return 0
+            self.pending = bytes(chunk)
+        size = min(len(buffer), len(self.pending))
+        buffer[:size] = self.pending[:size]
+        self.pending = self.pending[size:]
+        return size
+
+
+def as_file(source: BinaryIO | Iterable[bytes]) -> BinaryIO:
+    """Return source as a readable binary file object."""
+    if hasattr(source, "read"):
+        return source  # type: ignore[return-value]
+    return io.BufferedReader(ChunkReader(source), STREAM_CHUNK_SIZE)  # type: ignore
 
 
 class FileInterface(ABC):
@@ -42,6 +100,75 @@ class FileInterface(ABC):
         """Get a URL to access the file."""
         pass
 
+    def file_exists(self, filename: str) -> bool:
+        """Check whether a file exists in storage."""
+        return self.get_file(filename) is not None
+
+    def get_file_stream(
+        self, filename: str, chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> Iterator[bytes] | None:
+        """Return an iterator over the file's contents in chunks, or None if missing.
+
+        Backends override this to read at constant memory; the default
+        buffers the whole file through get_file.
+        """
+        content = self.get_file(filename)
+        if content is None:
+            return None
+        return (content[i : i + chunk_size] for i in range(0, len(content), chunk_size))
+
+    def save_file_stream(
+        self, filename: str, source: BinaryIO | Iterable[bytes]
+    ) -> bool:
+        """Save a file from a readable binary file object or an iterable of chunks.
+
+        Backends override this to write at constant memory; the default
+        buffers the whole source and calls save_file.
+        """
+        return self.save_file(filename, as_file(source).read())
+
+    def map_files(
+        self, func: Callable[[str], T], filenames: Iterable[str], failed: T
+    ) -> dict[str, T]:
+        """Run func for each distinct filename on a bounded thread pool.
+
+        @param failed: Result recorded for a filename whose call raises.
+        @return: Each filename mapped to its own result.
+        """
+
+        def call(name: str) -> T:
+            try:
+                return func(name)
+            except Exception as e:
+                FileInterface.LOGGER.error(
+                    f"Batch file operation on {name} failed: {e}"
+                )
+                return failed
+
+        names = list(dict.fromkeys(filenames))
+        if len(names) <= 1:
+            return {name: call(name) for name in names}
+        with ThreadPoolExecutor(max_workers=min(BATCH_CONCURRENCY, len(names))) as pool:
+            return dict(zip(names, pool.map(call, names)))
+
+    def save_files(self, files: Mapping[str, bytes]) -> dict[str, bool]:
+        """Save several files, returning whether each was saved."""
+        return self.map_files(
+            lambda name: self.save_file(name, files[name]), files, False
+        )
+
+    def get_files(self, filenames: Iterable[str]) -> dict[str, bytes | None]:
+        """Retrieve several files; missing or unreadable files map to None."""
+        return self.map_files(self.get_file, filenames, None)
+
+    def delete_files(self, filenames: Iterable[str]) -> dict[str, bool]:
+        """Delete several files, returning whether each was deleted."""
+        return self.map_files(self.delete_file, filenames, False)
+
+    def get_file_urls(self, filenames: Iterable[str]) -> dict[str, str | None]:
+        """Get URLs for several files; files without a URL map to None."""
+        return self.map_files(self.get_file_url, filenames, None)
+
 
 class LocalFileInterface(FileInterface):
     """Implementation of FileInterface for local filesystem storage."""
@@ -81,9 +208,59 @@ class LocalFileInterface(FileInterface):
             return f"{os.environ.get('JIVAS_FILES_URL', 'http://localhost:9000/files')}/{filename}"
         return None
 
+    def file_exists(self, filename: str) -> bool:
+        """Check whether a local file exists."""
+        return os.path.isfile(os.path.join(self.__root_dir, filename))
+
+    def get_file_stream(
+        self, filename: str, chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> Iterator[bytes] | None:
+        """Return an iterator reading the local file chunk by chunk."""
+        file_path = os.path.join(self.__root_dir, filename)
+        if not os.path.isfile(file_path):
+            return None
+
+        def read() -> Iterator[bytes]:
+            with open(file_path, "rb") as f:
+                while chunk := f.read(chunk_size):
+                    yield chunk
+
+        return read()
+
+    def save_file_stream(
+        self, filename: str, source: BinaryIO | Iterable[bytes]
+    ) -> bool:
+        """Write a local file from a stream, replacing it only once complete."""
+        file_path = os.path.join(self.__root_dir, filename)
+        directory = os.path.dirname(file_path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                shutil.copyfileobj(as_file(source), f, STREAM_CHUNK_SIZE)
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            with suppress(OSError):
+                os.remove(tmp_path)
+            raise
+        return True
+
 
 class S3FileInterface(FileInterface):
-    """Implementation of FileInterface for AWS S3 storage."""
+    """Implementation of FileInterface for AWS S3 storage.
+
+    Presigned URLs are cached per key for a fraction of their lifetime
+    (JIVAS_S3_URL_CACHE_FRACTION), so repeat lookups skip signing and return
+    a stable URL that browser and CDN caches can reuse.
+
+    Files at or above JIVAS_S3_MULTIPART_THRESHOLD are sent as multipart
+    uploads, with parts uploaded concurrently on a bounded thread pool and
+    each part retried on its own by botocore before the upload is aborted.
+    Reads of objects larger than one part are fetched the same way, as
+    parallel ranged GETs stitched back together in order.
+    """
+
+    URL_EXPIRY = 3600
 
     def __init__(
         self,
@@ -96,19 +273,48 @@ class S3FileInterface(FileInterface):
     ) -> None:
         """Initialize S3 file interface."""
         import boto3
+        from boto3.s3.transfer import TransferConfig
         from botocore.config import Config
 
+        max_concurrency = int(os.environ.get("JIVAS_S3_MAX_CONCURRENCY", "10"))
         self.s3_client = boto3.client(
             "s3",
             aws_access_key_id=aws_access_key_id,
             aws_secret_access_key=aws_secret_access_key,
             region_name=region_name,
             endpoint_url=endpoint_url,
-            config=Config(signature_version="v4"),
+            config=Config(
+                signature_version="v4",
+                # every part upload runs on its own pooled connection
+                max_pool_connections=max(max_concurrency, 10),
+                retries={
+                    "max_attempts": int(os.environ.get("JIVAS_S3_MAX_ATTEMPTS", "5")),
+                    "mode": "standard",
+                },
+            ),
+        )
+        self.transfer_config = TransferConfig(
+            multipart_threshold=int(
+                os.environ.get("JIVAS_S3_MULTIPART_THRESHOLD", 8 * 1024 * 1024)
+            ),
+            multipart_chunksize=int(
+                os.environ.get("JIVAS_S3_MULTIPART_PART_SIZE", 8 * 1024 * 1024)
+            ),
+            max_concurrency=max_concurrency,
         )
         self.bucket_name = bucket_name
         self.__root_dir = files_root
 
+        url_cache_fraction = float(os.environ.get("JIVAS_S3_URL_CACHE_FRACTION", "0.5"))
+        self.url_cache = (
+            LRUCache(
+                max_size=int(os.environ.get("JIVAS_S3_URL_CACHE_SIZE", "4096")),
+                ttl=S3FileInterface.URL_EXPIRY * min(url_cache_fraction, 1.0),
+            )
+            if url_cache_fraction > 0
+            else None
+        )
+
         # Check for missing AWS credentials
         if not aws_access_key_id or not aws_secret_access_key or not region_name:
             FileInterface.LOGGER.warn(
@@ -116,21 +322,88 @@ class S3FileInterface(FileInterface):
             )
 
     def get_file(self, filename: str) -> bytes | None:
-        """Get file contents from S3."""
+        """Get file contents from S3, fetching large objects as parallel ranged GETs.
+
+        The first part's Content-Range reveals the object size; the rest are
+        fetched on up to JIVAS_S3_MAX_CONCURRENCY threads, pinned to the first
+        part's ETag so a concurrent overwrite cannot be stitched in.
+        """
+        from botocore.exceptions import ClientError
+
         try:
             file_key = os.path.join(self.__root_dir, filename)
-            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=file_key)
-            return response["Body"].read()
+            part_size = self.transfer_config.multipart_chunksize
+            try:
+                response = self.s3_client.get_object(
+                    Bucket=self.bucket_name,
+                    Key=file_key,
+                    Range=f"bytes=0-{part_size - 1}",
+                )
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") != "InvalidRange":
+                    raise
+                # empty objects cannot satisfy any range
+                response = self.s3_client.get_object(
+                    Bucket=self.bucket_name, Key=file_key
+                )
+
+            first = response["Body"].read()
+            total = response.get("ContentRange", "").rpartition("/")[2]
+            size = int(total) if total.isdigit() else len(first)
+            if size <= len(first):
+                return first
+
+            ranges = [
+                (start, min(start + part_size, size) - 1)
+                for start in range(len(first), size, part_size)
+            ]
+            workers = min(self.transfer_config.max_concurrency, len(ranges))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = [
+                    pool.submit(
+                        self.get_range, file_key, start, end, response.get("ETag")
+                    )
+                    for start, end in ranges
+                ]
+                parts = [future.result() for future in futures]
+            return b"".join([first, *parts])
         except Exception:
             return None
 
+    def get_range(
+        self, file_key: str, start: int, end: int, etag: str | None = None
+    ) -> bytes:
+        """Fetch the inclusive byte range start-end of an object.
+
+        @param etag: Fail rather than return bytes from a different version.
+        """
+        params = {
+            "Bucket": self.bucket_name,
+            "Key": file_key,
+            "Range": f"bytes={start}-{end}",
+        }
+        if etag:
+            params["IfMatch"] = etag
+        content = self.s3_client.get_object(**params)["Body"].read()
+        if len(content) != end - start + 1:
+            raise OSError(f"short read of {file_key} at bytes {start}-{end}")
+        return content
+
     def save_file(self, filename: str, content: bytes) -> bool:
-        """Save file to S3 bucket."""
+        """Save file to S3 bucket, as a multipart upload above the threshold."""
         try:
             file_key = os.path.join(self.__root_dir, filename)
-            self.s3_client.put_object(
-                Bucket=self.bucket_name, Key=file_key, Body=content
-            )
+            if len(content) < self.transfer_config.multipart_threshold:
+                self.s3_client.put_object(
+                    Bucket=self.bucket_name, Key=file_key, Body=content
+                )
+            else:
+                self.s3_client.upload_fileobj(
+                    io.BytesIO(content),
+                    self.bucket_name,
+                    file_key,
+                    Config=self.transfer_config,
+                )
             return True
         except Exception:
             return False
@@ -140,29 +413,214 @@ class S3FileInterface(FileInterface):
         try:
             file_key = os.path.join(self.__root_dir, filename)
             self.s3_client.delete_object(Bucket=self.bucket_name, Key=file_key)
+            if self.url_cache is not None:
+                self.url_cache.delete(file_key)
             return True
         except Exception:
             return False
 
+    def delete_files(self, filenames: Iterable[str]) -> dict[str, bool]:
+        """Delete several objects with DeleteObjects, up to 1000 keys per call."""
+        keys = {
+            os.path.join(self.__root_dir, filename): filename for filename in filenames
+        }
+        results = {}
+        file_keys = list(keys)
+        for i in range(0, len(file_keys), 1000):
+            batch = file_keys[i : i + 1000]
+            try:
+                response = self.s3_client.delete_objects(
+                    Bucket=self.bucket_name,
+                    Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+                )
+                failed = {error["Key"] for error in response.get("Errors", [])}
+            except Exception:
+                failed = set(batch)
+
+            for key in batch:
+                results[keys[key]] = key not in failed
+                if self.url_cache is not None and key not in failed:
+                    self.url_cache.delete(key)
+        return results
+
+    def get_file_urls(self, filenames: Iterable[str]) -> dict[str, str | None]:
+        """Get pre-signed URLs for several objects; signing is local, so no threads."""
+        return {filename: self.get_file_url(filename) for filename in filenames}
+
     def get_file_url(self, filename: str) -> str | None:
         """Get pre-signed URL for S3 file access."""
         try:
             file_key = os.path.join(self.__root_dir, filename)
+            if self.url_cache is not None and (url := self.url_cache.get(file_key)):
+                return url
+
             url = self.s3_client.generate_presigned_url(
                 "get_object",
                 Params={"Bucket": self.bucket_name, "Key": file_key},
-                ExpiresIn=3600,
+                ExpiresIn=S3FileInterface.URL_EXPIRY,
             )
+            if self.url_cache is not None and url:
+                self.url_cache.set(file_key, url)
             return url
         except Exception:
             return None
 
+    def file_exists(self, filename: str) -> bool:
+        """Check whether an object exists in the S3 bucket."""
+        try:
+            file_key = os.path.join(self.__root_dir, filename)
+            self.s3_client.head_object(Bucket=self.bucket_name, Key=file_key)
+            return True
+        except Exception:
+            return False
+
+    def get_file_stream(
+        self, filename: str, chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> Iterator[bytes] | None:
+        """Return an iterator over the S3 object body in chunks."""
+        try:
+            file_key = os.path.join(self.__root_dir, filename)
+            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=file_key)
+            return response["Body"].iter_chunks(chunk_size)
+        except Exception:
+            return None
+
+    def save_file_stream(
+        self, filename: str, source: BinaryIO | Iterable[bytes]
+    ) -> bool:
+        """Upload a stream to S3, letting boto3 split it into parts as it reads."""
+        try:
+            file_key = os.path.join(self.__root_dir, filename)
+            self.s3_client.upload_fileobj(
+                as_file(source),
+                self.bucket_name,
+                file_key,
+                Config=self.transfer_config,
+            )
+            return True
+        except Exception:
+            return False
+
+
+class AsyncFileInterface:
+    """Async counterpart of FileInterface for use from async routes.
+
+    Every call runs the wrapped blocking interface on a dedicated thread pool
+    (JIVAS_FILES_ASYNC_THREADS), so local disk and S3 I/O never block the event
+    loop and file traffic cannot exhaust the threads other routes rely on.
+    """
+
+    def __init__(self, interface: FileInterface, max_threads: int = 0) -> None:
+        """Wrap interface, running its calls on up to max_threads threads.
+
+        @param max_threads: Pool size; 0 reads JIVAS_FILES_ASYNC_THREADS (default 16).
+        """
+        self.interface = interface
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_threads
+            or int(os.environ.get("JIVAS_FILES_ASYNC_THREADS", "16")),
+            thread_name_prefix="jivas-files",
+        )
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run func(*args) on the file thread pool within the caller's context."""
+        context = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor, functools.partial(context.run, func, *args)
+        )
+
+    async def get_file(self, filename: str) -> bytes | None:
+        """Retrieve a file from storage and return its contents as bytes."""
+        return await self.run(self.interface.get_file, filename)
+
+    async def save_file(self, filename: str, content: bytes) -> bool:
+        """Save content to a file in storage."""
+        return await self.run(self.interface.save_file, filename, content)
+
+    async def delete_file(self, filename: str) -> bool:
+        """Delete a file from storage."""
+        return await self.run(self.interface.delete_file, filename)
+
+    async def get_file_url(self, filename: str) -> str | None:
+        """Get a URL to access the file."""
+        return await self.run(self.interface.get_file_url, filename)
+
+    async def file_exists(self, filename: str) -> bool:
+        """Check whether a file exists in storage."""
+        return await self.run(self.interface.file_exists, filename)
+
+    async def get_file_stream(
+        self, filename: str, chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> AsyncIterator[bytes] | None:
+        """Return an async iterator over the file's chunks, or None if missing."""
+        chunks = await self.run(self.interface.get_file_stream, filename, chunk_size)
+        if chunks is None:
+            return None
+
+        async def read() -> AsyncIterator[bytes]:
+            while (chunk := await self.run(next, chunks, None)) is not None:
+                yield chunk
+
+        return read()
+
+    async def save_file_stream(
+        self, filename: str, source: BinaryIO | Iterable[bytes]
+    ) -> bool:
+        """Save a file from a readable binary file object or an iterable of chunks."""
+        return await self.run(self.interface.save_file_stream, filename, source)
+
+    async def save_files(self, files: Mapping[str, bytes]) -> dict[str, bool]:
+        """Save several files, returning whether each was saved."""
+        return await self.run(self.interface.save_files, files)
+
+    async def get_files(self, filenames: Iterable[str]) -> dict[str, bytes | None]:
+        """Retrieve several files; missing files map to None."""
+        return await self.run(self.interface.get_files, list(filenames))
+
+    async def delete_files(self, filenames: Iterable[str]) -> dict[str, bool]:
+        """Delete several files, returning whether each was deleted."""
+        return await self.run(self.interface.delete_files, list(filenames))
+
+    async def get_file_urls(self, filenames: Iterable[str]) -> dict[str, str | None]:
+        """Get URLs for several files; files without a URL map to None."""
+        return await self.run(self.interface.get_file_urls, list(filenames))
+
+    def close(self) -> None:
+        """Shut down the thread pool once queued calls finish."""
+        self.executor.shutdown(wait=False)
+
 
 file_interface: FileInterface
+async_file_interface: AsyncFileInterface
+
+
+@overload
+def get_file_interface(
+    files_root: str = ..., asynchronous: Literal[False] = ...
+) -> FileInterface:
+    """Return the blocking interface."""
+
+
+@overload
+def get_file_interface(
+    files_root: str = ..., *, asynchronous: Literal[True]
+) -> AsyncFileInterface:
+    """Return the async interface."""
+
+
+def get_file_interface(
+    files_root: str = DEFAULT_FILES_ROOT, asynchronous: bool = False
+) -> FileInterface | AsyncFileInterface:
+    """Returns a FileInterface instance based on the configured FILE_INTERFACE.
 
+    Each call builds a new backend; async code should normally share the
+    module-level async_file_interface instead.
 
-def get_file_interface(files_root: str = DEFAULT_FILES_ROOT) -> FileInterface:
-    """Returns a FileInterface instance based on the configured FILE_INTERFACE."""
+    @param asynchronous: Return an AsyncFileInterface with its own thread pool,
+        which the caller must close.
+    """
+    if asynchronous:
+        return AsyncFileInterface(get_file_interface(files_root))
 
     if FILE_INTERFACE == "s3":
         return S3FileInterface(
@@ -178,3 +636,5 @@ def get_file_interface(files_root: str = DEFAULT_FILES_ROOT) -> FileInterface:
 
 
 file_interface = get_file_interface()
+# shared by async routes; its pool threads are only started on first use
+async_file_interface = AsyncFileInterface(file_interface)
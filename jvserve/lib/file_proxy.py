@@ -0,0 +1,349 @@
+"""File Proxy class for streaming stored files through a shared async HTTP client."""
+
+import logging
+import mimetypes
+import os
+from typing import Mapping, Optional
+
+import httpx
+from fastapi import HTTPException
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
+
+from jvserve.lib.disk_cache import DiskCache
+from jvserve.lib.file_interface import (
+    DEFAULT_FILES_ROOT,
+    FILE_INTERFACE,
+    file_interface,
+)
+from jvserve.lib.range_files import RangeFileResponder
+
+# Media types missing from some platforms' mimetypes tables
+EXTRA_MEDIA_TYPES = {
+    ".avif": "image/avif",
+    ".flac": "audio/flac",
+    ".heic": "image/heic",
+    ".jsonl": "application/jsonl",
+    ".m4a": "audio/mp4",
+    ".md": "text/markdown",
+    ".mjs": "text/javascript",
+    ".oga": "audio/ogg",
+    ".ogg": "audio/ogg",
+    ".opus": "audio/ogg",
+    ".wasm": "application/wasm",
+    ".webm": "video/webm",
+    ".webp": "image/webp",
+    ".woff2": "font/woff2",
+}
+
+DEFAULT_MEDIA_TYPE = "application/octet-stream"
+
+# Request headers relayed upstream so ranges and revalidation reach the storage backend
+FORWARDED_REQUEST_HEADERS = ("range", "if-range", "if-none-match", "if-modified-since")
+
+# Upstream response headers relayed to the client
+FORWARDED_RESPONSE_HEADERS = (
+    "accept-ranges",
+    "cache-control",
+    "content-encoding",
+    "content-length",
+    "content-range",
+    "etag",
+    "last-modified",
+)
+
+# Proxy chunk size bounds; large chunks keep per-chunk overhead low, the cap bounds memory
+MIN_CHUNK_SIZE = 64 * 1024
+MAX_CHUNK_SIZE = 1024 * 1024
+
+
+class FileProxy:
+    """Streams remote files to clients without blocking the event loop.
+
+    A single httpx.AsyncClient per process keeps upstream connections alive
+    between requests, negotiating HTTP/2 when the h2 package is installed.
+    Pool sizes and timeouts come from the JIVAS_PROXY_* environment variables.
+
+    With JIVAS_PROXY_CACHE_DIR set, remote objects are also kept in a local
+    DiskCache and served from disk until they need revalidation.
+    """
+
+    CLIENT: Optional[httpx.AsyncClient] = None
+    CACHE: Optional[DiskCache] = None
+    LOGGER = logging.getLogger(__name__)
+
+    @staticmethod
+    def get_client() -> httpx.AsyncClient:
+        """Return the shared client, creating it on first use."""
+        if FileProxy.CLIENT is None or FileProxy.CLIENT.is_closed:
+            http2 = os.environ.get("JIVAS_PROXY_HTTP2", "true").lower() == "true"
+            if http2:
+                try:
+                    import h2  # noqa: F401
+                except ImportError:
+                    http2 = False
+
+            FileProxy.CLIENT = httpx.AsyncClient(
+                http2=http2,
+                limits=httpx.Limits(
+                    max_connections=int(
+                        os.environ.get("JIVAS_PROXY_MAX_CONNECTIONS", "100")
+                    ),
+                    max_keepalive_connections=int(
+                        os.environ.get("JIVAS_PROXY_MAX_KEEPALIVE", "20")
+                    ),
+                    keepalive_expiry=float(
+                        os.environ.get("JIVAS_PROXY_KEEPALIVE_EXPIRY", "30")
+                    ),
+                ),
+                timeout=httpx.Timeout(
+                    float(os.environ.get("JIVAS_PROXY_TIMEOUT", "30"))
+                ),
+                follow_redirects=True,
+            )
+            FileProxy.LOGGER.debug(f"file proxy client created (http2={http2}).")
+        return FileProxy.CLIENT
+
+    @staticmethod
+    async def close() -> None:
+        """Close the shared client and its pooled connections."""
+        if FileProxy.CLIENT is not None:
+            await FileProxy.CLIENT.aclose()
+            FileProxy.CLIENT = None
+
+    @staticmethod
+    async def serve(
+        file_path: str, headers: Optional[Mapping[str, str]] = None
+    ) -> Response:
+        """Serve a proxied file from a remote or local URL.
+
+        @param headers: Client request headers; Range and conditional headers are honoured.
+        """
+        media_type = FileProxy.guess_media_type(file_path)
+
+        if FILE_INTERFACE == "local":
+            return RangeFileResponder.respond(
+                os.path.join(DEFAULT_FILES_ROOT, file_path),
+                headers or {},
+                media_type=media_type,
+            )
+
+        file_url = file_interface.get_file_url(file_path)
+
+        if file_url and ("localhost" in file_url or "127.0.0.1" in file_url):
+            # prevent recusive calls when env vars are not detected
+            raise HTTPException(
+                status_code=500, detail="Environment not set up correctly"
+            )
+
+        if not file_url:
+            raise HTTPException(status_code=404, detail="File not found")
+
+        if FileProxy.get_cache():
+            return await FileProxy.serve_cached(
+                file_path, file_url, media_type, headers
+            )
+        return await FileProxy.fetch(file_url, media_type, headers)
+
+    @staticmethod
+    def get_cache() -> Optional[DiskCache]:
+        """Return the disk cache, creating it on first use; None when disabled."""
+        if FileProxy.CACHE is None and (
+            directory := os.environ.get("JIVAS_PROXY_CACHE_DIR")
+        ):
+            FileProxy.CACHE = DiskCache(
+                directory,
+                max_size=int(os.environ.get("JIVAS_PROXY_CACHE_SIZE", str(1024**3))),
+                max_object_size=int(
+                    os.environ.get(
+                        "JIVAS_PROXY_CACHE_MAX_OBJECT_SIZE", str(64 * 1024**2)
+                    )
+                ),
+                ttl=float(os.environ.get("JIVAS_PROXY_CACHE_TTL", "60")),
+                negative_ttl=float(
+                    os.environ.get("JIVAS_PROXY_CACHE_NEGATIVE_TTL", "300")
+                ),
+            )
+        return FileProxy.CACHE
+
+    @staticmethod
+    async def serve_cached(
+        key: str,
+        url: str,
+        media_type: Optional[str] = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> Response:
+        """Serve key from the disk cache, filling or revalidating it from url as needed."""
+        cache = FileProxy.get_cache()
+        assert cache is not None
+
+        if cache.is_uncacheable(key):
+            # recently too large, encoded or failed; skip the fill and its extra GET
+            return await FileProxy.fetch(url, media_type, headers)
+
+        entry = cache.get(key)
+        if entry and cache.is_fresh(entry):
+            cache.record(hit=True)
+        else:
+            entry = await cache.coalesce(
+                key, lambda: FileProxy.fill_cache(cache, key, url, entry)
+            )
+
+        if not entry:
+            # not cacheable (too large, encoded or failed); relay it directly
+            return await FileProxy.fetch(url, media_type, headers)
+
+        media_type = media_type or entry.get("media_type") or DEFAULT_MEDIA_TYPE
+        if not any(name in (headers or {}) for name in FORWARDED_REQUEST_HEADERS):
+            # plain GET: let the server send the file itself (pathsend) where supported
+            return FileResponse(
+                entry["path"],
+                media_type=media_type,
+                headers={
+                    name: value
+                    for name, value in (
+                        ("accept-ranges", "bytes"),
+                        ("etag", entry.get("etag")),
+                        ("last-modified", entry.get("last_modified")),
+                    )
+                    if value
+                },
+            )
+        return RangeFileResponder.respond(
+            entry["path"],
+            headers or {},
+            media_type=media_type,
+            etag=entry.get("etag"),
+            last_modified=entry.get("last_modified"),
+        )
+
+    @staticmethod
+    async def fill_cache(
+        cache: DiskCache, key: str, url: str, stale: Optional[dict]
+    ) -> Optional[dict]:
+        """Fetch url into the cache, revalidating a stale entry by its ETag.
+
+        @return: The cached entry, or None if the object cannot be cached; such
+            keys are marked uncacheable so later requests go straight upstream.
+        """
+        request_headers = {}
+        if stale and stale.get("etag"):
+            request_headers["if-none-match"] = stale["etag"]
+
+        client = FileProxy.get_client()
+        try:
+            upstream = await client.send(
+                client.build_request("GET", url, headers=request_headers), stream=True
+            )
+        except httpx.HTTPError as e:
+            FileProxy.LOGGER.error(f"unable to fill the proxy cache for {key}: {e}")
+            cache.mark_uncacheable(key)
+            return None
+
+        try:
+            if upstream.status_code == 304 and stale:
+                cache.touch(key)
+                cache.record(hit=True, revalidated=True)
+                return stale
+
+            cache.record(hit=False)
+            length = int(upstream.headers.get("content-length") or 0)
+            if (
+                upstream.status_code != 200
+                or upstream.headers.get("content-encoding")
+                or length > cache.max_object_size
+            ):
+                cache.mark_uncacheable(key)
+                return None
+
+            entry = await cache.store(
+                key,
+                upstream.aiter_raw(FileProxy.chunk_size()),
+                {
+                    "etag": upstream.headers.get("etag"),
+                    "last_modified": upstream.headers.get("last-modified"),
+                    "media_type": upstream.headers.get("content-type"),
+                },
+            )
+            if entry is None:
+                # larger than max_object_size without a Content-Length up front
+                cache.mark_uncacheable(key)
+            return entry
+        finally:
+            await upstream.aclose()
+
+    @staticmethod
+    def guess_media_type(file_path: str) -> Optional[str]:
+        """Return the media type for file_path's extension, or None if unknown."""
+        media_type = mimetypes.guess_type(file_path)[0]
+        if not media_type:
+            media_type = EXTRA_MEDIA_TYPES.get(os.path.splitext(file_path)[1].lower())
+        return media_type
+
+    @staticmethod
+    def chunk_size() -> int:
+        """Return JIVAS_PROXY_CHUNK_SIZE clamped to the supported range."""
+        size = int(os.environ.get("JIVAS_PROXY_CHUNK_SIZE", str(256 * 1024)))
+        return min(max(size, MIN_CHUNK_SIZE), MAX_CHUNK_SIZE)
+
+    @staticmethod
+    async def fetch(
+        url: str,
+        media_type: Optional[str] = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> Response:
+        """Stream the body at url in large chunks without buffering it whole.
+
+        Range and conditional request headers are relayed upstream, and partial
+        (206), not-modified (304) and unsatisfiable (416) answers are passed back
+        with their validators. When media_type is None the upstream Content-Type
+        is used unless it is generic. The upstream connection returns to the pool
+        when the stream ends.
+        """
+        forwarded = {
+            name: value
+            for name in FORWARDED_REQUEST_HEADERS
+            if (value := (headers or {}).get(name))
+        }
+        client = FileProxy.get_client()
+        try:
+            upstream = await client.send(
+                client.build_request("GET", url, headers=forwarded), stream=True
+            )
+        except httpx.HTTPError as e:
+            FileProxy.LOGGER.error(f"unable to fetch proxied file: {e}")
+            raise HTTPException(status_code=502, detail="Upstream unavailable") from e
+
+        response_headers = {
+            name: value
+            for name in FORWARDED_RESPONSE_HEADERS
+            if (value := upstream.headers.get(name))
+        }
+
+        if upstream.status_code in (304, 416):
+            await upstream.aclose()
+            response_headers.pop("content-length", None)
+            return Response(status_code=upstream.status_code, headers=response_headers)
+
+        if upstream.status_code >= 400:
+            await upstream.aclose()
+            if upstream.status_code == 404:
+                raise HTTPException(status_code=404, detail="File not found")
+            raise HTTPException(status_code=502, detail="Upstream error")
+
+        if not media_type:
+            upstream_type = upstream.headers.get("content-type", "").split(";")[0]
+            if upstream_type and upstream_type not in (
+                DEFAULT_MEDIA_TYPE,
+                "binary/octet-stream",
+            ):
+                media_type = upstream.headers["content-type"]
+
+        # bytes are relayed as stored, so Content-Encoding and Content-Length stay valid
+        return StreamingResponse(
+            upstream.aiter_raw(FileProxy.chunk_size()),
+            status_code=upstream.status_code,
+            headers=response_headers,
+            media_type=media_type or DEFAULT_MEDIA_TYPE,
+            background=BackgroundTask(upstream.aclose),
+        )
@@ -0,0 +1,142 @@
+"""Module Registry class for resolving loaded Jac modules by name suffix."""
+
+import dataclasses
+import logging
+import threading
+from types import ModuleType
+from typing import Any, Collection, Dict, FrozenSet, List, Mapping, Optional, Tuple
+
+
+class AmbiguousModuleError(ValueError):
+    """Raised when a module suffix matches more than one loaded module."""
+
+
+class ModuleRegistry:
+    """Suffix index over the modules loaded into the Jac machine.
+
+    Every dotted suffix of a module name ("jivas.agent.action.interact" ->
+    "interact", "action.interact", ...) maps to the full names that end with
+    it, so spawn lookups are a dict hit instead of a scan of every module.
+    The index is rebuilt whenever the number of loaded modules changes.
+
+    Architype classes resolved from those modules are cached per
+    (module_name, architype_name) together with their accepted attribute
+    names, so hot walkers are constructed without reflective lookups.
+    """
+
+    INDEX: Dict[str, List[str]] = {}
+    MODULE_COUNT = -1
+    ARCHITYPES: Dict[
+        Tuple[str, str], Tuple[ModuleType, type, Optional[FrozenSet[str]]]
+    ] = {}
+    HITS = 0
+    MISSES = 0
+    LOCK = threading.Lock()
+    LOGGER = logging.getLogger(__name__)
+
+    @staticmethod
+    def build(modules: Collection[str]) -> None:
+        """(Re)build the suffix index from the given module names."""
+        index: Dict[str, List[str]] = {}
+        for module in modules:
+            parts = module.split(".")
+            for i in range(len(parts)):
+                index.setdefault(".".join(parts[i:]), []).append(module)
+
+        with ModuleRegistry.LOCK:
+            ModuleRegistry.INDEX = index
+            ModuleRegistry.MODULE_COUNT = len(modules)
+            ModuleRegistry.ARCHITYPES = {}
+
+        ModuleRegistry.LOGGER.debug(f"indexed {len(modules)} modules.")
+
+    @staticmethod
+    def invalidate() -> None:
+        """Discard the index and architype cache so they are rebuilt on the next lookup."""
+        with ModuleRegistry.LOCK:
+            ModuleRegistry.MODULE_COUNT = -1
+            ModuleRegistry.ARCHITYPES = {}
+
+    @staticmethod
+    def resolve(module_name: str, modules: Collection[str]) -> str:
+        """Return the full name of the loaded module ending with module_name.
+
+        @param module_name: Full or dotted-suffix module name.
+        @param modules: Names of the currently loaded modules.
+        @return: The matching full name, or module_name unchanged if none match.
+        @raise AmbiguousModuleError: if the suffix matches several modules.
+        """
+        if len(modules) != ModuleRegistry.MODULE_COUNT:
+            ModuleRegistry.build(modules)
+
+        matches = ModuleRegistry.INDEX.get(module_name)
+        if not matches:
+            return module_name
+        if len(matches) == 1 or module_name in matches:
+            return module_name if module_name in matches else matches[0]
+
+        raise AmbiguousModuleError(
+            f"Module name {module_name} is ambiguous; it matches {', '.join(sorted(matches))}"
+        )
+
+    @staticmethod
+    def spawn(
+        module_name: str,
+        architype_name: str,
+        attributes: Optional[dict],
+        modules: Mapping[str, ModuleType],
+        base: type,
+    ) -> Any:
+        """Instantiate architype_name from a loaded module with attributes.
+
+        @param module_name: Full name of the loaded module.
+        @param architype_name: Name of the walker or node class in the module.
+        @param attributes: Keyword arguments for the architype.
+        @param modules: Loaded modules keyed by full name.
+        @param base: Class the architype must derive from (e.g. WalkerArchitype).
+        @raise ValueError: if the architype is missing or attributes are unknown.
+        """
+        key = (module_name, architype_name)
+        module = modules.get(module_name)
+        cached = ModuleRegistry.ARCHITYPES.get(key)
+
+        # JacMachine.update_walker rebinds the class on the same module object,
+        # so the module's current attribute must still be the cached class
+        if (
+            cached
+            and cached[0] is module
+            and getattr(module, "__dict__", {}).get(architype_name) is cached[1]
+        ):
+            ModuleRegistry.HITS += 1
+            _, architype, fields = cached
+        else:
+            ModuleRegistry.MISSES += 1
+            found = getattr(module, architype_name, None) if module else None
+            if not (isinstance(found, type) and issubclass(found, base)):
+                raise ValueError(f"{base.__name__} {architype_name} not found.")
+            architype = found
+
+            fields = None
+            if dataclasses.is_dataclass(architype):
+                fields = frozenset(
+                    field.name for field in dataclasses.fields(architype) if field.init
+                )
+            ModuleRegistry.ARCHITYPES[key] = (module, architype, fields)  # type: ignore[assignment]
+
+        attributes = attributes or {}
+        if fields is not None and (unknown := attributes.keys() - fields):
+            raise ValueError(
+                f"{architype_name} has no attribute(s) {', '.join(sorted(unknown))}"
+            )
+
+        return architype(**attributes)
+
+    @staticmethod
+    def stats() -> dict:
+        """Return index size and architype cache hit/miss counters."""
+        return {
+            "modules": max(ModuleRegistry.MODULE_COUNT, 0),
+            "architypes": len(ModuleRegistry.ARCHITYPES),
+            "hits": ModuleRegistry.HITS,
+            "misses": ModuleRegistry.MISSES,
+        }
@@ -0,0 +1,191 @@
+"""Range and conditional request support for serving local files."""
+
+import hashlib
+import mimetypes
+import os
+from contextlib import suppress
+from email.utils import formatdate, parsedate_to_datetime
+from typing import AsyncIterator, Mapping, Optional
+
+import anyio
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.responses import Response, StreamingResponse
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+
+class RangeFileResponder:
+    """Builds responses for local files honouring Range, If-Range and validators.
+
+    ETag and Last-Modified are derived from the file's stat the same way
+    Starlette's FileResponse derives them, so validators stay stable across
+    the proxy and the static file server.
+    """
+
+    CHUNK_SIZE = 256 * 1024
+
+    @staticmethod
+    def validators(stat_result: os.stat_result) -> tuple[str, str]:
+        """Return the (etag, last_modified) header values for a file."""
+        etag_base = f"{stat_result.st_mtime}-{stat_result.st_size}"
+        etag = hashlib.md5(etag_base.encode(), usedforsecurity=False).hexdigest()
+        return f'"{etag}"', formatdate(stat_result.st_mtime, usegmt=True)
+
+    @staticmethod
+    def is_not_modified(headers: Mapping[str, str], etag: str, mtime: float) -> bool:
+        """Return whether the client's cached copy is still current."""
+        if if_none_match := headers.get("if-none-match"):
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            return "*" in tags or etag in tags
+
+        if if_modified_since := headers.get("if-modified-since"):
+            try:
+                return parsedate_to_datetime(if_modified_since).timestamp() >= int(
+                    mtime
+                )
+            except (TypeError, ValueError):
+                return False
+
+        return False
+
+    @staticmethod
+    def parse_range(header: str, size: int) -> Optional[tuple[int, int]]:
+        """Return the inclusive (start, end) of a single byte range.
+
+        Malformed or multi-part ranges return None, and the full file is served.
+
+        @raise ValueError: if the range cannot be satisfied for a file of size bytes.
+        """
+        unit, _, spec = header.partition("=")
+        if unit.strip().lower() != "bytes" or "," in spec:
+            return None
+
+        first, sep, last = (part.strip() for part in spec.partition("-"))
+        if not sep or (last and not last.isdigit()):
+            return None
+        if not first:
+            # suffix range: the last N bytes
+            if not last:
+                return None
+            if int(last) == 0 or size == 0:
+                raise ValueError(f"unsatisfiable range {header}")
+            return max(size - int(last), 0), size - 1
+        if not first.isdigit():
+            return None
+
+        start = int(first)
+        if last and start > int(last):
+            return None
+        if start >= size:
+            raise ValueError(f"unsatisfiable range {header}")
+        end = min(int(last), size - 1) if last else size - 1
+        return start, end
+
+    @staticmethod
+    def if_range_matches(
+        if_range: Optional[str], etag: str, last_modified: str
+    ) -> bool:
+        """Return whether a Range may be honoured given the If-Range precondition."""
+        return not if_range or if_range.strip() in (etag, last_modified)
+
+    @staticmethod
+    def respond(
+        path: str,
+        headers: Mapping[str, str],
+        stat_result: Optional[os.stat_result] = None,
+        media_type: Optional[str] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> Response:
+        """Return a 200, 206, 304 or 416 response for the file at path.
+
+        @param etag: Validator to use instead of one derived from the file's stat.
+        @param last_modified: Last-Modified to use instead of the file's mtime.
+        @raise HTTPException: 404 if the file does not exist.
+        """
+        try:
+            stat_result = stat_result or os.stat(path)
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail="File not found") from None
+        if not os.path.isfile(path):
+            raise HTTPException(status_code=404, detail="File not found")
+
+        stat_etag, stat_last_modified = RangeFileResponder.validators(stat_result)
+        etag = etag or stat_etag
+        last_modified = last_modified or stat_last_modified
+        mtime = stat_result.st_mtime
+        with suppress(TypeError, ValueError):
+            mtime = parsedate_to_datetime(last_modified).timestamp()
+        response_headers = {
+            "accept-ranges": "bytes",
+            "etag": etag,
+            "last-modified": last_modified,
+        }
+
+        if RangeFileResponder.is_not_modified(headers, etag, mtime):
+            return Response(status_code=304, headers=response_headers)
+
+        size = stat_result.st_size
+        byte_range = None
+        range_header = headers.get("range")
+        if range_header and RangeFileResponder.if_range_matches(
+            headers.get("if-range"), etag, last_modified
+        ):
+            try:
+                byte_range = RangeFileResponder.parse_range(range_header, size)
+            except ValueError:
+                return Response(
+                    status_code=416,
+                    headers={**response_headers, "content-range": f"bytes */{size}"},
+                )
+
+        status_code = 200
+        start, end = 0, size - 1
+        if byte_range:
+            status_code = 206
+            start, end = byte_range
+            response_headers["content-range"] = f"bytes {start}-{end}/{size}"
+        response_headers["content-length"] = str(end - start + 1)
+
+        return StreamingResponse(
+            RangeFileResponder.read(path, start, end - start + 1),
+            status_code=status_code,
+            headers=response_headers,
+            media_type=media_type
+            or mimetypes.guess_type(path)[0]
+            or "application/octet-stream",
+        )
+
+    @staticmethod
+    async def read(path: str, start: int, length: int) -> AsyncIterator[bytes]:
+        """Yield length bytes of the file at path from start, a chunk at a time."""
+        async with await anyio.open_file(path, "rb") as f:
+            await f.seek(start)
+            while length > 0:
+                chunk = await f.read(min(RangeFileResponder.CHUNK_SIZE, length))
+                if not chunk:
+                    break
+                length -= len(chunk)
+                yield chunk
+
+
+class RangeStaticFiles(StaticFiles):
+    """StaticFiles that also answers Range requests with partial content."""
+
+    def file_response(
+        self,
+        full_path: str | os.PathLike,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        """Serve byte ranges for GET requests; defer everything else to StaticFiles."""
+        headers = Headers(scope=scope)
+        if status_code == 200 and scope["method"] == "GET" and "range" in headers:
+            return RangeFileResponder.respond(str(full_path), headers, stat_result)
+
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if status_code == 200:
+            response.headers["accept-ranges"] = "bytes"
+        return response
@@ -0,0 +1,163 @@
+"""Streaming helpers for relaying token generators to SSE clients."""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import suppress
+from typing import Any, AsyncGenerator, AsyncIterator, Iterator, Optional
+
+
+class FlushPolicy:
+    """Decides when buffered stream chunks are flushed to the client as one frame.
+
+    A frame is flushed once its content reaches max_bytes or once max_delay
+    seconds have passed since its first chunk arrived; a budget of 0 disables it.
+    With both budgets disabled every chunk is sent as soon as it arrives.
+    """
+
+    LOGGER = logging.getLogger(__name__)
+
+    def __init__(self, max_bytes: int = 0, max_delay: float = 0.0) -> None:
+        """Initialize the policy with its byte and time budgets."""
+        self.max_bytes = max(0, max_bytes)
+        self.max_delay = max(0.0, max_delay)
+
+    @property
+    def immediate(self) -> bool:
+        """True when every chunk is flushed on arrival."""
+        return not self.max_bytes and not self.max_delay
+
+    def should_flush(self, size: int, started: float, now: float) -> bool:
+        """Return whether a frame of size bytes, begun at started, is due."""
+        if self.immediate:
+            return True
+        if self.max_bytes and size >= self.max_bytes:
+            return True
+        return bool(self.max_delay and now - started >= self.max_delay)
+
+    @staticmethod
+    def for_channel(channel: Optional[str] = None) -> "FlushPolicy":
+        """Build the flush policy configured for a channel.
+
+        Policies come from JIVAS_STREAM_FLUSH_POLICY, a JSON object keyed by channel
+        name (with an optional "default" entry), e.g.
+        {"default": {"max_bytes": 0, "max_delay_ms": 0}, "whatsapp": {"max_bytes": 512, "max_delay_ms": 250}}
+        """
+        try:
+            policies = json.loads(os.environ.get("JIVAS_STREAM_FLUSH_POLICY") or "{}")
+        except json.JSONDecodeError as e:
+            FlushPolicy.LOGGER.error(f"Invalid JIVAS_STREAM_FLUSH_POLICY: {e}")
+            policies = {}
+
+        config = policies.get(channel or "") or policies.get("default") or {}
+        return FlushPolicy(
+            max_bytes=int(config.get("max_bytes", 0)),
+            max_delay=float(config.get("max_delay_ms", 0)) / 1000,
+        )
+
+
+async def iterate_in_thread(
+    iterator: Iterator, maxsize: int = 64
+) -> AsyncGenerator[Any, None]:
+    """Drain a blocking iterator in a worker thread and yield its items asynchronously.
+
+    At most maxsize items are buffered; the worker blocks once the buffer is full
+    so a slow client applies backpressure to the upstream generator. Closing or
+    cancelling the async iterator stops the worker after its current item.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    slots = threading.Semaphore(maxsize)
+    stop = threading.Event()
+
+    def publish(item: Any, finished: bool) -> None:
+        with suppress(RuntimeError):  # event loop already closed
+            loop.call_soon_threadsafe(queue.put_nowait, (item, finished))
+
+    def drain() -> None:
+        error: Optional[BaseException] = None
+        try:
+            for item in iterator:
+                while not slots.acquire(timeout=0.5):
+                    if stop.is_set():
+                        return
+                if stop.is_set():
+                    return
+                publish(item, False)
+        except Exception as e:
+            error = e
+        finally:
+            if stop.is_set() and hasattr(iterator, "close"):
+                with suppress(Exception):
+                    iterator.close()
+            publish(error, True)
+
+    threading.Thread(target=drain, name="jivas-stream", daemon=True).start()
+
+    try:
+        while True:
+            item, finished = await queue.get()
+            if finished:
+                if item is not None:
+                    raise item
+                return
+            slots.release()
+            yield item
+    finally:
+        stop.set()
+
+
+async def coalesce_chunks(
+    chunks: AsyncIterator[Any], policy: FlushPolicy
+) -> AsyncIterator[list]:
+    """Group chunks exposing a .content string into frames according to policy.
+
+    Frames whose time budget runs out are flushed even while the next chunk
+    is still pending upstream.
+    """
+    frame: list = []
+    size = 0
+    started = 0.0
+    pending: Optional[asyncio.Future] = None
+
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(anext(chunks))
+
+            timeout = None
+            if frame and policy.max_delay:
+                timeout = max(0.0, started + policy.max_delay - time.monotonic())
+
+            done, _ = await asyncio.wait({pending}, timeout=timeout)
+            if not done:
+                yield frame
+                frame = []
+                size = 0
+                continue
+
+            try:
+                chunk = pending.result()
+            except StopAsyncIteration:
+                pending = None
+                break
+            pending = None
+
+            if not frame:
+                started = time.monotonic()
+            frame.append(chunk)
+            size += len((chunk.content or "").encode())
+
+            if policy.should_flush(size, started, time.monotonic()):
+                yield frame
+                frame = []
+                size = 0
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+    if frame:
+        yield frame
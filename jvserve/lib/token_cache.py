@@ -0,0 +1,90 @@
+"""Token Cache class for sharing the JIVAS service token between worker processes."""
+
+import json
+import logging
+import os
+import tempfile
+import time
+from contextlib import contextmanager, suppress
+from typing import Iterator, Optional
+
+
+class TokenCache:
+    """File-backed cache of the service user context.
+
+    All workers of a server point JIVAS_TOKEN_CACHE_FILE at the same path; the
+    worker holding the file lock refreshes the token and the others reuse it,
+    so the server logs in once per token lifetime rather than once per worker.
+    """
+
+    LOGGER = logging.getLogger(__name__)
+
+    def __init__(self, path: str) -> None:
+        """Initialize the cache backed by the file at path."""
+        self.path = path
+
+    @staticmethod
+    def is_fresh(ctx: Optional[dict], margin: int = 0) -> bool:
+        """Return whether ctx holds a token valid for at least margin more seconds."""
+        if not ctx or not ctx.get("token") or not ctx.get("expiration"):
+            return False
+        return ctx["expiration"] - margin > int(time.time())
+
+    def read(self) -> Optional[dict]:
+        """Return the cached user context, or None when absent or unreadable."""
+        try:
+            with open(self.path, "r") as f:
+                ctx = json.load(f)
+            return ctx if isinstance(ctx, dict) else None
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            TokenCache.LOGGER.warning(f"unable to read token cache {self.path}: {e}")
+            return None
+
+    def write(self, ctx: dict) -> None:
+        """Atomically replace the cached user context."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".token-")
+            with os.fdopen(fd, "w") as f:
+                json.dump(
+                    {
+                        "root_id": ctx.get("root_id"),
+                        "token": ctx.get("token"),
+                        "expiration": ctx.get("expiration"),
+                    },
+                    f,
+                )
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            TokenCache.LOGGER.warning(f"unable to write token cache {self.path}: {e}")
+
+    def clear(self, token: str) -> None:
+        """Remove the cached context if it still holds token."""
+        ctx = self.read()
+        if ctx and ctx.get("token") == token:
+            with self.lock():
+                ctx = self.read()
+                if ctx and ctx.get("token") == token:
+                    with suppress(FileNotFoundError):
+                        os.remove(self.path)
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        """Hold an exclusive inter-process lock on the cache for the duration."""
+        try:
+            import fcntl
+        except ImportError:  # platforms without fcntl share nothing across processes
+            yield
+            return
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(f"{self.path}.lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
@@ -0,0 +1,244 @@
+"""Upload Spool class for moving uploaded attachments to disk in bounded chunks."""
+
+import hashlib
+import os
+import tempfile
+import threading
+from contextlib import suppress
+from typing import BinaryIO, Collection, List, Optional
+
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from jvserve.lib.file_interface import FileInterface
+
+# Allowance for form fields and multipart boundaries on top of the attachments
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an attachment, or all attachments together, exceed the size limit."""
+
+
+class UploadSpool:
+    """Copies uploaded attachments into temporary files, enforcing size limits as it goes.
+
+    Attachments are read a chunk at a time, so memory stays bounded by the
+    chunk size rather than the upload size. Walkers receive the spooled file
+    path and a SHA-256 digest computed during the copy; small files
+    additionally carry their bytes inline as "content". Attachments may be
+    added from several threads at once. The spooled files are removed when
+    the spool is closed.
+
+    With a store, each attachment is also kept in that FileInterface under
+    its content hash; content already stored is not written again, and
+    walkers receive the stored key alongside a stable content_id.
+    """
+
+    def __init__(
+        self,
+        max_file_size: int = 0,
+        max_total_size: int = 0,
+        chunk_size: int = 1024 * 1024,
+        inline_threshold: int = 1024 * 1024,
+        directory: Optional[str] = None,
+        store: Optional[FileInterface] = None,
+        store_prefix: str = "attachments",
+    ) -> None:
+        """Initialize the spool.
+
+        @param max_file_size: Largest accepted attachment in bytes; 0 for no limit.
+        @param max_total_size: Largest accepted sum of attachments in bytes; 0 for no limit.
+        @param chunk_size: Bytes copied per read.
+        @param inline_threshold: Attachments up to this size also carry their bytes inline.
+        @param directory: Directory for spooled files; the system temp dir if None.
+        @param store: FileInterface keeping attachments by content hash; None to keep none.
+        @param store_prefix: Path under which stored attachments are kept.
+        """
+        self.max_file_size = max_file_size
+        self.max_total_size = max_total_size
+        self.chunk_size = max(1, chunk_size)
+        self.inline_threshold = inline_threshold
+        self.directory = directory
+        self.store = store
+        self.store_prefix = store_prefix.strip("/")
+        self.total_size = 0
+        self.paths: List[str] = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def from_env() -> "UploadSpool":
+        """Create a spool configured from the JIVAS_UPLOAD_* environment variables."""
+        store = None
+        if os.environ.get("JIVAS_UPLOAD_STORE", "false").lower() == "true":
+            from jvserve.lib.file_interface import file_interface
+
+            store = file_interface
+
+        return UploadSpool(
+            max_file_size=int(os.environ.get("JIVAS_UPLOAD_MAX_FILE_SIZE", "0")),
+            max_total_size=int(os.environ.get("JIVAS_UPLOAD_MAX_TOTAL_SIZE", "0")),
+            chunk_size=int(os.environ.get("JIVAS_UPLOAD_CHUNK_SIZE", "1048576")),
+            inline_threshold=int(
+                os.environ.get("JIVAS_UPLOAD_INLINE_THRESHOLD", "1048576")
+            ),
+            directory=os.environ.get("JIVAS_UPLOAD_SPOOL_DIR") or None,
+            store=store,
+            store_prefix=os.environ.get("JIVAS_UPLOAD_STORE_PREFIX", "attachments"),
+        )
+
+    def add(
+        self, name: Optional[str], content_type: Optional[str], source: BinaryIO
+    ) -> dict:
+        """Spool source to a temporary file and return its description for the walker.
+
+        @return: dict with name, type, size, sha256, content_id, path and content
+            (bytes, or None above the inline threshold); with a store, also key and
+            deduplicated (True if the content was already stored).
+        @raise UploadTooLargeError: if a size limit is exceeded; the partial file is removed on close.
+        """
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+        suffix = os.path.splitext(name or "")[1]
+        fd, path = tempfile.mkstemp(
+            dir=self.directory, prefix="jivas-upload-", suffix=suffix
+        )
+        with self._lock:
+            self.paths.append(path)
+
+        size = 0
+        digest = hashlib.sha256()
+        with os.fdopen(fd, "wb") as target:
+            while chunk := source.read(self.chunk_size):
+                size += len(chunk)
+                with self._lock:
+                    self.total_size += len(chunk)
+                    total_size = self.total_size
+                if self.max_file_size and size > self.max_file_size:
+                    raise UploadTooLargeError(
+                        f"{name} exceeds the {self.max_file_size} byte upload limit"
+                    )
+                if self.max_total_size and total_size > self.max_total_size:
+                    raise UploadTooLargeError(
+                        f"attachments exceed the {self.max_total_size} byte upload limit"
+                    )
+                digest.update(chunk)
+                target.write(chunk)
+
+        content = None
+        if size <= self.inline_threshold:
+            with open(path, "rb") as f:
+                content = f.read()
+
+        content_id = digest.hexdigest()
+        file = {
+            "name": name,
+            "type": content_type,
+            "size": size,
+            "sha256": content_id,
+            "content_id": content_id,
+            "path": path,
+            "content": content,
+        }
+        if self.store:
+            file.update(self.store_file(self.store, path, content_id, suffix, content))
+        return file
+
+    def store_file(
+        self,
+        store: FileInterface,
+        path: str,
+        content_id: str,
+        suffix: str,
+        content: Optional[bytes],
+    ) -> dict:
+        """Keep the spooled file in the store under its content hash unless already there."""
+        key = f"{self.store_prefix}/{content_id[:2]}/{content_id}{suffix.lower()}"
+        if store.file_exists(key):
+            return {"key": key, "deduplicated": True}
+
+        if content is not None:
+            saved = store.save_file(key, content)
+        else:
+            with open(path, "rb") as f:
+                saved = store.save_file_stream(key, f)
+        if not saved:
+            raise OSError(f"unable to store attachment {key}")
+        return {"key": key, "deduplicated": False}
+
+    def close(self) -> None:
+        """Remove every spooled file."""
+        with self._lock:
+            paths, self.paths = self.paths, []
+        for path in paths:
+            with suppress(FileNotFoundError):
+                os.remove(path)
+
+    def __enter__(self) -> "UploadSpool":
+        """Return the spool; its files are removed on exit."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Remove every spooled file."""
+        self.close()
+
+
+class UploadLimitMiddleware:
+    """Rejects upload requests whose body exceeds a size limit while it is received.
+
+    Form parsing spools the whole body before an endpoint runs, so the spool's
+    own checks only apply after receipt. This ASGI middleware answers 413 up
+    front for an oversized Content-Length, and otherwise stops reading as soon
+    as the streamed body passes the limit.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        paths: Collection[str],
+        max_body_size: Optional[int] = None,
+    ) -> None:
+        """Initialize the middleware.
+
+        @param paths: Request paths the limit applies to.
+        @param max_body_size: Largest accepted request body in bytes; 0 for no
+            limit. Defaults to JIVAS_UPLOAD_MAX_TOTAL_SIZE plus room for form fields.
+        """
+        if max_body_size is None:
+            max_total_size = int(os.environ.get("JIVAS_UPLOAD_MAX_TOTAL_SIZE", "0"))
+            max_body_size = max_total_size + MULTIPART_OVERHEAD if max_total_size else 0
+        self.app = app
+        self.paths = paths
+        self.max_body_size = max_body_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Apply the body limit to HTTP requests for the configured paths."""
+        if (
+            scope["type"] != "http"
+            or not self.max_body_size
+            or scope["path"] not in self.paths
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        detail = f"request body exceeds the {self.max_body_size} byte upload limit"
+        content_length = Headers(scope=scope).get("content-length", "")
+        if content_length.isdigit() and int(content_length) > self.max_body_size:
+            response = JSONResponse(status_code=413, content={"error": detail})
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
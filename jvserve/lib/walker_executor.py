@@ -0,0 +1,154 @@
+"""Walker Executor class for running blocking walker calls off the event loop."""
+
+import asyncio
+import contextvars
+import functools
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+
+class WalkerQueueFullError(RuntimeError):
+    """Raised when the walker executor has no room to admit another call."""
+
+
+class WalkerExecutor:
+    """Dedicated, sized thread pool for synchronous walker execution.
+
+    Async routes hand their blocking work (context loading, spawn_call) to
+    this executor instead of the default AnyIO limiter, so concurrency is
+    governed by JIVAS_WALKER_WORKERS and JIVAS_WALKER_QUEUE_SIZE.
+    """
+
+    EXECUTOR: Optional[ThreadPoolExecutor] = None
+    MAX_WORKERS = 0
+    MAX_QUEUE = 0
+    LOCK = threading.Lock()
+    ACTIVE = 0
+    QUEUED = 0
+    COMPLETED = 0
+    FAILED = 0
+    REJECTED = 0
+    TOTAL_WAIT = 0.0
+    TOTAL_RUN = 0.0
+    LOGGER = logging.getLogger(__name__)
+
+    @staticmethod
+    def get() -> ThreadPoolExecutor:
+        """Return the shared executor, creating it from the environment on first use."""
+        with WalkerExecutor.LOCK:
+            if WalkerExecutor.EXECUTOR is None:
+                WalkerExecutor.MAX_WORKERS = int(
+                    os.environ.get("JIVAS_WALKER_WORKERS", "16")
+                )
+                WalkerExecutor.MAX_QUEUE = int(
+                    os.environ.get("JIVAS_WALKER_QUEUE_SIZE", "64")
+                )
+                WalkerExecutor.EXECUTOR = ThreadPoolExecutor(
+                    max_workers=WalkerExecutor.MAX_WORKERS,
+                    thread_name_prefix="jivas-walker",
+                )
+                WalkerExecutor.LOGGER.info(
+                    f"walker executor started with {WalkerExecutor.MAX_WORKERS} workers "
+                    f"and a queue of {WalkerExecutor.MAX_QUEUE}."
+                )
+            return WalkerExecutor.EXECUTOR
+
+    @staticmethod
+    async def run(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run func(*args, **kwargs) on the walker executor and await its result.
+
+        The call runs inside a copy of the caller's context so context variables
+        set by the walker (e.g. the Jaseci context) stay isolated to this call.
+
+        @raise WalkerQueueFullError: if all workers are busy and the queue is full.
+        """
+        executor = WalkerExecutor.get()
+
+        with WalkerExecutor.LOCK:
+            capacity = WalkerExecutor.MAX_WORKERS + WalkerExecutor.MAX_QUEUE
+            if WalkerExecutor.ACTIVE + WalkerExecutor.QUEUED >= capacity:
+                WalkerExecutor.REJECTED += 1
+                raise WalkerQueueFullError(
+                    f"walker executor is at capacity ({capacity} calls in flight)"
+                )
+            WalkerExecutor.QUEUED += 1
+
+        submitted = time.monotonic()
+        # whichever of the worker or a cancellation claims the slot first moves it off the queue
+        claimed = [False]
+
+        def dequeue() -> None:
+            if not claimed[0]:
+                claimed[0] = True
+                WalkerExecutor.QUEUED -= 1
+
+        def call() -> Any:
+            started = time.monotonic()
+            with WalkerExecutor.LOCK:
+                dequeue()
+                WalkerExecutor.ACTIVE += 1
+                WalkerExecutor.TOTAL_WAIT += started - submitted
+            failed = False
+            try:
+                return func(*args, **kwargs)
+            except BaseException:
+                failed = True
+                raise
+            finally:
+                with WalkerExecutor.LOCK:
+                    WalkerExecutor.ACTIVE -= 1
+                    WalkerExecutor.TOTAL_RUN += time.monotonic() - started
+                    if failed:
+                        WalkerExecutor.FAILED += 1
+                    else:
+                        WalkerExecutor.COMPLETED += 1
+
+        ctx = contextvars.copy_context()
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                executor, functools.partial(ctx.run, call)
+            )
+        except asyncio.CancelledError:
+            with WalkerExecutor.LOCK:
+                dequeue()
+            raise
+
+    @staticmethod
+    def stats() -> dict:
+        """Return queue depth and throughput counters for the executor."""
+        with WalkerExecutor.LOCK:
+            finished = WalkerExecutor.COMPLETED + WalkerExecutor.FAILED
+            return {
+                "max_workers": WalkerExecutor.MAX_WORKERS,
+                "max_queue": WalkerExecutor.MAX_QUEUE,
+                "active": WalkerExecutor.ACTIVE,
+                "queued": WalkerExecutor.QUEUED,
+                "completed": WalkerExecutor.COMPLETED,
+                "failed": WalkerExecutor.FAILED,
+                "rejected": WalkerExecutor.REJECTED,
+                "avg_wait_ms": (
+                    round(WalkerExecutor.TOTAL_WAIT / finished * 1000, 3)
+                    if finished
+                    else 0.0
+                ),
+                "avg_run_ms": (
+                    round(WalkerExecutor.TOTAL_RUN / finished * 1000, 3)
+                    if finished
+                    else 0.0
+                ),
+            }
+
+    @staticmethod
+    def shutdown(wait: bool = True) -> None:
+        """Shut down the executor; a new one is created on the next run."""
+        with WalkerExecutor.LOCK:
+            executor = WalkerExecutor.EXECUTOR
+            WalkerExecutor.EXECUTOR = None
+        if executor:
+            executor.shutdown(wait=wait)
+            WalkerExecutor.LOGGER.info("walker executor stopped.")
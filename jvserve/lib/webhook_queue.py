@@ -0,0 +1,312 @@
+"""Webhook Queue class for acknowledging webhooks before running their walkers."""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Optional
+
+
+class WebhookQueue:
+    """Durable, SQLite-backed queue of webhook calls executed by a worker pool.
+
+    Jobs are persisted before the webhook is acknowledged, so they survive a
+    restart. Each job may carry an idempotency key; a key seen within
+    dedup_ttl seconds is dropped, which absorbs provider retries. Several
+    processes may share the same database file. Expired keys and failed jobs
+    older than failed_retention are purged every purge_interval seconds.
+    """
+
+    LOGGER = logging.getLogger(__name__)
+
+    def __init__(
+        self,
+        path: str,
+        handler: Callable[[dict], Any],
+        workers: int = 4,
+        max_attempts: int = 3,
+        dedup_ttl: float = 86400,
+        lease: float = 600,
+        failed_retention: float = 7 * 86400,
+        purge_interval: float = 60,
+    ) -> None:
+        """Initialize the queue.
+
+        @param path: SQLite database file holding the queue.
+        @param handler: Called with each job payload on a worker thread.
+        @param workers: Number of worker threads.
+        @param max_attempts: Runs allowed per job before it is marked failed.
+        @param dedup_ttl: Seconds an idempotency key is remembered.
+        @param lease: Seconds after which a running job is presumed abandoned and retried.
+        @param failed_retention: Seconds a failed job is kept for inspection.
+        @param purge_interval: Seconds between purges of expired keys and failed jobs.
+        """
+        self.path = path
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.max_attempts = max(1, max_attempts)
+        self.dedup_ttl = dedup_ttl
+        self.lease = lease
+        self.failed_retention = failed_retention
+        self.purge_interval = purge_interval
+        self._next_purge = 0.0
+        self.processed = 0
+        self.failed = 0
+        self.duplicates = 0
+        self.total_wait = 0.0
+        self.total_run = 0.0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition()
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                enqueued_at REAL NOT NULL,
+                claimed_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id);
+            CREATE TABLE IF NOT EXISTS idempotency_keys (
+                key TEXT PRIMARY KEY,
+                created_at REAL NOT NULL
+            );
+            """)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection to the queue database."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def enqueue(
+        self,
+        payload: dict,
+        idempotency_key: Optional[str] = None,
+        dedup_ttl: Optional[float] = None,
+    ) -> bool:
+        """Persist a job; return False if its idempotency key was already seen.
+
+        @param dedup_ttl: Seconds this key is remembered, if shorter than the queue's dedup_ttl.
+        """
+        now = time.time()
+        dedup_ttl = self.dedup_ttl if dedup_ttl is None else dedup_ttl
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if idempotency_key:
+                conn.execute(
+                    "DELETE FROM idempotency_keys WHERE key = ? AND created_at < ?",
+                    (idempotency_key, now - dedup_ttl),
+                )
+                inserted = conn.execute(
+                    "INSERT OR IGNORE INTO idempotency_keys (key, created_at) VALUES (?, ?)",
+                    (idempotency_key, now),
+                ).rowcount
+                if not inserted:
+                    conn.execute("COMMIT")
+                    with self._lock:
+                        self.duplicates += 1
+                    return False
+
+            conn.execute(
+                "INSERT INTO jobs (payload, enqueued_at) VALUES (?, ?)",
+                (json.dumps(payload, default=str), now),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        with self._wakeup:
+            self._wakeup.notify()
+        return True
+
+    def claim(self) -> Optional[tuple[int, dict, float, int]]:
+        """Mark the oldest pending job as running and return it, if any."""
+        now = time.time()
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # an abandoned job is only retried while it has attempts left;
+            # purge() marks exhausted ones failed
+            row = conn.execute(
+                "SELECT id, payload, enqueued_at, attempts FROM jobs "
+                "WHERE status = 'pending' "
+                "OR (status = 'running' AND claimed_at < ? AND attempts < ?) "
+                "ORDER BY id LIMIT 1",
+                (now - self.lease, self.max_attempts),
+            ).fetchone()
+            if row:
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', claimed_at = ?, attempts = attempts + 1 "
+                    "WHERE id = ?",
+                    (now, row[0]),
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        if not row:
+            return None
+        return row[0], json.loads(row[1]), row[2], row[3] + 1
+
+    def run_job(
+        self, job_id: int, payload: dict, enqueued_at: float, attempt: int
+    ) -> None:
+        """Run one claimed job and record its outcome."""
+        started = time.time()
+        conn = self._connection()
+        try:
+            self.handler(payload)
+            conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+            with self._lock:
+                self.processed += 1
+        except Exception as e:
+            final = attempt >= self.max_attempts
+            conn.execute(
+                "UPDATE jobs SET status = ? WHERE id = ?",
+                ("failed" if final else "pending", job_id),
+            )
+            WebhookQueue.LOGGER.error(
+                f"webhook job {job_id} failed (attempt {attempt}/{self.max_attempts}): {e}"
+            )
+            if final:
+                with self._lock:
+                    self.failed += 1
+        finally:
+            with self._lock:
+                self.total_wait += started - enqueued_at
+                self.total_run += time.time() - started
+
+    def purge(self) -> dict:
+        """Drop expired idempotency keys and old failed jobs.
+
+        Running jobs whose lease expired with no attempts left (their worker
+        died on every attempt) are marked failed here.
+
+        @return: Number of keys, failed jobs and abandoned jobs affected.
+        """
+        now = time.time()
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            abandoned = conn.execute(
+                "UPDATE jobs SET status = 'failed' "
+                "WHERE status = 'running' AND claimed_at < ? AND attempts >= ?",
+                (now - self.lease, self.max_attempts),
+            ).rowcount
+            keys = conn.execute(
+                "DELETE FROM idempotency_keys WHERE created_at < ?",
+                (now - self.dedup_ttl,),
+            ).rowcount
+            failed = conn.execute(
+                "DELETE FROM jobs WHERE status = 'failed' AND claimed_at < ?",
+                (now - self.failed_retention,),
+            ).rowcount
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        if abandoned:
+            WebhookQueue.LOGGER.error(
+                f"{abandoned} webhook job(s) abandoned after {self.max_attempts} attempts."
+            )
+            with self._lock:
+                self.failed += abandoned
+        return {"keys": keys, "failed_jobs": failed, "abandoned": abandoned}
+
+    def purge_due(self) -> bool:
+        """Return whether this worker should purge now, claiming the next slot."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._next_purge:
+                return False
+            self._next_purge = now + self.purge_interval
+            return True
+
+    def work(self) -> None:
+        """Worker loop: claim and run jobs until the queue is stopped."""
+        while not self._stop.is_set():
+            if self.purge_due():
+                try:
+                    self.purge()
+                except Exception as e:
+                    WebhookQueue.LOGGER.error(f"unable to purge webhook queue: {e}")
+
+            try:
+                job = self.claim()
+            except Exception as e:
+                WebhookQueue.LOGGER.error(f"unable to claim webhook job: {e}")
+                job = None
+
+            if job:
+                self.run_job(*job)
+                continue
+
+            # idle; wake on enqueue, or poll for jobs queued by other processes
+            with self._wakeup:
+                self._wakeup.wait(timeout=1)
+
+    def start(self) -> None:
+        """Start the worker threads if they are not already running."""
+        if self._threads:
+            return
+        self._stop.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(
+                target=self.work, name=f"jivas-webhook-{i}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        WebhookQueue.LOGGER.info(
+            f"webhook queue started with {self.workers} workers at {self.path}."
+        )
+
+    def stop(self, timeout: float = 5) -> None:
+        """Stop the workers; unfinished jobs remain queued for the next start."""
+        self._stop.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+    def stats(self) -> dict:
+        """Return queue depth, outcome counters and latency averages."""
+        counts = dict(
+            self._connection()
+            .execute("SELECT status, COUNT(*) FROM jobs GROUP BY status")
+            .fetchall()
+        )
+        with self._lock:
+            finished = self.processed + self.failed
+            return {
+                "pending": counts.get("pending", 0),
+                "running": counts.get("running", 0),
+                "failed_jobs": counts.get("failed", 0),
+                "processed": self.processed,
+                "failed": self.failed,
+                "duplicates": self.duplicates,
+                "avg_wait_ms": (
+                    round(self.total_wait / finished * 1000, 3) if finished else 0.0
+                ),
+                "avg_run_ms": (
+                    round(self.total_run / finished * 1000, 3) if finished else 0.0
+                ),
+            }
@@ -45,15 +45,17 @@ setup(
         "aiohttp>=3.10.10",
         "schedule>=1.2.2",
         "boto3>=1.37.10",
+        "httpx>=0.27.0",
     ],
     extras_require={
+        "http2": ["httpx[http2]>=0.27.0"],
         "dev": [
             "pre-commit",
             "pytest",
             "pytest-mock",
             "pytest-cov",
             "coverage",
-        ]
+        ],
     },
     entry_points={
         "jac": [
@@ -0,0 +1,729 @@
+"""Tests for AgentInterface routes and helpers"""
+
+import asyncio
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Any, Iterator, List, Optional
+from unittest.mock import MagicMock, patch
+
+import anyio
+import pytest
+
+if sys.version_info < (3, 12):
+    pytest.skip("jac-cloud requires Python 3.12", allow_module_level=True)
+
+import jaclang  # noqa: F401,E402 - loads the jac-cloud plugin before jvserve.cli
+from fastapi import FastAPI, UploadFile  # noqa: E402
+from fastapi.responses import ORJSONResponse  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from httpx import Response  # noqa: E402
+from jac_cloud import FastAPI as JacCloudFastAPI  # noqa: E402
+from jac_cloud.core.architype import AccessLevel  # noqa: E402
+from jac_cloud.core.context import JASECI_CONTEXT, SUPER_ROOT_ID  # noqa: E402
+from jac_cloud.core.memory import MongoDB  # noqa: E402
+from jac_cloud.plugin.jaseci import NodeAnchor  # noqa: E402
+from jaclang.plugin.feature import JacFeature as _Jac  # noqa: E402
+from jaclang.runtimelib.context import ExecutionContext  # noqa: E402
+from starlette.datastructures import Headers  # noqa: E402
+
+from jvserve.cli import add_agent_routes  # noqa: E402
+from jvserve.lib.agent_interface import AgentInterface  # noqa: E402
+from jvserve.lib.concurrency_limiter import ConcurrencyLimiter  # noqa: E402
+from jvserve.lib.token_cache import TokenCache  # noqa: E402
+from jvserve.lib.upload_spool import UploadSpool  # noqa: E402
+from jvserve.lib.walker_executor import WalkerExecutor  # noqa: E402
+
+
+class TestAgentRoutes(unittest.TestCase):
+    """Test cases for the agent routes"""
+
+    def test_routes_register(self) -> None:
+        """Test that every agent route can be added to an app"""
+        app = FastAPI()
+        add_agent_routes(app)
+        paths = {route.path for route in app.routes}
+        self.assertTrue(
+            {
+                "/interact",
+                "/webhook/{key}",
+                "/action/walker",
+                "/action/cache/invalidate",
+                "/metrics",
+            }
+            <= paths
+        )
+
+    def test_interact_runs_off_the_event_loop(self) -> None:
+        """Test that /interact hands the walker run to a worker thread"""
+        app = FastAPI()
+        add_agent_routes(app)
+        threads = []
+
+        def interact_call(payload: AgentInterface.InteractPayload) -> None:
+            threads.append(threading.current_thread().name)
+            return None
+
+        with patch.object(AgentInterface, "interact_call", interact_call):
+            response = TestClient(app).post("/interact", json={"agent_id": "a1"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {})
+        self.assertTrue(threads[0].startswith("jivas-walker"))
+
+    def test_update_interaction_runs_off_the_event_loop(self) -> None:
+        """Test that the end-of-stream write-back runs on the walker executor"""
+        threads = []
+
+        def update_call(node: object, text: str, tokens: int) -> None:
+            threads.append((threading.current_thread().name, text, tokens))
+
+        with patch.object(AgentInterface, "update_interaction_call", update_call):
+            asyncio.run(AgentInterface.update_interaction(object(), "hello", 2))
+
+        self.assertEqual(len(threads), 1)
+        self.assertTrue(threads[0][0].startswith("jivas-walker"))
+        self.assertEqual(threads[0][1:], ("hello", 2))
+
+    def test_attachments_spool_on_the_file_pool(self) -> None:
+        """Test that /action/walker spools attachments on the shared file pool"""
+        threads = []
+
+        def add(spool: UploadSpool, name: str, *args: object) -> dict:
+            threads.append(threading.current_thread().name)
+            return {"name": name}
+
+        attachment = UploadFile(io.BytesIO(b"abc"), filename="a.txt")
+        with patch.object(UploadSpool, "add", add), patch.object(
+            AgentInterface, "load_context", return_value=None
+        ):
+            response = asyncio.run(
+                AgentInterface.action_walker_exec_async(
+                    "a1", "actions.hook", "w", None, [attachment]
+                )
+            )
+
+        self.assertEqual(response.status_code, 500)
+        self.assertTrue(threads[0].startswith("jivas-files"))
+
+
+class TestStreamInteraction(unittest.TestCase):
+    """Test cases for streamed interactions"""
+
+    def test_disconnect_writes_back_partial_interaction(self) -> None:
+        """Test that a stream cancelled by its request still updates the node"""
+        resume = threading.Event()
+        updates = []
+
+        def tokens() -> Iterator[SimpleNamespace]:
+            yield SimpleNamespace(
+                content="hel", type="AIMessageChunk", response_metadata={}
+            )
+            resume.wait(5)
+            yield SimpleNamespace(
+                content="lo", type="AIMessageChunk", response_metadata={}
+            )
+
+        def update_call(node: object, text: str, tokens: int) -> None:
+            updates.append((text, tokens))
+
+        node = SimpleNamespace(id="n1", response={"session_id": "s1"})
+
+        async def main() -> None:
+            stream = AgentInterface.stream_interaction(tokens(), node)
+            async with anyio.create_task_group() as tg:
+
+                async def consume() -> None:
+                    async for _frame in stream:
+                        # the client goes away after the first frame
+                        tg.cancel_scope.cancel()
+
+                tg.start_soon(consume)
+
+        # a busy executor makes the write-back queue behind another walker
+        executor = ThreadPoolExecutor(max_workers=1)
+        executor.submit(time.sleep, 0.3)
+        with patch.object(
+            AgentInterface, "update_interaction_call", update_call
+        ), patch.multiple(
+            WalkerExecutor, EXECUTOR=executor, MAX_WORKERS=1, MAX_QUEUE=4
+        ):
+            try:
+                anyio.run(main)
+            finally:
+                resume.set()
+        executor.shutdown()
+
+        self.assertEqual(updates, [("hel", 1)])
+
+
+class TestActionCache(unittest.TestCase):
+    """Test cases for action cache invalidation"""
+
+    def tearDown(self) -> None:
+        """Leave the action cache empty"""
+        AgentInterface.ACTION_CACHE.clear()
+
+    def test_invalidate_action_cache(self) -> None:
+        """Test that the endpoint drops one agent or every agent"""
+        for agent_id in ["a1", "a2", "a3"]:
+            AgentInterface.ACTION_CACHE.set(agent_id, {})
+
+        result = asyncio.run(AgentInterface.invalidate_action_cache("a1"))
+        self.assertEqual(result, {"invalidated": "a1"})
+        self.assertIsNone(AgentInterface.ACTION_CACHE.get("a1"))
+        self.assertEqual(AgentInterface.ACTION_CACHE.get("a2"), {})
+
+        result = asyncio.run(AgentInterface.invalidate_action_cache())
+        self.assertEqual(result, {"invalidated": "all"})
+        self.assertEqual(len(AgentInterface.ACTION_CACHE), 0)
+
+
+class TestWebhookRoute(unittest.TestCase):
+    """Test cases for the /webhook route"""
+
+    def setUp(self) -> None:
+        """Issue a key for a webhook walker and serve the agent routes"""
+        self.env = patch.dict(os.environ, {"JIVAS_WEBHOOK_SECRET_KEY": "s3cret"})
+        self.env.start()
+        os.environ.pop("JIVAS_WEBHOOK_FAST_ACK", None)
+        AgentInterface.init_webhook_cipher()
+        self.key = AgentInterface.encrypt_webhook_key("a1", "actions.hook", "hook")
+        self.calls: List[tuple] = []
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+        app = FastAPI()
+        add_agent_routes(app)
+        self.client = TestClient(app)
+        self.client.__enter__()
+
+    def tearDown(self) -> None:
+        """Stop the client and restore the environment and cipher"""
+        self.release.set()
+        self.client.__exit__(None, None, None)
+        self.env.stop()
+        AgentInterface.init_webhook_cipher()
+
+    def webhook_call(self, *args: Any) -> dict:
+        """Stand in for the walker run, optionally held until released"""
+        self.calls.append((threading.current_thread().name, *args))
+        self.entered.set()
+        self.release.wait(5)
+        return {"ok": True}
+
+    def post(self, key: str, **kwargs: Any) -> Response:
+        """POST a webhook call for key"""
+        return self.client.post(f"/webhook/{key}", json={"text": "hi"}, **kwargs)
+
+    def test_runs_on_walker_executor(self) -> None:
+        """Test that the walker runs on the walker executor with the request data"""
+        with patch.object(AgentInterface, "webhook_call", self.webhook_call):
+            response = self.post(self.key, headers={"X-Signature": "abc"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"ok": True})
+        thread, agent_id, module_root, walker, headers, params = self.calls[0]
+        self.assertTrue(thread.startswith("jivas-walker"))
+        self.assertEqual(
+            (agent_id, module_root, walker), ("a1", "actions.hook", "hook")
+        )
+        self.assertEqual(headers["x-signature"], "abc")
+        self.assertEqual(params, {"text": "hi"})
+
+    def assert_second_call_rejected(self, second_key: str) -> None:
+        """Hold one call in the walker and check that second_key gets a 503"""
+        self.release.clear()
+        with patch.object(
+            AgentInterface, "webhook_call", self.webhook_call
+        ), patch.object(
+            AgentInterface, "WEBHOOK_LIMIT_TIMEOUT", 0.1
+        ), ThreadPoolExecutor(
+            max_workers=1
+        ) as pool:
+            first = pool.submit(self.post, self.key)
+            self.assertTrue(self.entered.wait(5))
+            rejected = self.post(second_key)
+            self.release.set()
+            self.assertEqual(first.result().status_code, 200)
+
+        self.assertEqual(rejected.status_code, 503)
+        self.assertEqual(rejected.headers["retry-after"], "1")
+        self.assertEqual(len(self.calls), 1)
+
+    def test_walker_limit(self) -> None:
+        """Test that calls over a walker's concurrency limit are rejected with 503"""
+        with patch.object(
+            AgentInterface, "WEBHOOK_WALKER_LIMITER", ConcurrencyLimiter(1)
+        ):
+            self.assert_second_call_rejected(self.key)
+
+    def test_agent_limit(self) -> None:
+        """Test that calls over an agent's concurrency limit are rejected with 503"""
+        other_walker = AgentInterface.encrypt_webhook_key("a1", "actions.hook", "other")
+        with patch.object(
+            AgentInterface, "WEBHOOK_AGENT_LIMITER", ConcurrencyLimiter(1)
+        ):
+            self.assert_second_call_rejected(other_walker)
+
+    def test_fast_ack_enqueues(self) -> None:
+        """Test that fast-ack walkers are queued and acknowledged without running"""
+        os.environ["JIVAS_WEBHOOK_FAST_ACK"] = "hook"
+        webhook_queue = MagicMock()
+        with patch.object(AgentInterface, "WEBHOOK_QUEUE", webhook_queue), patch.object(
+            AgentInterface, "webhook_call", self.webhook_call
+        ):
+            response = self.post(self.key, headers={"Idempotency-Key": "d1"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.calls, [])
+        job, idempotency_key, dedup_ttl = webhook_queue.enqueue.call_args.args
+        self.assertEqual(
+            (job["agent_id"], job["module_root"], job["walker"]),
+            ("a1", "actions.hook", "hook"),
+        )
+        self.assertEqual(job["params"], {"text": "hi"})
+        self.assertIn(("idempotency-key", "d1"), list(job["headers"]))
+        self.assertEqual((idempotency_key, dedup_ttl), (f"{self.key}:d1", None))
+
+    def test_fast_ack_runs_inline_when_queueing_fails(self) -> None:
+        """Test that a call that cannot be queued still runs inline"""
+        os.environ["JIVAS_WEBHOOK_FAST_ACK"] = "true"
+        webhook_queue = MagicMock()
+        webhook_queue.enqueue.side_effect = OSError("disk full")
+        with patch.object(AgentInterface, "WEBHOOK_QUEUE", webhook_queue), patch.object(
+            AgentInterface, "webhook_call", self.webhook_call
+        ):
+            response = self.post(self.key)
+
+        self.assertEqual(response.json(), {"ok": True})
+        self.assertEqual(len(self.calls), 1)
+
+
+class TestWebhookJobs(unittest.TestCase):
+    """Test cases for queued webhook jobs"""
+
+    def test_queued_headers_are_case_insensitive(self) -> None:
+        """Test that queued jobs hand walkers the same Headers as inline calls"""
+        calls = []
+
+        def webhook_call(*args: object) -> None:
+            calls.append(args)
+
+        job = {
+            "agent_id": "a1",
+            "module_root": "actions.hook",
+            "walker": "hook",
+            "headers": [["x-signature", "abc"], ["accept", "a"], ["accept", "b"]],
+            "params": {},
+        }
+        with patch.object(AgentInterface, "webhook_call", webhook_call):
+            AgentInterface.run_webhook_job(job)
+            # jobs queued before headers were stored as pairs
+            AgentInterface.run_webhook_job({**job, "headers": {"X-Signature": "abc"}})
+
+        for call in calls:
+            self.assertEqual(call[3]["X-Signature"], "abc")
+        self.assertEqual(calls[0][3].getlist("accept"), ["a", "b"])
+
+    def test_idempotency_key(self) -> None:
+        """Test that only provider headers dedupe unless body digests are enabled"""
+        key = AgentInterface.webhook_idempotency_key
+        headers = Headers({"x-github-delivery": "d1"})
+        self.assertEqual(key("k", headers, b"yes"), ("k:d1", None))
+        self.assertEqual(key("k", Headers(), b"yes"), (None, None))
+
+        with patch.object(AgentInterface, "WEBHOOK_BODY_DEDUP_TTL", 30):
+            digest, ttl = key("k", Headers(), b"yes")
+            self.assertEqual(ttl, 30)
+            self.assertEqual(digest, key("k", Headers(), b"yes")[0])
+            self.assertNotEqual(digest, key("k", Headers(), b"no")[0])
+
+
+class TestSystemRoot(unittest.TestCase):
+    """Test cases for per-context system root anchors"""
+
+    def setUp(self) -> None:
+        """Use jac-cloud's local database and a cold system root cache"""
+        ExecutionContext.create()
+        AgentInterface.SYSTEM_ROOT_DOC = None
+
+    def test_each_context_gets_its_own_anchor(self) -> None:
+        """Test that contexts never share one mutable system root anchor"""
+        first = AgentInterface.get_system_root(MongoDB())
+        second = AgentInterface.get_system_root(MongoDB())
+
+        self.assertEqual(first.id, SUPER_ROOT_ID)
+        self.assertEqual(first.id, second.id)
+        self.assertIsNot(first, second)
+        self.assertIsNot(first.architype, second.architype)
+        self.assertIsNot(first.edges, second.edges)
+
+    def test_document_is_reloaded_after_ttl(self) -> None:
+        """Test that the cached document is refreshed once it expires"""
+        load = AgentInterface.load_system_root_doc
+        with patch.object(
+            AgentInterface, "load_system_root_doc", side_effect=load
+        ) as loader:
+            AgentInterface.get_system_root(MongoDB())
+            AgentInterface.get_system_root(MongoDB())
+            self.assertEqual(loader.call_count, 1)
+
+            with patch.object(AgentInterface, "SYSTEM_ROOT_TTL", 0):
+                AgentInterface.get_system_root(MongoDB())
+            self.assertEqual(loader.call_count, 2)
+
+    def test_action_walker_changes_are_written_back(self) -> None:
+        """Test that a node changed by an action walker is stored on close"""
+        AgentInterface.ROOT_ID = str(SUPER_ROOT_ID)
+        AgentInterface.load_system_root_doc()
+        collection = NodeAnchor.Collection.collection()
+        # the local database outlives a test run; start from an unshared root
+        collection.update_one(
+            {"_id": SUPER_ROOT_ID}, {"$set": {"access.roots.anchors": {}}}
+        )
+
+        granted = []
+
+        def spawn_call(node: object, walker: object) -> SimpleNamespace:
+            ctx = JASECI_CONTEXT.get()
+            granted.append(ctx.root.ref_id)
+            _Jac.allow_root(ctx.system_root.architype, ctx.root, AccessLevel.READ)
+            return SimpleNamespace(response={"ok": True})
+
+        with patch.object(AgentInterface, "get_user_context"), patch.object(
+            AgentInterface, "spawn_walker"
+        ), patch.object(_Jac, "spawn_call", spawn_call), patch.object(
+            JacCloudFastAPI, "is_enabled", return_value=True
+        ):
+            response = asyncio.run(
+                AgentInterface.action_walker_exec_async(
+                    "a1", "actions.hook", "w", None, []
+                )
+            )
+
+        self.assertEqual(response, {"ok": True})
+        doc = collection.find_one({"_id": SUPER_ROOT_ID})
+        self.assertEqual(doc["access"]["roots"]["anchors"], {granted[0]: "READ"})
+
+
+class TestWebhookKeys(unittest.TestCase):
+    """Test cases for signed and legacy webhook keys"""
+
+    def setUp(self) -> None:
+        """Issue keys with a known secret"""
+        self.env = patch.dict(
+            os.environ,
+            {"JIVAS_WEBHOOK_SECRET_KEY": "s3cret", "JIVAS_WEBHOOK_KEY_FORMAT": ""},
+        )
+        self.env.start()
+        AgentInterface.init_webhook_cipher()
+        self.args = {"agent_id": "a1", "module_root": "actions.hook", "walker": "w"}
+
+    def tearDown(self) -> None:
+        """Restore the environment and cipher"""
+        self.env.stop()
+        AgentInterface.init_webhook_cipher()
+
+    def issue(self) -> str:
+        """Return a key for self.args"""
+        return AgentInterface.encrypt_webhook_key(*self.args.values())
+
+    def test_round_trip(self) -> None:
+        """Test that a signed key decodes to the fields it was issued for"""
+        key = self.issue()
+        self.assertTrue(key.startswith("v1."))
+        self.assertEqual(AgentInterface.decrypt_webhook_key(key), self.args)
+
+    def test_tampered_payload_is_rejected(self) -> None:
+        """Test that a key whose payload was swapped is rejected"""
+        key = self.issue()
+        self.args["walker"] = "admin"
+        forged_payload = self.issue().rpartition(".")[0]
+        forged = f"{forged_payload}.{key.rpartition('.')[2]}"
+        self.assertEqual(AgentInterface.decrypt_webhook_key(forged), {})
+
+    def test_tampered_signature_is_rejected(self) -> None:
+        """Test that a key with an altered signature is rejected"""
+        key = self.issue()
+        last = "A" if key[-1] != "A" else "B"
+        self.assertEqual(AgentInterface.decrypt_webhook_key(key[:-1] + last), {})
+        self.assertEqual(
+            AgentInterface.decrypt_webhook_key(key.rpartition(".")[0] + "."), {}
+        )
+
+    def test_legacy_keys(self) -> None:
+        """Test that legacy keys are issued on request and still accepted"""
+        with patch.dict(os.environ, {"JIVAS_WEBHOOK_KEY_FORMAT": "legacy"}):
+            key = self.issue()
+        self.assertFalse(key.startswith("v1."))
+        self.assertEqual(AgentInterface.decrypt_webhook_key(key), self.args)
+
+    def test_signed_only_refuses_legacy_keys(self) -> None:
+        """Test that signed-only mode refuses legacy keys once a secret is set"""
+        with patch.dict(os.environ, {"JIVAS_WEBHOOK_KEY_FORMAT": "legacy"}):
+            legacy = self.issue()
+        # cached while legacy keys were still accepted
+        self.assertEqual(AgentInterface.decrypt_webhook_key(legacy), self.args)
+
+        with patch.dict(os.environ, {"JIVAS_WEBHOOK_KEY_FORMAT": "signed-only"}):
+            signed = self.issue()
+            self.assertTrue(signed.startswith("v1."))
+            self.assertEqual(AgentInterface.decrypt_webhook_key(signed), self.args)
+            self.assertEqual(AgentInterface.decrypt_webhook_key(legacy), {})
+
+            # without a secret nothing can be signed, so legacy keys still work
+            del os.environ["JIVAS_WEBHOOK_SECRET_KEY"]
+            AgentInterface.init_webhook_cipher()
+            unsigned = self.issue()
+            self.assertFalse(unsigned.startswith("v1."))
+            self.assertEqual(AgentInterface.decrypt_webhook_key(unsigned), self.args)
+
+    def test_decoded_keys_are_cached(self) -> None:
+        """Test that repeat lookups are served from the key cache"""
+        key = self.issue()
+        AgentInterface.decrypt_webhook_key(key)
+        with patch.object(AgentInterface, "decode_signed_webhook_key") as decode:
+            result = AgentInterface.decrypt_webhook_key(key)
+            result["walker"] = "changed"
+            self.assertEqual(AgentInterface.decrypt_webhook_key(key), self.args)
+        decode.assert_not_called()
+
+    def test_no_signed_keys_without_secret(self) -> None:
+        """Test that the public default secret is never used to sign keys"""
+        signed = self.issue()
+        with patch.dict(os.environ, {"JIVAS_WEBHOOK_SECRET_KEY": ""}):
+            del os.environ["JIVAS_WEBHOOK_SECRET_KEY"]
+            AgentInterface.init_webhook_cipher()
+            key = self.issue()
+            self.assertFalse(key.startswith("v1."))
+            self.assertEqual(AgentInterface.decrypt_webhook_key(key), self.args)
+            self.assertEqual(AgentInterface.decrypt_webhook_key(signed), {})
+            with self.assertRaises(ValueError):
+                AgentInterface.sign_webhook_payload("v1.payload")
+
+
+class TestUserContext(unittest.TestCase):
+    """Test cases for refreshing the service token"""
+
+    def setUp(self) -> None:
+        """Start without a shared token file and keep the identity fields clean"""
+        self.env = patch.dict(os.environ)
+        self.env.start()
+        os.environ.pop("JIVAS_TOKEN_CACHE_FILE", None)
+        self.saved = (
+            AgentInterface.ROOT_ID,
+            AgentInterface.TOKEN,
+            AgentInterface.EXPIRATION,
+        )
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.logins: List[str] = []
+
+    def tearDown(self) -> None:
+        """Restore the environment and identity fields"""
+        self.env.stop()
+        (
+            AgentInterface.ROOT_ID,
+            AgentInterface.TOKEN,
+            AgentInterface.EXPIRATION,
+        ) = self.saved
+        self.test_dir.cleanup()
+
+    def login(self) -> dict:
+        """Stand in for login_user_context, taking long enough for callers to pile up"""
+        time.sleep(0.1)
+        self.logins.append(threading.current_thread().name)
+        ctx = {
+            "root_id": "r1",
+            "token": f"t{len(self.logins)}",
+            "expiration": int(time.time()) + 3600,
+        }
+        AgentInterface.ROOT_ID = ctx["root_id"]
+        AgentInterface.TOKEN = ctx["token"]
+        AgentInterface.EXPIRATION = ctx["expiration"]
+        return ctx
+
+    def set_token(self, token: str, expires_in: Optional[int]) -> None:
+        """Hold token, expiring in expires_in seconds (None for no expiration)"""
+        AgentInterface.ROOT_ID = "r1"
+        AgentInterface.TOKEN = token
+        AgentInterface.EXPIRATION = (
+            None if expires_in is None else int(time.time()) + expires_in
+        )
+
+    def get_concurrently(self, callers: int = 8) -> List[Optional[dict]]:
+        """Call get_user_context from several threads at once"""
+        barrier = threading.Barrier(callers)
+
+        def call(_n: int) -> Optional[dict]:
+            barrier.wait()
+            return AgentInterface.get_user_context()
+
+        with patch.object(
+            AgentInterface, "login_user_context", self.login
+        ), ThreadPoolExecutor(max_workers=callers) as pool:
+            return list(pool.map(call, range(callers)))
+
+    def test_single_login_for_concurrent_refreshes(self) -> None:
+        """Test that threads needing a token at once share one login"""
+        self.set_token("", None)
+        results = self.get_concurrently()
+
+        self.assertEqual(len(self.logins), 1)
+        self.assertEqual({ctx["token"] for ctx in results if ctx}, {"t1"})
+
+    def test_early_renewal_within_margin(self) -> None:
+        """Test that a token inside the refresh margin is renewed once, without waiting"""
+        self.set_token("old", AgentInterface.TOKEN_REFRESH_MARGIN // 2)
+        results = self.get_concurrently()
+
+        self.assertEqual(len(self.logins), 1)
+        # callers that found a refresh under way kept the still-valid token
+        self.assertTrue({ctx["token"] for ctx in results if ctx} <= {"old", "t1"})
+        self.assertEqual(AgentInterface.TOKEN, "t1")
+
+    def test_fresh_token_is_reused(self) -> None:
+        """Test that a token outside the refresh margin is used as is"""
+        self.set_token("current", AgentInterface.TOKEN_REFRESH_MARGIN + 600)
+        results = self.get_concurrently()
+
+        self.assertEqual(self.logins, [])
+        self.assertEqual({ctx["token"] for ctx in results if ctx}, {"current"})
+
+    def test_token_shared_through_file(self) -> None:
+        """Test that workers reuse a token another process stored in the cache file"""
+        cache_file = os.path.join(self.test_dir.name, "token.json")
+        os.environ["JIVAS_TOKEN_CACHE_FILE"] = cache_file
+        expiration = int(time.time()) + 3600
+        TokenCache(cache_file).write(
+            {"root_id": "r2", "token": "shared", "expiration": expiration}
+        )
+        self.set_token("", None)
+
+        results = self.get_concurrently()
+        self.assertEqual(self.logins, [])
+        self.assertEqual({ctx["token"] for ctx in results if ctx}, {"shared"})
+        self.assertEqual(AgentInterface.ROOT_ID, "r2")
+
+        # once the shared token is stale, one worker logs in and stores the new one
+        TokenCache(cache_file).write(
+            {"root_id": "r2", "token": "shared", "expiration": 1}
+        )
+        self.set_token("", None)
+        self.get_concurrently()
+        self.assertEqual(len(self.logins), 1)
+        cached = TokenCache(cache_file).read()
+        assert cached is not None
+        self.assertEqual(cached["token"], "t1")
+
+    def test_expire_token(self) -> None:
+        """Test that only the rejected token is expired, here and in the cache file"""
+        cache_file = os.path.join(self.test_dir.name, "token.json")
+        os.environ["JIVAS_TOKEN_CACHE_FILE"] = cache_file
+        self.set_token("t1", 3600)
+        TokenCache(cache_file).write(AgentInterface.current_user_context())
+
+        AgentInterface.expire_token("replaced")
+        self.assertIsNotNone(AgentInterface.EXPIRATION)
+        self.assertIsNotNone(TokenCache(cache_file).read())
+
+        AgentInterface.expire_token("t1")
+        self.assertIsNone(AgentInterface.EXPIRATION)
+        self.assertIsNone(TokenCache(cache_file).read())
+
+        with patch.object(AgentInterface, "login_user_context", self.login):
+            ctx = AgentInterface.get_user_context()
+        assert ctx is not None
+        self.assertEqual(ctx["token"], "t1")
+        self.assertEqual(len(self.logins), 1)
+
+
+class TestServiceIdentity(unittest.TestCase):
+    """Test cases for resolving the JIVAS service user in-process"""
+
+    LOGIN = {"user": {"root_id": "r1", "expiration": 123}, "token": "t1"}
+
+    def setUp(self) -> None:
+        """Set service credentials and keep the identity fields clean"""
+        self.env = patch.dict(
+            os.environ, {"JIVAS_USER": "svc@jivas.com", "JIVAS_PASSWORD": "pw"}
+        )
+        self.env.start()
+        self.saved = (
+            AgentInterface.ROOT_ID,
+            AgentInterface.TOKEN,
+            AgentInterface.EXPIRATION,
+        )
+
+    def tearDown(self) -> None:
+        """Restore the environment and identity fields"""
+        self.env.stop()
+        (
+            AgentInterface.ROOT_ID,
+            AgentInterface.TOKEN,
+            AgentInterface.EXPIRATION,
+        ) = self.saved
+
+    def patch_user_routes(self, *logins: ORJSONResponse) -> tuple:
+        """Patch jac-cloud's login to return logins in turn, and its register"""
+        login = patch(
+            "jac_cloud.jaseci.routers.user.login", side_effect=list(logins)
+        ).start()
+        register = patch("jac_cloud.jaseci.routers.user.register").start()
+        self.addCleanup(patch.stopall)
+        return login, register
+
+    def test_login(self) -> None:
+        """Test that an existing user is logged in without registering"""
+        login, register = self.patch_user_routes(ORJSONResponse(self.LOGIN))
+
+        identity = AgentInterface.get_service_identity("svc@jivas.com", "pw")
+
+        self.assertEqual(identity, {"root_id": "r1", "token": "t1", "expiration": 123})
+        self.assertEqual(AgentInterface.TOKEN, "t1")
+        self.assertEqual(login.call_args.args[0].email, "svc@jivas.com")
+        register.assert_not_called()
+
+    def test_register_then_login(self) -> None:
+        """Test that an unknown user is registered and logged in again"""
+        login, register = self.patch_user_routes(
+            ORJSONResponse({"error": "Invalid Email/Password!"}, status_code=400),
+            ORJSONResponse(self.LOGIN),
+        )
+
+        identity = AgentInterface.get_service_identity("svc@jivas.com", "pw")
+
+        self.assertEqual(identity["root_id"], "r1")
+        self.assertEqual(login.call_count, 2)
+        self.assertEqual(register.call_args.args[0].email, "svc@jivas.com")
+
+    def test_failed_login_returns_empty(self) -> None:
+        """Test that a login still failing after registration yields no identity"""
+        failed = ORJSONResponse({}, status_code=400)
+        self.patch_user_routes(failed, failed)
+        self.assertEqual(AgentInterface.get_service_identity("svc@jivas.com", "pw"), {})
+
+    def test_falls_back_to_http(self) -> None:
+        """Test that login_user_context uses HTTP when in-process login fails"""
+        login, _ = self.patch_user_routes()
+        login.side_effect = RuntimeError("no database")
+        http_response = MagicMock(status_code=200)
+        http_response.json.return_value = self.LOGIN
+
+        with patch("requests.post", return_value=http_response) as post:
+            ctx = AgentInterface.login_user_context()
+
+        self.assertEqual(ctx, {"root_id": "r1", "token": "t1", "expiration": 123})
+        login.assert_called_once()
+        self.assertTrue(post.call_args.args[0].endswith("/user/login"))
+
+
+if __name__ == "__main__":
+    unittest.main()
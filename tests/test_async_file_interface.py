@@ -0,0 +1,105 @@
+"""Tests for AsyncFileInterface class"""
+
+import asyncio
+import contextvars
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from jvserve.lib.file_interface import (
+    AsyncFileInterface,
+    LocalFileInterface,
+    async_file_interface,
+    file_interface,
+    get_file_interface,
+)
+
+REQUEST_ID: contextvars.ContextVar[str] = contextvars.ContextVar("request_id")
+
+
+class TestAsyncFileInterface(unittest.TestCase):
+    """Test cases for AsyncFileInterface"""
+
+    def setUp(self) -> None:
+        """Set up test environment"""
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.files = AsyncFileInterface(
+            LocalFileInterface(self.test_dir.name), max_threads=2
+        )
+
+    def tearDown(self) -> None:
+        """Clean up test environment"""
+        self.files.close()
+        self.test_dir.cleanup()
+
+    def test_operations(self) -> None:
+        """Test that every operation mirrors the wrapped interface"""
+
+        async def main() -> None:
+            self.assertTrue(await self.files.save_file("a.txt", b"abc"))
+            self.assertEqual(await self.files.get_file("a.txt"), b"abc")
+            self.assertTrue(await self.files.file_exists("a.txt"))
+            self.assertEqual(
+                await self.files.get_file_url("a.txt"),
+                "http://localhost:9000/files/a.txt",
+            )
+            self.assertTrue(await self.files.save_file_stream("b.txt", [b"x", b"y"]))
+
+            chunks = await self.files.get_file_stream("b.txt", chunk_size=1)
+            assert chunks is not None
+            self.assertEqual([chunk async for chunk in chunks], [b"x", b"y"])
+            self.assertIsNone(await self.files.get_file_stream("missing.txt"))
+
+            self.assertEqual(
+                await self.files.get_files(iter(["a.txt", "missing.txt"])),
+                {"a.txt": b"abc", "missing.txt": None},
+            )
+            self.assertEqual(
+                await self.files.save_files({"c.txt": b"c"}), {"c.txt": True}
+            )
+            self.assertTrue(await self.files.delete_file("a.txt"))
+            self.assertEqual(
+                await self.files.delete_files(["b.txt", "c.txt"]),
+                {"b.txt": True, "c.txt": True},
+            )
+            self.assertEqual(os.listdir(self.test_dir.name), [])
+
+        asyncio.run(main())
+
+    def test_runs_off_the_event_loop(self) -> None:
+        """Test that calls run on pool threads within the caller's context"""
+        seen = []
+
+        def probe() -> str:
+            seen.append(threading.current_thread().name)
+            return REQUEST_ID.get()
+
+        async def main() -> str:
+            REQUEST_ID.set("r1")
+            return await self.files.run(probe)
+
+        self.assertEqual(asyncio.run(main()), "r1")
+        self.assertTrue(seen[0].startswith("jivas-files"))
+
+    def test_get_file_interface(self) -> None:
+        """Test that get_file_interface selects the async variant on request"""
+        with patch.dict(os.environ, {"JIVAS_FILES_ASYNC_THREADS": "3"}):
+            files = get_file_interface(self.test_dir.name, asynchronous=True)
+        self.assertIsInstance(files, AsyncFileInterface)
+        self.assertIsInstance(files.interface, LocalFileInterface)
+        self.assertEqual(files.executor._max_workers, 3)
+        files.close()
+        self.assertIsInstance(
+            get_file_interface(self.test_dir.name), LocalFileInterface
+        )
+
+    def test_shared_instance(self) -> None:
+        """Test that the shared async interface wraps the shared backend"""
+        self.assertIsInstance(async_file_interface, AsyncFileInterface)
+        self.assertIs(async_file_interface.interface, file_interface)
+
+
+if __name__ == "__main__":
+    unittest.main()
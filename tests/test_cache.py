@@ -0,0 +1,59 @@
+"""Tests for LRUCache class"""
+
+from pytest_mock import MockerFixture
+
+from jvserve.lib.cache import LRUCache
+
+
+class TestLRUCache:
+    """Test LRUCache class"""
+
+    def test_get_and_set(self) -> None:
+        """Test basic storage and hit/miss accounting."""
+        cache = LRUCache(max_size=2)
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        assert cache.get("b", "default") == "default"
+        assert cache.stats() == {
+            "size": 1,
+            "max_size": 2,
+            "hits": 1,
+            "misses": 1,
+            "hit_ratio": 0.5,
+        }
+
+    def test_evicts_least_recently_used(self) -> None:
+        """Test that the least recently used entry is evicted first."""
+        cache = LRUCache(max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1 and cache.get("c") == 3
+        assert len(cache) == 2
+
+    def test_entries_expire_after_ttl(self, mocker: MockerFixture) -> None:
+        """Test cache-wide and per-entry TTLs."""
+        clock = mocker.patch("jvserve.lib.cache.time.monotonic", return_value=100.0)
+        cache = LRUCache(ttl=10)
+        cache.set("a", 1)
+        cache.set("b", 2, ttl=60)
+
+        clock.return_value = 111.0
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+        assert len(cache) == 1
+
+    def test_delete_and_clear(self) -> None:
+        """Test explicit invalidation."""
+        cache = LRUCache()
+        for key in [("agent", "x"), ("agent", "y"), ("other", "x")]:
+            cache.set(key, True)
+
+        cache.delete(("agent", "x"))
+        assert cache.get(("agent", "x")) is None
+        assert len(cache) == 2
+
+        cache.clear()
+        assert len(cache) == 0
@@ -0,0 +1,56 @@
+"""Tests for ConcurrencyLimiter class"""
+
+import asyncio
+
+import pytest
+
+from jvserve.lib.concurrency_limiter import ConcurrencyLimiter, ConcurrencyLimitError
+
+
+class TestConcurrencyLimiter:
+    """Test ConcurrencyLimiter class"""
+
+    def test_limits_concurrent_calls_per_key(self) -> None:
+        """Test that no more than limit calls for a key run at once."""
+        limiter = ConcurrencyLimiter(2)
+        peak = {"a": 0, "b": 0}
+
+        async def call(key: str) -> None:
+            async with limiter.acquire(key):
+                peak[key] = max(peak[key], limiter.active(key))
+                await asyncio.sleep(0.01)
+
+        async def main() -> None:
+            await asyncio.gather(*(call(key) for key in "aaaaab"))
+
+        asyncio.run(main())
+        assert peak == {"a": 2, "b": 1}
+        assert limiter.stats() == {"limit": 2, "active": {}, "rejected": 0}
+
+    def test_rejects_after_timeout(self) -> None:
+        """Test that a caller waiting longer than timeout is rejected."""
+        limiter = ConcurrencyLimiter(1)
+
+        async def main() -> None:
+            async with limiter.acquire("walker"):
+                with pytest.raises(ConcurrencyLimitError):
+                    async with limiter.acquire("walker", timeout=0.01):
+                        pass
+                # other keys are unaffected
+                async with limiter.acquire("other", timeout=0.01):
+                    pass
+
+        asyncio.run(main())
+        assert limiter.stats()["rejected"] == 1
+        assert limiter.active("walker") == 0
+
+    def test_zero_limit_is_unlimited(self) -> None:
+        """Test that a limit of 0 never blocks."""
+        limiter = ConcurrencyLimiter(0)
+
+        async def main() -> None:
+            async with limiter.acquire("a", timeout=0), limiter.acquire("a", timeout=0):
+                pass
+
+        asyncio.run(main())
+        assert limiter.stats()["rejected"] == 0
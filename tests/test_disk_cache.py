@@ -0,0 +1,120 @@
+"""Tests for DiskCache class"""
+
+import asyncio
+import os
+import tempfile
+import unittest
+from typing import AsyncIterator
+
+from jvserve.lib.disk_cache import DiskCache
+
+
+async def chunks(*parts: bytes) -> AsyncIterator[bytes]:
+    """Yield parts as an async stream."""
+    for part in parts:
+        yield part
+
+
+class TestDiskCache(unittest.TestCase):
+    """Test cases for DiskCache"""
+
+    def setUp(self) -> None:
+        """Set up test environment"""
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.test_dir.name, "cache")
+
+    def tearDown(self) -> None:
+        """Clean up test environment"""
+        self.test_dir.cleanup()
+
+    def test_store_and_get(self) -> None:
+        """Test that a stored object is readable with its metadata"""
+        cache = DiskCache(self.directory)
+        entry = asyncio.run(
+            cache.store("a/b.png", chunks(b"ab", b"cd"), {"etag": '"1"'})
+        )
+
+        assert entry is not None
+        self.assertEqual(cache.get("a/b.png"), entry)
+        self.assertEqual(entry["etag"], '"1"')
+        self.assertEqual(entry["size"], 4)
+        self.assertTrue(cache.is_fresh(entry))
+        with open(entry["path"], "rb") as f:
+            self.assertEqual(f.read(), b"abcd")
+        self.assertIsNone(cache.get("missing"))
+
+    def test_oversized_object_is_not_stored(self) -> None:
+        """Test that objects above max_object_size are skipped"""
+        cache = DiskCache(self.directory, max_object_size=3)
+        self.assertIsNone(asyncio.run(cache.store("big", chunks(b"ab", b"cd"), {})))
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_evicts_least_recently_used(self) -> None:
+        """Test that the least recently used object is evicted past max_size"""
+        cache = DiskCache(self.directory, max_size=8)
+
+        async def fill() -> None:
+            await cache.store("a", chunks(b"aaaa"), {})
+            await cache.store("b", chunks(b"bbbb"), {})
+            cache.get("a")
+            await cache.store("c", chunks(b"cccc"), {})
+
+        asyncio.run(fill())
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+        self.assertEqual(cache.stats()["size"], 8)
+        self.assertEqual(len(os.listdir(self.directory)), 4)
+
+    def test_survives_restart(self) -> None:
+        """Test that entries are reloaded, but must be revalidated"""
+        asyncio.run(DiskCache(self.directory).store("a", chunks(b"x"), {"etag": "e"}))
+
+        entry = DiskCache(self.directory).get("a")
+        assert entry is not None
+        self.assertEqual(entry["etag"], "e")
+        self.assertFalse(DiskCache(self.directory).is_fresh(entry))
+
+    def test_coalesces_concurrent_fills(self) -> None:
+        """Test that concurrent fills for one key share a single call"""
+        cache = DiskCache(self.directory)
+        calls = []
+
+        async def fill() -> str:
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "filled"
+
+        async def main() -> list:
+            return await asyncio.gather(*(cache.coalesce("a", fill) for _ in range(5)))
+
+        self.assertEqual(asyncio.run(main()), ["filled"] * 5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.stats()["coalesced"], 4)
+
+    def test_uncacheable_keys_expire(self) -> None:
+        """Test that keys marked uncacheable are bypassed until negative_ttl passes"""
+        cache = DiskCache(self.directory, negative_ttl=60)
+        self.assertFalse(cache.is_uncacheable("big"))
+        cache.mark_uncacheable("big")
+        self.assertTrue(cache.is_uncacheable("big"))
+        self.assertEqual(cache.stats()["bypassed"], 1)
+
+        expired = DiskCache(self.directory, negative_ttl=0)
+        expired.mark_uncacheable("big")
+        self.assertFalse(expired.is_uncacheable("big"))
+
+    def test_hit_ratio(self) -> None:
+        """Test hit ratio accounting"""
+        cache = DiskCache(self.directory)
+        cache.record(hit=False)
+        cache.record(hit=True)
+        cache.record(hit=True, revalidated=True)
+        cache.record(hit=True)
+        stats = cache.stats()
+        self.assertEqual(stats["hit_ratio"], 0.75)
+        self.assertEqual(stats["revalidated"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,6 @@
 """Tests for FileInterface classes"""
 
+import io
 import os
 import unittest
 from unittest.mock import MagicMock, patch
@@ -90,7 +91,339 @@ class TestFileInterface(unittest.TestCase):
         )
 
         mock_s3.generate_presigned_url.side_effect = Exception()
-        self.assertIsNone(interface.get_file_url(self.test_filename))
+        self.assertIsNone(interface.get_file_url("uncached.txt"))
+
+    @patch("boto3.client")
+    def test_s3_presigned_url_cache(self, mock_boto3_client: MagicMock) -> None:
+        """Test that presigned URLs are reused until the cache TTL passes"""
+        mock_s3 = MagicMock()
+        mock_boto3_client.return_value = mock_s3
+        mock_s3.generate_presigned_url.side_effect = ["https://url-1", "https://url-2"]
+
+        with patch.dict(os.environ, {"JIVAS_S3_URL_CACHE_FRACTION": "0.25"}):
+            interface = S3FileInterface(
+                bucket_name="test-bucket",
+                aws_access_key_id="test-key",
+                aws_secret_access_key="test-secret",  # pragma: allowlist secret
+                region_name="test-region",
+            )
+
+        assert interface.url_cache is not None
+        self.assertEqual(interface.url_cache.ttl, 900)
+        self.assertEqual(interface.get_file_url(self.test_filename), "https://url-1")
+        self.assertEqual(interface.get_file_url(self.test_filename), "https://url-1")
+        self.assertEqual(mock_s3.generate_presigned_url.call_count, 1)
+
+        # deleting the file drops its cached URL
+        interface.delete_file(self.test_filename)
+        self.assertEqual(interface.get_file_url(self.test_filename), "https://url-2")
+
+    @patch("boto3.client")
+    def test_s3_presigned_url_cache_disabled(
+        self, mock_boto3_client: MagicMock
+    ) -> None:
+        """Test that a fraction of 0 signs every request"""
+        mock_s3 = MagicMock()
+        mock_boto3_client.return_value = mock_s3
+        mock_s3.generate_presigned_url.return_value = "https://url"
+
+        with patch.dict(os.environ, {"JIVAS_S3_URL_CACHE_FRACTION": "0"}):
+            interface = S3FileInterface(
+                bucket_name="test-bucket",
+                aws_access_key_id="test-key",
+                aws_secret_access_key="test-secret",  # pragma: allowlist secret
+                region_name="test-region",
+            )
+
+        interface.get_file_url(self.test_filename)
+        interface.get_file_url(self.test_filename)
+        self.assertIsNone(interface.url_cache)
+        self.assertEqual(mock_s3.generate_presigned_url.call_count, 2)
+
+    def test_file_exists(self) -> None:
+        """Test file_exists on local storage and the base class default"""
+        interface = LocalFileInterface(self.test_root)
+        self.assertFalse(interface.file_exists(self.test_filename))
+        interface.save_file(self.test_filename, self.test_content)
+        self.assertTrue(interface.file_exists(self.test_filename))
+        self.assertTrue(FileInterface.file_exists(interface, self.test_filename))
+        self.assertFalse(FileInterface.file_exists(interface, "nonexistent.txt"))
+
+    def test_local_file_streams(self) -> None:
+        """Test streaming reads and writes on local storage"""
+        interface = LocalFileInterface(self.test_root)
+
+        self.assertTrue(
+            interface.save_file_stream(self.test_filename, iter([b"ab", b"", b"cde"]))
+        )
+        self.assertEqual(interface.get_file(self.test_filename), b"abcde")
+        stream = interface.get_file_stream(self.test_filename, chunk_size=2)
+        assert stream is not None
+        self.assertEqual(list(stream), [b"ab", b"cd", b"e"])
+        self.assertIsNone(interface.get_file_stream("nonexistent.txt"))
+
+        interface.save_file_stream(self.test_filename, io.BytesIO(self.test_content))
+        self.assertEqual(interface.get_file(self.test_filename), self.test_content)
+        self.assertEqual(os.listdir(self.test_root), [self.test_filename])
+
+        # base class defaults buffer through get_file and save_file
+        FileInterface.save_file_stream(interface, self.test_filename, [b"x", b"y"])
+        stream = FileInterface.get_file_stream(interface, self.test_filename, 1)
+        assert stream is not None
+        self.assertEqual(list(stream), [b"x", b"y"])
+
+    @patch("boto3.client")
+    def test_s3_file_streams(self, mock_boto3_client: MagicMock) -> None:
+        """Test S3 streaming reads chunk the body and writes use upload_fileobj"""
+        mock_s3 = MagicMock()
+        mock_boto3_client.return_value = mock_s3
+        interface = S3FileInterface(
+            bucket_name="test-bucket",
+            aws_access_key_id="test-key",
+            aws_secret_access_key="test-secret",  # pragma: allowlist secret
+            region_name="test-region",
+        )
+        file_key = os.path.join(".files", self.test_filename)
+
+        mock_body = MagicMock()
+        mock_body.iter_chunks.return_value = iter([b"ab", b"c"])
+        mock_s3.get_object.return_value = {"Body": mock_body}
+        stream = interface.get_file_stream(self.test_filename, chunk_size=2)
+        assert stream is not None
+        self.assertEqual(list(stream), [b"ab", b"c"])
+        mock_body.iter_chunks.assert_called_once_with(2)
+        mock_body.read.assert_not_called()
+
+        uploaded = []
+        mock_s3.upload_fileobj.side_effect = (
+            lambda f, bucket, key, **kw: uploaded.append((f.read(), bucket, key))
+        )
+        self.assertTrue(interface.save_file_stream(self.test_filename, [b"a", b"b"]))
+        self.assertEqual(uploaded, [(b"ab", "test-bucket", file_key)])
+
+        mock_s3.get_object.side_effect = Exception()
+        mock_s3.upload_fileobj.side_effect = Exception()
+        self.assertIsNone(interface.get_file_stream(self.test_filename))
+        self.assertFalse(interface.save_file_stream(self.test_filename, [b"a"]))
+
+    @patch("boto3.client")
+    def test_s3_multipart_upload(self, mock_boto3_client: MagicMock) -> None:
+        """Test that files at or above the threshold use a multipart upload"""
+        mock_s3 = MagicMock()
+        mock_boto3_client.return_value = mock_s3
+        env = {
+            "JIVAS_S3_MULTIPART_THRESHOLD": "8",
+            "JIVAS_S3_MULTIPART_PART_SIZE": str(5 * 1024 * 1024),
+            "JIVAS_S3_MAX_CONCURRENCY": "4",
+            "JIVAS_S3_MAX_ATTEMPTS": "3",
+        }
+        with patch.dict(os.environ, env):
+            interface = S3FileInterface(
+                bucket_name="test-bucket",
+                aws_access_key_id="test-key",
+                aws_secret_access_key="test-secret",  # pragma: allowlist secret
+                region_name="test-region",
+            )
+
+        config = mock_boto3_client.call_args.kwargs["config"]
+        self.assertEqual(config.retries, {"max_attempts": 3, "mode": "standard"})
+        self.assertEqual(interface.transfer_config.multipart_chunksize, 5 * 1024 * 1024)
+        self.assertEqual(interface.transfer_config.max_concurrency, 4)
+
+        self.assertTrue(interface.save_file(self.test_filename, b"small"))
+        mock_s3.put_object.assert_called_once()
+        mock_s3.upload_fileobj.assert_not_called()
+
+        self.assertTrue(interface.save_file(self.test_filename, b"large content"))
+        mock_s3.put_object.assert_called_once()
+        fileobj, bucket, key = mock_s3.upload_fileobj.call_args.args
+        self.assertEqual(fileobj.read(), b"large content")
+        self.assertEqual(key, os.path.join(".files", self.test_filename))
+        self.assertIs(
+            mock_s3.upload_fileobj.call_args.kwargs["Config"],
+            interface.transfer_config,
+        )
+
+        mock_s3.upload_fileobj.side_effect = Exception()
+        self.assertFalse(interface.save_file(self.test_filename, b"large content"))
+
+    @patch("boto3.client")
+    def test_s3_parallel_ranged_get(self, mock_boto3_client: MagicMock) -> None:
+        """Test that large objects are fetched as ranged GETs pinned to one ETag"""
+        mock_s3 = MagicMock()
+        mock_boto3_client.return_value = mock_s3
+        content = b"0123456789"
+        requests = []
+
+        def get_object(**params: str) -> dict:
+            requests.append(params)
+            start, end = map(int, params["Range"][6:].split("-"))
+            end = min(end, len(content) - 1)
+            body = MagicMock()
+            body.read.return_value = content[start : end + 1]
+            return {
+                "Body": body,
+                "ContentRange": f"bytes {start}-{end}/{len(content)}",
+                "ETag": '"v1"',
+            }
+
+        mock_s3.get_object.side_effect = get_object
+        with patch.dict(os.environ, {"JIVAS_S3_MULTIPART_PART_SIZE": "4"}):
+            interface = S3FileInterface(
+                bucket_name="test-bucket",
+                aws_access_key_id="test-key",
+                aws_secret_access_key="test-secret",  # pragma: allowlist secret
+                region_name="test-region",
+            )
+
+        self.assertEqual(interface.get_file(self.test_filename), content)
+        self.assertEqual(
+            sorted(params["Range"] for params in requests),
+            ["bytes=0-3", "bytes=4-7", "bytes=8-9"],
+        )
+        self.assertNotIn("IfMatch", requests[0])
+        self.assertTrue(all(params["IfMatch"] == '"v1"' for params in requests[1:]))
+
+        # a part that fails after botocore's retries fails the whole read
+        mock_s3.get_object.side_effect = [get_object(Range="bytes=0-3"), Exception()]
+        self.assertIsNone(interface.get_file(self.test_filename))
+
+    @patch("boto3.client")
+    def test_s3_get_empty_object(self, mock_boto3_client: MagicMock) -> None:
+        """Test that an empty object, which rejects ranges, is read with a plain GET"""
+        from botocore.exceptions import ClientError
+
+        mock_s3 = MagicMock()
+        mock_boto3_client.return_value = mock_s3
+        mock_body = MagicMock()
+        mock_body.read.return_value = b""
+        mock_s3.get_object.side_effect = [
+            ClientError({"Error": {"Code": "InvalidRange"}}, "GetObject"),
+            {"Body": mock_body},
+        ]
+        interface = S3FileInterface(
+            bucket_name="test-bucket",
+            aws_access_key_id="test-key",
+            aws_secret_access_key="test-secret",  # pragma: allowlist secret
+            region_name="test-region",
+        )
+
+        self.assertEqual(interface.get_file(self.test_filename), b"")
+        self.assertNotIn("Range", mock_s3.get_object.call_args.kwargs)
+
+    def test_local_batch_operations(self) -> None:
+        """Test batch operations report a result per file on local storage"""
+        interface = LocalFileInterface(self.test_root)
+        files = {f"file_{i}.txt": f"content {i}".encode() for i in range(20)}
+
+        self.assertEqual(interface.save_files(files), dict.fromkeys(files, True))
+        fetched = interface.get_files([*files, "nonexistent.txt"])
+        self.assertEqual(fetched, {**files, "nonexistent.txt": None})
+        self.assertEqual(list(fetched), [*files, "nonexistent.txt"])
+
+        urls = interface.get_file_urls(["file_0.txt", "nonexistent.txt"])
+        self.assertEqual(
+            urls,
+            {
+                "file_0.txt": "http://localhost:9000/files/file_0.txt",
+                "nonexistent.txt": None,
+            },
+        )
+
+        deleted = interface.delete_files(["file_0.txt", "file_0.txt", "missing.txt"])
+        self.assertEqual(deleted, {"file_0.txt": True, "missing.txt": False})
+        self.assertEqual(interface.delete_files([]), {})
+
+    def test_batch_reports_failing_items(self) -> None:
+        """Test that one failing item does not hide the results of the others"""
+        interface = LocalFileInterface(self.test_root)
+        directory = os.path.join(self.test_root, "adir")
+        os.makedirs(directory)
+        try:
+            saved = interface.save_files({"ok.txt": b"ok", "adir": b"x", "b.txt": b"b"})
+            fetched = interface.get_files(["ok.txt", "adir"])
+        finally:
+            os.rmdir(directory)
+
+        self.assertEqual(saved, {"ok.txt": True, "adir": False, "b.txt": True})
+        self.assertEqual(fetched, {"ok.txt": b"ok", "adir": None})
+
+    @patch("boto3.client")
+    def test_s3_batch_delete(self, mock_boto3_client: MagicMock) -> None:
+        """Test that S3 batch deletes use DeleteObjects in chunks of 1000 keys"""
+        mock_s3 = MagicMock()
+        mock_boto3_client.return_value = mock_s3
+        interface = S3FileInterface(
+            bucket_name="test-bucket",
+            aws_access_key_id="test-key",
+            aws_secret_access_key="test-secret",  # pragma: allowlist secret
+            region_name="test-region",
+        )
+        filenames = [f"file_{i}.txt" for i in range(2500)]
+        mock_s3.delete_objects.side_effect = [
+            {"Errors": [{"Key": os.path.join(".files", "file_1.txt")}]},
+            {},
+            Exception(),
+        ]
+
+        results = interface.delete_files(filenames)
+
+        chunks = [
+            len(call.kwargs["Delete"]["Objects"])
+            for call in mock_s3.delete_objects.call_args_list
+        ]
+        self.assertEqual(chunks, [1000, 1000, 500])
+        mock_s3.delete_object.assert_not_called()
+        self.assertTrue(results["file_0.txt"])
+        self.assertFalse(results["file_1.txt"])
+        self.assertTrue(results["file_1999.txt"])
+        self.assertFalse(results["file_2000.txt"])
+
+    @patch("boto3.client")
+    def test_s3_batch_get(self, mock_boto3_client: MagicMock) -> None:
+        """Test that S3 batch reads fetch each object and report misses as None"""
+        mock_s3 = MagicMock()
+        mock_boto3_client.return_value = mock_s3
+        interface = S3FileInterface(
+            bucket_name="test-bucket",
+            aws_access_key_id="test-key",
+            aws_secret_access_key="test-secret",  # pragma: allowlist secret
+            region_name="test-region",
+        )
+
+        def get_object(Key: str, **params: str) -> dict:  # noqa: N803
+            if Key.endswith("missing.txt"):
+                raise Exception()
+            body = MagicMock()
+            body.read.return_value = Key.encode()
+            return {"Body": body}
+
+        mock_s3.get_object.side_effect = get_object
+        self.assertEqual(
+            interface.get_files(["a.txt", "missing.txt"]),
+            {"a.txt": os.path.join(".files", "a.txt").encode(), "missing.txt": None},
+        )
+
+    @patch("boto3.client")
+    def test_s3_file_exists(self, mock_boto3_client: MagicMock) -> None:
+        """Test S3FileInterface.file_exists uses a HEAD request"""
+        mock_s3 = MagicMock()
+        mock_boto3_client.return_value = mock_s3
+        interface = S3FileInterface(
+            bucket_name="test-bucket",
+            aws_access_key_id="test-key",
+            aws_secret_access_key="test-secret",  # pragma: allowlist secret
+            region_name="test-region",
+        )
+
+        self.assertTrue(interface.file_exists(self.test_filename))
+        mock_s3.head_object.assert_called_once_with(
+            Bucket="test-bucket", Key=os.path.join(".files", self.test_filename)
+        )
+        mock_s3.get_object.assert_not_called()
+
+        mock_s3.head_object.side_effect = Exception()
+        self.assertFalse(interface.file_exists(self.test_filename))
 
     @patch("boto3.client")
     def test_s3_file_interface_missing_credentials(
@@ -0,0 +1,252 @@
+"""Tests for FileProxy class"""
+
+import asyncio
+from pathlib import Path
+from typing import AsyncIterator, Iterator
+
+import httpx
+import pytest
+from fastapi import HTTPException
+from fastapi.responses import Response, StreamingResponse
+from pytest_mock import MockerFixture
+
+from jvserve.lib.file_proxy import FileProxy
+
+ETAG = '"abc"'
+
+
+class UpstreamStream(httpx.AsyncByteStream):
+    """Response body that is streamed rather than preloaded, like a real upstream."""
+
+    def __init__(self, body: bytes) -> None:
+        """Initialize with the body to stream."""
+        self.body = body
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        """Yield the body in 16 KB pieces."""
+        for i in range(0, len(self.body), 16 * 1024):
+            yield self.body[i : i + 16 * 1024]
+
+
+class TestFileProxy:
+    """Test FileProxy class"""
+
+    @pytest.fixture(autouse=True)
+    def upstream(self, mocker: MockerFixture) -> Iterator[list]:
+        """Route the shared client to an in-memory upstream and serve from s3."""
+        requests: list = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            path = request.url.path
+            if path.endswith("missing.txt"):
+                return httpx.Response(404)
+            if request.headers.get("if-none-match") == ETAG:
+                return httpx.Response(304, headers={"ETag": ETAG})
+            if request.headers.get("range") == "bytes=0-3":
+                return httpx.Response(
+                    206,
+                    stream=UpstreamStream(b"file"),
+                    headers={
+                        "Content-Range": "bytes 0-3/9",
+                        "Content-Length": "4",
+                        "ETag": ETAG,
+                    },
+                )
+            if path.endswith("large.bin"):
+                return httpx.Response(200, stream=UpstreamStream(b"x" * (300 * 1024)))
+            if path.endswith("noext"):
+                return httpx.Response(
+                    200,
+                    stream=UpstreamStream(b"{}"),
+                    headers={"Content-Type": "application/json"},
+                )
+            return httpx.Response(
+                200, stream=UpstreamStream(b"file-body"), headers={"ETag": ETAG}
+            )
+
+        FileProxy.CLIENT = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        mocker.patch("jvserve.lib.file_proxy.FILE_INTERFACE", "s3")
+        file_interface = mocker.patch("jvserve.lib.file_proxy.file_interface")
+        file_interface.get_file_url.side_effect = (
+            lambda path: f"https://bucket.example.com/{path}"
+        )
+        yield requests
+        FileProxy.CLIENT = None
+
+    @staticmethod
+    async def read(response: Response) -> bytes:
+        """Drain a streaming response and run its background task."""
+        assert isinstance(response, StreamingResponse)
+        body = b"".join(
+            [
+                chunk.encode() if isinstance(chunk, str) else chunk
+                async for chunk in response.body_iterator
+            ]
+        )
+        if response.background:
+            await response.background()
+        return body
+
+    def test_serve_streams_upstream_body(self, upstream: list) -> None:
+        """Test that the upstream body is streamed with the expected media type."""
+
+        async def main() -> tuple:
+            pdf = await FileProxy.serve("docs/report.pdf")
+            blob = await FileProxy.serve("media/clip.bin")
+            return pdf.media_type, await self.read(pdf), blob.media_type
+
+        assert asyncio.run(main()) == (
+            "application/pdf",
+            b"file-body",
+            "application/octet-stream",
+        )
+        assert str(upstream[0].url) == "https://bucket.example.com/docs/report.pdf"
+
+    def test_media_type_for_any_extension(self) -> None:
+        """Test that every known extension keeps its media type."""
+        assert FileProxy.guess_media_type("a/clip.mp4") == "video/mp4"
+        assert FileProxy.guess_media_type("a/photo.WEBP") == "image/webp"
+        assert FileProxy.guess_media_type("a/data.jsonl") == "application/jsonl"
+        assert FileProxy.guess_media_type("a/unknown.zzz") is None
+
+    def test_serve_falls_back_to_upstream_media_type(self) -> None:
+        """Test that the upstream type is used when the extension is unknown."""
+        response = asyncio.run(FileProxy.serve("files/noext"))
+        assert response.media_type == "application/json"
+
+    def test_serve_streams_in_configured_chunks(self, mocker: MockerFixture) -> None:
+        """Test that bodies are streamed in chunks of the configured size."""
+        mocker.patch.dict("os.environ", {"JIVAS_PROXY_CHUNK_SIZE": str(100 * 1024)})
+
+        async def main() -> list:
+            response = await FileProxy.serve("media/large.bin")
+            assert isinstance(response, StreamingResponse)
+            chunks = [len(chunk) async for chunk in response.body_iterator]
+            if response.background:
+                await response.background()
+            return chunks
+
+        assert asyncio.run(main()) == [100 * 1024] * 3
+
+    def test_chunk_size_is_clamped(self, mocker: MockerFixture) -> None:
+        """Test that the chunk size stays within 64 KB and 1 MB."""
+        mocker.patch.dict("os.environ", {"JIVAS_PROXY_CHUNK_SIZE": "1024"})
+        assert FileProxy.chunk_size() == 64 * 1024
+        mocker.patch.dict("os.environ", {"JIVAS_PROXY_CHUNK_SIZE": str(8 << 20)})
+        assert FileProxy.chunk_size() == 1024 * 1024
+
+    def test_serve_relays_ranges(self, upstream: list) -> None:
+        """Test that a Range request is relayed and answered with partial content."""
+
+        async def main() -> tuple:
+            response = await FileProxy.serve(
+                "docs/report.pdf", {"range": "bytes=0-3", "cookie": "secret"}
+            )
+            return response, await self.read(response)
+
+        response, body = asyncio.run(main())
+        assert upstream[0].headers["range"] == "bytes=0-3"
+        assert "cookie" not in upstream[0].headers
+        assert response.status_code == 206
+        assert body == b"file"
+        assert response.headers["content-range"] == "bytes 0-3/9"
+        assert response.headers["etag"] == ETAG
+
+    def test_serve_relays_not_modified(self) -> None:
+        """Test that upstream revalidation answers 304 without a body."""
+        response = asyncio.run(
+            FileProxy.serve("docs/report.pdf", {"if-none-match": ETAG})
+        )
+        assert response.status_code == 304
+        assert response.headers["etag"] == ETAG
+        assert response.body == b""
+
+    def test_serve_from_disk_cache(
+        self, upstream: list, mocker: MockerFixture, tmp_path: Path
+    ) -> None:
+        """Test that objects are cached on disk and revalidated by ETag."""
+        mocker.patch.dict(
+            "os.environ",
+            {"JIVAS_PROXY_CACHE_DIR": str(tmp_path), "JIVAS_PROXY_CACHE_TTL": "0"},
+        )
+        FileProxy.CACHE = None
+
+        async def main() -> list:
+            bodies = []
+            for headers in ({}, {}, {"range": "bytes=5-8"}):
+                response = await FileProxy.serve("docs/report.pdf", headers)
+                bodies.append((response.status_code, response.headers.get("etag")))
+            return bodies
+
+        try:
+            results = asyncio.run(main())
+            assert FileProxy.CACHE is not None
+            stats = FileProxy.CACHE.stats()
+        finally:
+            FileProxy.CACHE = None
+
+        assert results == [(200, ETAG), (200, ETAG), (206, ETAG)]
+        # later requests only revalidate the cached copy
+        assert "if-none-match" not in upstream[0].headers
+        assert upstream[1].headers["if-none-match"] == ETAG
+        assert stats["misses"] == 1
+        assert stats["revalidated"] == 2
+
+    def test_uncacheable_objects_skip_the_fill(
+        self, upstream: list, mocker: MockerFixture, tmp_path: Path
+    ) -> None:
+        """Test that an object too large to cache costs one upstream GET after the first."""
+        mocker.patch.dict(
+            "os.environ",
+            {
+                "JIVAS_PROXY_CACHE_DIR": str(tmp_path),
+                "JIVAS_PROXY_CACHE_MAX_OBJECT_SIZE": "1024",
+            },
+        )
+        FileProxy.CACHE = None
+
+        async def main() -> list:
+            statuses = []
+            for headers in ({}, {}, {"range": "bytes=0-3"}):
+                response = await FileProxy.serve("video/large.bin", headers)
+                if isinstance(response, StreamingResponse):
+                    await self.read(response)
+                statuses.append(response.status_code)
+            return statuses
+
+        try:
+            statuses = asyncio.run(main())
+            assert FileProxy.CACHE is not None
+            stats = FileProxy.CACHE.stats()
+        finally:
+            FileProxy.CACHE = None
+
+        assert statuses == [200, 200, 206]
+        # the first request tries a fill, later ones go straight upstream
+        assert len(upstream) == 4
+        assert upstream[-1].headers["range"] == "bytes=0-3"
+        assert stats["bypassed"] == 2
+        assert stats["entries"] == 0
+
+    def test_serve_missing_file(self) -> None:
+        """Test that an upstream 404 is reported as a 404."""
+        with pytest.raises(HTTPException) as e:
+            asyncio.run(FileProxy.serve("missing.txt"))
+        assert e.value.status_code == 404
+
+    def test_serve_rejects_loopback_urls(self, mocker: MockerFixture) -> None:
+        """Test that loopback URLs are refused to avoid proxying to ourselves."""
+        file_interface = mocker.patch("jvserve.lib.file_proxy.file_interface")
+        file_interface.get_file_url.return_value = "http://localhost:9000/files/a"
+        with pytest.raises(HTTPException) as e:
+            asyncio.run(FileProxy.serve("a"))
+        assert e.value.status_code == 500
+
+    def test_client_is_shared(self) -> None:
+        """Test that the client is reused until closed."""
+        FileProxy.CLIENT = None
+        client = FileProxy.get_client()
+        assert FileProxy.get_client() is client
+        asyncio.run(FileProxy.close())
+        assert FileProxy.CLIENT is None
@@ -0,0 +1,150 @@
+"""Tests for ModuleRegistry class"""
+
+import dataclasses
+import types
+
+import pytest
+
+from jvserve.lib.module_registry import AmbiguousModuleError, ModuleRegistry
+
+MODULES = [
+    "__main__",
+    "jivas.agent.action.interact",
+    "jivas.agent.action.pulse",
+    "actions.jivas.pulse",
+    "jivas.agent.memory.update_interaction",
+]
+
+
+class TestModuleRegistry:
+    """Test ModuleRegistry class"""
+
+    def setup_method(self) -> None:
+        """Start each test with an empty index."""
+        ModuleRegistry.invalidate()
+
+    def test_resolve_by_suffix(self) -> None:
+        """Test that dotted suffixes resolve to the full module name."""
+        assert (
+            ModuleRegistry.resolve("action.interact", MODULES)
+            == "jivas.agent.action.interact"
+        )
+        assert (
+            ModuleRegistry.resolve("update_interaction", MODULES)
+            == "jivas.agent.memory.update_interaction"
+        )
+
+    def test_resolve_exact_name_wins(self) -> None:
+        """Test that a full module name resolves to itself."""
+        assert ModuleRegistry.resolve("__main__", MODULES) == "__main__"
+        assert (
+            ModuleRegistry.resolve("jivas.agent.action.pulse", MODULES)
+            == "jivas.agent.action.pulse"
+        )
+
+    def test_resolve_unknown_returns_name(self) -> None:
+        """Test that unknown modules are passed through unchanged."""
+        assert ModuleRegistry.resolve("agent.action.missing", MODULES) == (
+            "agent.action.missing"
+        )
+        # suffixes match whole segments only
+        assert ModuleRegistry.resolve("teraction", MODULES) == "teraction"
+
+    def test_resolve_ambiguous_suffix_raises(self) -> None:
+        """Test that a suffix shared by several modules is reported."""
+        with pytest.raises(AmbiguousModuleError, match="actions.jivas.pulse"):
+            ModuleRegistry.resolve("pulse", MODULES)
+
+    def test_index_rebuilt_when_modules_loaded(self) -> None:
+        """Test that newly loaded modules are picked up."""
+        assert ModuleRegistry.resolve("greet", MODULES) == "greet"
+        modules = [*MODULES, "actions.hello.greet"]
+        assert ModuleRegistry.resolve("greet", modules) == "actions.hello.greet"
+
+
+class BaseWalker:
+    """Stand-in for WalkerArchitype."""
+
+
+@dataclasses.dataclass
+class Greet(BaseWalker):
+    """Stand-in walker with attributes."""
+
+    name: str = ""
+    reporting: bool = False
+
+
+class TestArchitypeCache:
+    """Test architype caching in ModuleRegistry"""
+
+    def setup_method(self) -> None:
+        """Start each test with an empty cache."""
+        ModuleRegistry.invalidate()
+        ModuleRegistry.HITS = ModuleRegistry.MISSES = 0
+        self.module = types.ModuleType("actions.hello.greet")
+        self.module.Greet = Greet  # type: ignore[attr-defined]
+        self.modules = {"actions.hello.greet": self.module}
+
+    def test_spawn_caches_architype(self) -> None:
+        """Test that repeat spawns hit the cache."""
+        for name in ("a", "b"):
+            walker = ModuleRegistry.spawn(
+                "actions.hello.greet", "Greet", {"name": name}, self.modules, BaseWalker
+            )
+            assert isinstance(walker, Greet) and walker.name == name
+
+        stats = ModuleRegistry.stats()
+        assert (stats["hits"], stats["misses"]) == (1, 1)
+
+    def test_spawn_rejects_unknown_attributes(self) -> None:
+        """Test that attributes are validated against the architype fields."""
+        with pytest.raises(ValueError, match="has no attribute\\(s\\) colour"):
+            ModuleRegistry.spawn(
+                "actions.hello.greet",
+                "Greet",
+                {"name": "a", "colour": "red"},
+                self.modules,
+                BaseWalker,
+            )
+
+    def test_spawn_missing_or_wrong_type(self) -> None:
+        """Test that missing architypes and wrong base classes are reported."""
+        with pytest.raises(ValueError, match="BaseWalker Wave not found"):
+            ModuleRegistry.spawn(
+                "actions.hello.greet", "Wave", {}, self.modules, BaseWalker
+            )
+        with pytest.raises(ValueError, match="not found"):
+            ModuleRegistry.spawn("actions.hello.greet", "Greet", {}, self.modules, int)
+
+    def test_spawn_reloaded_module_misses_cache(self) -> None:
+        """Test that a replaced module object is not served from the cache."""
+        ModuleRegistry.spawn(
+            "actions.hello.greet", "Greet", {}, self.modules, BaseWalker
+        )
+        reloaded = types.ModuleType("actions.hello.greet")
+        reloaded.Greet = Greet  # type: ignore[attr-defined]
+        ModuleRegistry.spawn(
+            "actions.hello.greet",
+            "Greet",
+            {},
+            {"actions.hello.greet": reloaded},
+            BaseWalker,
+        )
+        assert ModuleRegistry.stats()["misses"] == 2
+
+    def test_spawn_updated_architype_misses_cache(self) -> None:
+        """Test that a class rebound on the same module is not served from the cache."""
+        ModuleRegistry.spawn(
+            "actions.hello.greet", "Greet", {}, self.modules, BaseWalker
+        )
+
+        @dataclasses.dataclass
+        class Greet2(BaseWalker):
+            name: str = ""
+
+        self.module.Greet = Greet2  # type: ignore[attr-defined]
+        walker = ModuleRegistry.spawn(
+            "actions.hello.greet", "Greet", {}, self.modules, BaseWalker
+        )
+        assert isinstance(walker, Greet2)
+        assert ModuleRegistry.stats()["misses"] == 2
@@ -0,0 +1,93 @@
+"""Tests for Range and conditional request support on local files"""
+
+import os
+import tempfile
+import unittest
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from jvserve.lib.range_files import RangeFileResponder, RangeStaticFiles
+
+
+class TestRangeFileResponder(unittest.TestCase):
+    """Test cases for RangeFileResponder and RangeStaticFiles"""
+
+    def setUp(self) -> None:
+        """Set up test environment"""
+        self.test_dir = tempfile.TemporaryDirectory()
+        with open(os.path.join(self.test_dir.name, "clip.mp3"), "wb") as f:
+            f.write(b"0123456789")
+        app = FastAPI()
+        app.mount("/files", RangeStaticFiles(directory=self.test_dir.name))
+        self.client = TestClient(app)
+
+    def tearDown(self) -> None:
+        """Clean up test environment"""
+        self.test_dir.cleanup()
+
+    def test_parse_range(self) -> None:
+        """Test single byte range parsing against a 10 byte file"""
+        parse = RangeFileResponder.parse_range
+        self.assertEqual(parse("bytes=0-3", 10), (0, 3))
+        self.assertEqual(parse("bytes=5-", 10), (5, 9))
+        self.assertEqual(parse("bytes=-4", 10), (6, 9))
+        self.assertEqual(parse("bytes=8-100", 10), (8, 9))
+        self.assertEqual(parse("bytes=-100", 10), (0, 9))
+        self.assertIsNone(parse("bytes=0-1,4-5", 10))
+        self.assertIsNone(parse("items=0-1", 10))
+        self.assertIsNone(parse("bytes=a-b", 10))
+        self.assertIsNone(parse("bytes=5-2", 10))
+        with self.assertRaises(ValueError):
+            parse("bytes=10-", 10)
+        with self.assertRaises(ValueError):
+            parse("bytes=-0", 10)
+
+    def test_partial_content(self) -> None:
+        """Test that a Range request returns 206 with the requested bytes"""
+        response = self.client.get("/files/clip.mp3", headers={"Range": "bytes=2-5"})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.content, b"2345")
+        self.assertEqual(response.headers["content-range"], "bytes 2-5/10")
+        self.assertEqual(response.headers["content-length"], "4")
+        self.assertEqual(response.headers["content-type"], "audio/mpeg")
+
+    def test_unsatisfiable_range(self) -> None:
+        """Test that a range past the end of the file returns 416"""
+        response = self.client.get("/files/clip.mp3", headers={"Range": "bytes=20-"})
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response.headers["content-range"], "bytes */10")
+
+    def test_if_range_mismatch_returns_full_file(self) -> None:
+        """Test that a stale If-Range validator yields the whole file"""
+        response = self.client.get(
+            "/files/clip.mp3", headers={"Range": "bytes=2-5", "If-Range": '"stale"'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b"0123456789")
+
+    def test_conditional_requests(self) -> None:
+        """Test revalidation with ETag and Last-Modified"""
+        response = self.client.get("/files/clip.mp3")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["accept-ranges"], "bytes")
+        etag = response.headers["etag"]
+        last_modified = response.headers["last-modified"]
+
+        for headers in (
+            {"If-None-Match": etag},
+            {"If-Modified-Since": last_modified},
+            {"If-None-Match": etag, "Range": "bytes=0-1"},
+        ):
+            response = self.client.get("/files/clip.mp3", headers=headers)
+            self.assertEqual(response.status_code, 304, headers)
+
+        partial = RangeFileResponder.respond(
+            os.path.join(self.test_dir.name, "clip.mp3"),
+            {"range": "bytes=0-1", "if-range": etag},
+        )
+        self.assertEqual(partial.status_code, 206)
+
+
+if __name__ == "__main__":
+    unittest.main()
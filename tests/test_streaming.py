@@ -0,0 +1,131 @@
+"""Tests for streaming helpers"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Iterator
+
+import pytest
+from pytest_mock import MockerFixture
+
+from jvserve.lib.streaming import FlushPolicy, coalesce_chunks, iterate_in_thread
+
+
+def slow_chunks(contents: list[str], delay: float = 0.0) -> Iterator[SimpleNamespace]:
+    """Blocking generator of chunks, sleeping before each one."""
+    for content in contents:
+        time.sleep(delay)
+        yield SimpleNamespace(content=content)
+
+
+def collect_frames(
+    contents: list[str], policy: FlushPolicy, delay: float = 0.0
+) -> list[list[str]]:
+    """Run chunks with the given contents through coalesce_chunks."""
+
+    async def main() -> list[list[str]]:
+        frames: list[list[str]] = []
+        source: AsyncIterator[Any] = iterate_in_thread(slow_chunks(contents, delay))
+        async for frame in coalesce_chunks(source, policy):
+            frames.append([chunk.content for chunk in frame])
+        return frames
+
+    return asyncio.run(main())
+
+
+class TestStreaming:
+    """Test streaming helpers"""
+
+    def test_immediate_policy_yields_every_chunk(self) -> None:
+        """Test that the default policy sends each chunk as its own frame."""
+        frames = collect_frames(["a", "b", "c"], FlushPolicy())
+        assert frames == [["a"], ["b"], ["c"]]
+
+    def test_byte_budget_coalesces_chunks(self) -> None:
+        """Test that chunks are grouped until the byte budget is reached."""
+        frames = collect_frames(["ab", "cd", "e", "fgh", "i"], FlushPolicy(max_bytes=4))
+        assert frames == [["ab", "cd"], ["e", "fgh"], ["i"]]
+
+    def test_time_budget_flushes_slow_frames(self) -> None:
+        """Test that a frame is due once its time budget has elapsed."""
+        policy = FlushPolicy(max_bytes=100, max_delay=0.1)
+        assert not policy.should_flush(size=10, started=1.0, now=1.05)
+        assert policy.should_flush(size=10, started=1.0, now=1.1)
+        assert policy.should_flush(size=100, started=1.0, now=1.0)
+
+    def test_time_budget_flushes_while_upstream_waits(self) -> None:
+        """Test that a pending frame is sent before a slow next chunk arrives."""
+        frames = collect_frames(
+            ["a", "b"], FlushPolicy(max_bytes=100, max_delay=0.02), delay=0.1
+        )
+        assert frames == [["a"], ["b"]]
+
+    def test_iterate_in_thread_keeps_event_loop_free(self) -> None:
+        """Test that a blocking generator does not stall other coroutines."""
+        ticks: list[float] = []
+
+        async def ticker() -> None:
+            for _ in range(5):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.01)
+
+        async def main() -> list[str]:
+            task = asyncio.ensure_future(ticker())
+            items = [
+                chunk.content
+                async for chunk in iterate_in_thread(slow_chunks(["a", "b"], 0.05))
+            ]
+            await task
+            return items
+
+        assert asyncio.run(main()) == ["a", "b"]
+        assert len(ticks) == 5 and ticks[-1] - ticks[0] < 0.09
+
+    def test_iterate_in_thread_applies_backpressure(self) -> None:
+        """Test that the worker stops pulling once the buffer is full."""
+        pulled: list[int] = []
+
+        def numbers() -> Iterator[int]:
+            for number in range(10):
+                pulled.append(number)
+                yield number
+
+        async def main() -> None:
+            source = iterate_in_thread(numbers(), maxsize=2)
+            assert await anext(source) == 0
+            await asyncio.sleep(0.1)
+            assert len(pulled) <= 4
+            await source.aclose()
+
+        asyncio.run(main())
+
+    def test_iterate_in_thread_reraises_errors(self) -> None:
+        """Test that exceptions raised by the generator reach the consumer."""
+
+        def broken() -> Iterator[int]:
+            yield 1
+            raise ValueError("upstream failed")
+
+        async def main() -> list[int]:
+            return [item async for item in iterate_in_thread(broken())]
+
+        with pytest.raises(ValueError, match="upstream failed"):
+            asyncio.run(main())
+
+    def test_for_channel_reads_configured_policy(self, mocker: MockerFixture) -> None:
+        """Test that policies are resolved per channel with a default fallback."""
+        mocker.patch.dict(
+            "os.environ",
+            {
+                "JIVAS_STREAM_FLUSH_POLICY": '{"default": {"max_bytes": 64}, '
+                '"whatsapp": {"max_bytes": 512, "max_delay_ms": 250}}'
+            },
+        )
+        whatsapp = FlushPolicy.for_channel("whatsapp")
+        assert (whatsapp.max_bytes, whatsapp.max_delay) == (512, 0.25)
+        assert FlushPolicy.for_channel("web").max_bytes == 64
+
+    def test_for_channel_ignores_invalid_config(self, mocker: MockerFixture) -> None:
+        """Test that malformed configuration falls back to immediate flushing."""
+        mocker.patch.dict("os.environ", {"JIVAS_STREAM_FLUSH_POLICY": "{not json"})
+        assert FlushPolicy.for_channel("web").immediate
@@ -0,0 +1,72 @@
+"""Tests for TokenCache class"""
+
+import os
+import tempfile
+import time
+import unittest
+
+from jvserve.lib.token_cache import TokenCache
+
+
+class TestTokenCache(unittest.TestCase):
+    """Test cases for TokenCache"""
+
+    def setUp(self) -> None:
+        """Set up test environment"""
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.test_dir.name, "jivas", "token.json")
+        self.ctx = {
+            "root_id": "root-1",
+            "token": "token-1",
+            "expiration": int(time.time()) + 3600,
+        }
+
+    def tearDown(self) -> None:
+        """Clean up test environment"""
+        self.test_dir.cleanup()
+
+    def test_is_fresh(self) -> None:
+        """Test token freshness with and without a renewal margin"""
+        self.assertTrue(TokenCache.is_fresh(self.ctx))
+        self.assertFalse(TokenCache.is_fresh(self.ctx, margin=7200))
+        self.assertFalse(TokenCache.is_fresh({**self.ctx, "token": ""}))
+        self.assertFalse(TokenCache.is_fresh({**self.ctx, "expiration": None}))
+        self.assertFalse(TokenCache.is_fresh(None))
+
+    def test_write_and_read(self) -> None:
+        """Test that a written context is read back by another cache instance"""
+        TokenCache(self.path).write({**self.ctx, "extra": "ignored"})
+        self.assertEqual(TokenCache(self.path).read(), self.ctx)
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o600)
+
+    def test_read_missing_or_corrupt(self) -> None:
+        """Test that absent or unreadable caches read as None"""
+        cache = TokenCache(self.path)
+        self.assertIsNone(cache.read())
+
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "w") as f:
+            f.write("{not json")
+        self.assertIsNone(cache.read())
+
+    def test_clear_only_matching_token(self) -> None:
+        """Test that clearing leaves a newer token in place"""
+        cache = TokenCache(self.path)
+        cache.write(self.ctx)
+
+        cache.clear("stale-token")
+        self.assertEqual(cache.read(), self.ctx)
+
+        cache.clear("token-1")
+        self.assertIsNone(cache.read())
+
+    def test_lock_can_be_reacquired(self) -> None:
+        """Test that the lock can be taken again once released"""
+        with TokenCache(self.path).lock():
+            pass
+        with TokenCache(self.path).lock():
+            self.assertTrue(os.path.exists(f"{self.path}.lock"))
+
+
+if __name__ == "__main__":
+    unittest.main()
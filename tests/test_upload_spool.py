@@ -0,0 +1,161 @@
+"""Tests for UploadSpool class"""
+
+import hashlib
+import io
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List
+
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+
+from jvserve.lib.file_interface import LocalFileInterface
+from jvserve.lib.upload_spool import (
+    UploadLimitMiddleware,
+    UploadSpool,
+    UploadTooLargeError,
+)
+
+
+class TestUploadSpool(unittest.TestCase):
+    """Test cases for UploadSpool"""
+
+    def setUp(self) -> None:
+        """Set up test environment"""
+        self.test_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        """Clean up test environment"""
+        self.test_dir.cleanup()
+
+    def test_add_spools_to_disk(self) -> None:
+        """Test that attachments are copied to disk in chunks"""
+        with UploadSpool(
+            chunk_size=3, inline_threshold=4, directory=self.test_dir.name
+        ) as spool:
+            small = spool.add("a.txt", "text/plain", io.BytesIO(b"abcd"))
+            large = spool.add("b.pdf", "application/pdf", io.BytesIO(b"0123456789"))
+
+            self.assertEqual(small["content"], b"abcd")
+            self.assertEqual(small["size"], 4)
+            self.assertEqual(small["sha256"], hashlib.sha256(b"abcd").hexdigest())
+            self.assertIsNone(large["content"])
+            self.assertEqual(large["type"], "application/pdf")
+            self.assertTrue(large["path"].endswith(".pdf"))
+            with open(large["path"], "rb") as f:
+                self.assertEqual(f.read(), b"0123456789")
+
+        self.assertFalse(os.path.exists(small["path"]))
+        self.assertFalse(os.path.exists(large["path"]))
+
+    def test_max_file_size(self) -> None:
+        """Test that an attachment over the per-file limit is rejected"""
+        with UploadSpool(
+            max_file_size=5, chunk_size=2, directory=self.test_dir.name
+        ) as spool:
+            spool.add("ok.bin", None, io.BytesIO(b"12345"))
+            with self.assertRaises(UploadTooLargeError):
+                spool.add("big.bin", None, io.BytesIO(b"123456"))
+        self.assertEqual(os.listdir(self.test_dir.name), [])
+
+    def test_max_total_size(self) -> None:
+        """Test that attachments over the combined limit are rejected"""
+        with UploadSpool(max_total_size=6, directory=self.test_dir.name) as spool:
+            spool.add("a.bin", None, io.BytesIO(b"1234"))
+            with self.assertRaises(UploadTooLargeError):
+                spool.add("b.bin", None, io.BytesIO(b"1234"))
+
+    def test_concurrent_add(self) -> None:
+        """Test that attachments spooled from several threads share the total limit"""
+        with UploadSpool(max_total_size=25, directory=self.test_dir.name) as spool:
+            with ThreadPoolExecutor(max_workers=3) as pool:
+                results = list(
+                    pool.map(
+                        lambda n: spool.add(f"{n}.bin", None, io.BytesIO(b"x" * 10)),
+                        range(2),
+                    )
+                )
+            self.assertEqual(spool.total_size, 20)
+            self.assertEqual(len({result["path"] for result in results}), 2)
+            with self.assertRaises(UploadTooLargeError):
+                spool.add("c.bin", None, io.BytesIO(b"x" * 10))
+
+    def test_store_deduplicates_by_content(self) -> None:
+        """Test that identical attachments are stored once under their hash"""
+        store_root = os.path.join(self.test_dir.name, "store")
+        store = LocalFileInterface(store_root)
+        spool_dir = os.path.join(self.test_dir.name, "spool")
+        content_id = hashlib.sha256(b"report").hexdigest()
+
+        with UploadSpool(inline_threshold=0, directory=spool_dir, store=store) as spool:
+            first = spool.add("a.PDF", None, io.BytesIO(b"report"))
+            second = spool.add("b.pdf", None, io.BytesIO(b"report"))
+            other = spool.add("c.pdf", None, io.BytesIO(b"other"))
+
+        key = f"attachments/{content_id[:2]}/{content_id}.pdf"
+        self.assertEqual(first["content_id"], content_id)
+        self.assertEqual(first["key"], key)
+        self.assertFalse(first["deduplicated"])
+        self.assertEqual(second["key"], key)
+        self.assertTrue(second["deduplicated"])
+        self.assertFalse(other["deduplicated"])
+        self.assertEqual(store.get_file(key), b"report")
+
+
+class TestUploadLimitMiddleware(unittest.TestCase):
+    """Test cases for UploadLimitMiddleware"""
+
+    def setUp(self) -> None:
+        """Set up an upload route behind a 400 byte body limit"""
+        self.calls: List[int] = []
+        app = FastAPI()
+
+        @app.post("/upload")
+        async def upload(files: List[UploadFile] = File(...)) -> dict:  # noqa: B008
+            self.calls.append(len(files))
+            return {"files": len(files)}
+
+        @app.post("/other")
+        async def other(files: List[UploadFile] = File(...)) -> dict:  # noqa: B008
+            return {"files": len(files)}
+
+        app.add_middleware(UploadLimitMiddleware, paths={"/upload"}, max_body_size=400)
+        self.client = TestClient(app)
+
+    def test_small_upload_passes(self) -> None:
+        """Test that a body within the limit reaches the endpoint"""
+        response = self.client.post("/upload", files={"files": ("a.txt", b"abc")})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.calls, [1])
+
+    def test_content_length_rejected_before_reading(self) -> None:
+        """Test that an oversized Content-Length is refused up front"""
+        response = self.client.post("/upload", files={"files": ("a.txt", b"x" * 500)})
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(self.calls, [])
+
+    def test_streamed_body_cut_off(self) -> None:
+        """Test that a chunked body is stopped once it passes the limit"""
+
+        def body() -> Iterator[bytes]:
+            for _ in range(100):
+                yield b"x" * 10
+
+        response = self.client.post(
+            "/upload",
+            content=body(),
+            headers={"content-type": "multipart/form-data; boundary=b"},
+        )
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(self.calls, [])
+
+    def test_other_paths_unlimited(self) -> None:
+        """Test that routes outside the configured paths are not limited"""
+        response = self.client.post("/other", files={"files": ("a.txt", b"x" * 500)})
+        self.assertEqual(response.status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+"""Tests for WalkerExecutor class"""
+
+import asyncio
+import contextvars
+import threading
+
+import pytest
+from pytest_mock import MockerFixture
+
+from jvserve.lib.walker_executor import WalkerExecutor, WalkerQueueFullError
+
+TEST_VAR: contextvars.ContextVar[str] = contextvars.ContextVar("TEST_VAR")
+
+
+class TestWalkerExecutor:
+    """Test WalkerExecutor class"""
+
+    @pytest.fixture(autouse=True)
+    def reset_executor(self, mocker: MockerFixture) -> None:
+        """Give each test a fresh, small executor."""
+        WalkerExecutor.shutdown()
+        mocker.patch.dict(
+            "os.environ",
+            {"JIVAS_WALKER_WORKERS": "1", "JIVAS_WALKER_QUEUE_SIZE": "1"},
+        )
+        for counter in ("ACTIVE", "QUEUED", "COMPLETED", "FAILED", "REJECTED"):
+            setattr(WalkerExecutor, counter, 0)
+
+    def test_run_returns_result_off_loop_thread(self) -> None:
+        """Test that calls run on a walker thread and return their result."""
+
+        async def main() -> str:
+            return await WalkerExecutor.run(lambda: threading.current_thread().name)
+
+        assert asyncio.run(main()).startswith("jivas-walker")
+        stats = WalkerExecutor.stats()
+        assert stats["completed"] == 1
+        assert stats["max_workers"] == 1
+
+    def test_run_isolates_context_variables(self) -> None:
+        """Test that context variables set by a call do not leak to the caller."""
+
+        async def main() -> tuple[str, str]:
+            TEST_VAR.set("caller")
+            seen = await WalkerExecutor.run(TEST_VAR.get)
+            await WalkerExecutor.run(TEST_VAR.set, "walker")
+            return seen, TEST_VAR.get()
+
+        assert asyncio.run(main()) == ("caller", "caller")
+
+    def test_run_rejects_when_at_capacity(self) -> None:
+        """Test admission control once workers and queue are full."""
+        release = threading.Event()
+
+        async def main() -> None:
+            running = [
+                asyncio.ensure_future(WalkerExecutor.run(release.wait))
+                for _ in range(2)
+            ]
+            await asyncio.sleep(0.05)
+            assert WalkerExecutor.stats()["queued"] == 1
+            with pytest.raises(WalkerQueueFullError):
+                await WalkerExecutor.run(release.wait)
+            release.set()
+            await asyncio.gather(*running)
+
+        asyncio.run(main())
+        stats = WalkerExecutor.stats()
+        assert stats["rejected"] == 1
+        assert stats["completed"] == 2
+        assert stats["active"] == 0 and stats["queued"] == 0
+
+    def test_run_counts_failures(self) -> None:
+        """Test that exceptions propagate and are tallied."""
+
+        def fail() -> None:
+            raise ValueError("boom")
+
+        async def main() -> None:
+            with pytest.raises(ValueError):
+                await WalkerExecutor.run(fail)
+
+        asyncio.run(main())
+        assert WalkerExecutor.stats()["failed"] == 1
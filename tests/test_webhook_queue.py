@@ -0,0 +1,161 @@
+"""Tests for WebhookQueue class"""
+
+import os
+import tempfile
+import threading
+import unittest
+
+from jvserve.lib.webhook_queue import WebhookQueue
+
+
+class TestWebhookQueue(unittest.TestCase):
+    """Test cases for WebhookQueue"""
+
+    def setUp(self) -> None:
+        """Set up test environment"""
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.test_dir.name, "jivas", "webhooks.db")
+        self.handled: list = []
+        self.done = threading.Event()
+
+    def tearDown(self) -> None:
+        """Clean up test environment"""
+        self.test_dir.cleanup()
+
+    def handler(self, payload: dict) -> None:
+        """Record each handled payload"""
+        self.handled.append(payload)
+        self.done.set()
+
+    def test_enqueue_and_process(self) -> None:
+        """Test that a queued job is run by a worker and removed"""
+        webhook_queue = WebhookQueue(self.path, self.handler, workers=2)
+        webhook_queue.start()
+        try:
+            self.assertTrue(webhook_queue.enqueue({"walker": "hook", "params": [1]}))
+            self.assertTrue(self.done.wait(timeout=5))
+        finally:
+            webhook_queue.stop()
+
+        self.assertEqual(self.handled, [{"walker": "hook", "params": [1]}])
+        stats = webhook_queue.stats()
+        self.assertEqual(stats["pending"], 0)
+        self.assertEqual(stats["processed"], 1)
+
+    def test_duplicate_idempotency_key_is_dropped(self) -> None:
+        """Test that a repeated idempotency key is not queued twice"""
+        webhook_queue = WebhookQueue(self.path, self.handler)
+        self.assertTrue(webhook_queue.enqueue({"n": 1}, "key-1"))
+        self.assertFalse(webhook_queue.enqueue({"n": 1}, "key-1"))
+        self.assertTrue(webhook_queue.enqueue({"n": 2}, "key-2"))
+        self.assertTrue(webhook_queue.enqueue({"n": 3}))
+
+        stats = webhook_queue.stats()
+        self.assertEqual(stats["pending"], 3)
+        self.assertEqual(stats["duplicates"], 1)
+
+    def test_expired_idempotency_key_is_accepted(self) -> None:
+        """Test that an idempotency key older than dedup_ttl no longer blocks"""
+        webhook_queue = WebhookQueue(self.path, self.handler, dedup_ttl=-1)
+        self.assertTrue(webhook_queue.enqueue({"n": 1}, "key-1"))
+        self.assertTrue(webhook_queue.enqueue({"n": 1}, "key-1"))
+
+    def test_per_key_dedup_ttl(self) -> None:
+        """Test that a key enqueued with a shorter TTL expires on its own schedule"""
+        webhook_queue = WebhookQueue(self.path, self.handler)
+        self.assertTrue(webhook_queue.enqueue({"n": 1}, "body-1", dedup_ttl=-1))
+        self.assertTrue(webhook_queue.enqueue({"n": 1}, "body-1", dedup_ttl=-1))
+        self.assertTrue(webhook_queue.enqueue({"n": 2}, "body-2", dedup_ttl=60))
+        self.assertFalse(webhook_queue.enqueue({"n": 2}, "body-2", dedup_ttl=60))
+
+    def test_jobs_survive_restart(self) -> None:
+        """Test that jobs queued by one instance are run by the next"""
+        WebhookQueue(self.path, self.handler).enqueue({"n": 1})
+
+        webhook_queue = WebhookQueue(self.path, self.handler)
+        webhook_queue.start()
+        try:
+            self.assertTrue(self.done.wait(timeout=5))
+        finally:
+            webhook_queue.stop()
+        self.assertEqual(self.handled, [{"n": 1}])
+
+    def test_failed_job_is_retried_then_marked_failed(self) -> None:
+        """Test that a failing job is retried up to max_attempts"""
+        attempts = []
+
+        def failing(payload: dict) -> None:
+            attempts.append(payload)
+            raise RuntimeError("boom")
+
+        webhook_queue = WebhookQueue(self.path, failing, max_attempts=2)
+        webhook_queue.enqueue({"n": 1})
+        while job := webhook_queue.claim():
+            webhook_queue.run_job(*job)
+
+        self.assertEqual(len(attempts), 2)
+        stats = webhook_queue.stats()
+        self.assertEqual(stats["pending"], 0)
+        self.assertEqual(stats["failed_jobs"], 1)
+        self.assertEqual(stats["failed"], 1)
+
+    def test_abandoned_job_is_reclaimed_after_lease(self) -> None:
+        """Test that a running job whose lease expired is claimed again"""
+        webhook_queue = WebhookQueue(self.path, self.handler, lease=-1)
+        webhook_queue.enqueue({"n": 1})
+        first = webhook_queue.claim()
+        second = webhook_queue.claim()
+
+        assert first is not None and second is not None
+        self.assertEqual(first[0], second[0])
+        self.assertEqual(second[3], 2)
+
+    def test_abandoned_job_stops_after_max_attempts(self) -> None:
+        """Test that a job whose worker keeps dying is failed, not reclaimed forever"""
+        webhook_queue = WebhookQueue(self.path, self.handler, max_attempts=2, lease=-1)
+        webhook_queue.enqueue({"n": 1})
+        self.assertIsNotNone(webhook_queue.claim())
+        self.assertIsNotNone(webhook_queue.claim())
+        self.assertIsNone(webhook_queue.claim())
+
+        self.assertEqual(webhook_queue.purge()["abandoned"], 1)
+        stats = webhook_queue.stats()
+        self.assertEqual(stats["running"], 0)
+        self.assertEqual(stats["failed_jobs"], 1)
+        self.assertEqual(stats["failed"], 1)
+
+    def test_purge_expired_keys_and_failed_jobs(self) -> None:
+        """Test that expired idempotency keys and old failed jobs are deleted"""
+        webhook_queue = WebhookQueue(
+            self.path, self.handler, dedup_ttl=-1, failed_retention=-1
+        )
+        for i in range(500):
+            webhook_queue.enqueue({"n": i}, f"key-{i}")
+        conn = webhook_queue._connection()
+        conn.execute("UPDATE jobs SET status = 'failed', claimed_at = 0")
+
+        self.assertEqual(
+            webhook_queue.purge(), {"keys": 500, "failed_jobs": 500, "abandoned": 0}
+        )
+        self.assertEqual(
+            conn.execute("SELECT COUNT(*) FROM idempotency_keys").fetchone()[0], 0
+        )
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0], 0)
+
+    def test_workers_purge_periodically(self) -> None:
+        """Test that running workers purge without being asked"""
+        webhook_queue = WebhookQueue(self.path, self.handler, dedup_ttl=-1)
+        webhook_queue.enqueue({"n": 1}, "key-1")
+        webhook_queue.start()
+        try:
+            self.assertTrue(self.done.wait(timeout=5))
+        finally:
+            webhook_queue.stop()
+        count = webhook_queue._connection().execute(
+            "SELECT COUNT(*) FROM idempotency_keys"
+        )
+        self.assertEqual(count.fetchone()[0], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()